@@ -0,0 +1,178 @@
+"""
+Columnar export and vectorized analytics for price history.
+
+The export writes a Parquet dataset partitioned by retailer/date (hive layout),
+so offline reports read only the partitions and columns they need. pyarrow is
+optional and only imported by the export/load functions.
+"""
+import os
+import sqlite3
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from agentic_shop.agents.storage import PriceStore, get_store
+
+EXPORT_BATCH_ROWS = 100_000
+
+def _pyarrow():
+    try:
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+    except ImportError as e:  # pragma: no cover - depends on environment
+        raise ImportError("Columnar export needs pyarrow: pip install pyarrow") from e
+    return pa, ds
+
+def _schema(pa):
+    return pa.schema([
+        ("product_id", pa.string()),
+        ("retailer", pa.string()),
+        ("price", pa.float64()),
+        ("seen_at", pa.timestamp("s", tz="UTC")),
+        ("date", pa.string()),
+    ])
+
+def export_price_history(out_dir: str, store: Optional[PriceStore] = None,
+                         since: Optional[datetime] = None) -> int:
+    """
+    Streams raw price history out of SQLite into `out_dir` as Parquet partitioned by
+    retailer and UTC date. Existing partitions are overwritten, so `since` is floored
+    to midnight UTC: a rewritten day always gets all of its rows. Returns rows written.
+    """
+    pa, ds = _pyarrow()
+    schema = _schema(pa)
+    store = store or get_store()
+    store.connection()  # make sure the schema is migrated
+    # pyarrow pulls batches from its own thread, so the export gets a dedicated connection
+    conn = sqlite3.connect(store.path, check_same_thread=False)
+    start = int(since.timestamp()) // 86400 * 86400 if since else 0
+    cur = conn.execute("""
+        SELECT h.product_id, r.name, h.price, h.seen_at, strftime('%Y-%m-%d', h.seen_at, 'unixepoch')
+        FROM price_history h JOIN retailers r ON r.id = h.retailer_id
+        WHERE h.seen_at >= ?
+    """, (start,))
+    total = 0
+
+    def batches():
+        nonlocal total
+        while True:
+            rows = cur.fetchmany(EXPORT_BATCH_ROWS)
+            if not rows:
+                return
+            total += len(rows)
+            cols = list(zip(*rows))
+            yield pa.RecordBatch.from_arrays([
+                pa.array(cols[0], pa.string()),
+                pa.array(cols[1], pa.string()),
+                pa.array(cols[2], pa.float64()),
+                pa.array(cols[3], pa.int64()).cast(pa.timestamp("s", tz="UTC")),
+                pa.array(cols[4], pa.string()),
+            ], schema=schema)
+
+    os.makedirs(out_dir, exist_ok=True)
+    try:
+        ds.write_dataset(
+            batches(), out_dir, schema=schema, format="parquet",
+            partitioning=ds.partitioning(pa.schema([("retailer", pa.string()), ("date", pa.string())]), flavor="hive"),
+            existing_data_behavior="delete_matching",
+        )
+    finally:
+        conn.close()
+    return total
+
+def load_price_columns(path: str,
+                       columns: Sequence[str] = ("product_id", "price", "seen_at"),
+                       product_ids: Optional[Iterable[str]] = None,
+                       retailers: Optional[Iterable[str]] = None,
+                       since: Optional[datetime] = None,
+                       until: Optional[datetime] = None) -> Dict[str, np.ndarray]:
+    """
+    Reads only `columns` from an exported dataset as NumPy arrays. Retailer and
+    date filters prune partitions; `seen_at` comes back as int64 epoch seconds.
+    """
+    pa, ds = _pyarrow()
+    import pyarrow.compute as pc
+    dataset = ds.dataset(path, format="parquet", partitioning="hive")
+    filt = None
+    def _and(expr):
+        nonlocal filt
+        filt = expr if filt is None else filt & expr
+    if retailers is not None:
+        _and(ds.field("retailer").isin(list(retailers)))
+    if product_ids is not None:
+        _and(ds.field("product_id").isin(list(product_ids)))
+    if since is not None:
+        _and(ds.field("date") >= since.strftime("%Y-%m-%d"))
+        _and(ds.field("seen_at") >= pa.scalar(since, pa.timestamp("s", tz="UTC")))
+    if until is not None:
+        _and(ds.field("date") <= until.strftime("%Y-%m-%d"))
+        _and(ds.field("seen_at") <= pa.scalar(until, pa.timestamp("s", tz="UTC")))
+    table = dataset.to_table(columns=list(columns), filter=filt)
+    out: Dict[str, np.ndarray] = {}
+    for name in columns:
+        col = table.column(name)
+        if pa.types.is_timestamp(col.type):
+            col = pc.cast(col, pa.int64())
+        out[name] = col.to_numpy()
+    return out
+
+def aggregate_prices(product_ids: np.ndarray, prices: np.ndarray,
+                     seen_at: Optional[np.ndarray] = None,
+                     window: Optional[int] = None,
+                     percentiles: Sequence[float] = (50.0,)) -> Dict[str, np.ndarray]:
+    """
+    Per-product (and optionally per time window of `window` seconds) count, min,
+    max, avg and percentiles in a handful of NumPy passes: one sort, then
+    reduceat over the group boundaries. Percentiles use linear interpolation,
+    like np.percentile.
+    """
+    product_ids = np.asarray(product_ids)
+    prices = np.asarray(prices, dtype=np.float64)
+    out: Dict[str, np.ndarray] = {}
+    if prices.size == 0:
+        out.update({"product_id": product_ids[:0], "count": np.zeros(0, np.int64),
+                    "min": prices[:0], "max": prices[:0], "avg": prices[:0]})
+        for q in percentiles:
+            out[f"p{q:g}"] = prices[:0]
+        if window:
+            out["window_start"] = np.zeros(0, np.int64)
+        return out
+
+    uniq, codes = np.unique(product_ids, return_inverse=True)
+    if window:
+        if seen_at is None:
+            raise ValueError("seen_at is required when aggregating over windows")
+        win = np.asarray(seen_at, dtype=np.int64) // window
+        keys, group = np.unique(np.stack([codes, win], axis=1), axis=0, return_inverse=True)
+        group = group.reshape(-1)
+    else:
+        keys, group = None, codes
+
+    order = np.lexsort((prices, group))
+    g, p = group[order], prices[order]
+    starts = np.flatnonzero(np.r_[True, g[1:] != g[:-1]])
+    counts = np.diff(np.r_[starts, g.size])
+    ends = starts + counts - 1
+
+    out["product_id"] = uniq[keys[:, 0]] if keys is not None else uniq
+    if keys is not None:
+        out["window_start"] = keys[:, 1] * window
+    out["count"] = counts
+    out["min"] = p[starts]
+    out["max"] = p[ends]
+    out["avg"] = np.add.reduceat(p, starts) / counts
+    for q in percentiles:
+        pos = starts + (counts - 1) * (q / 100.0)
+        lo = np.floor(pos).astype(np.int64)
+        hi = np.minimum(lo + 1, ends)
+        out[f"p{q:g}"] = p[lo] + (p[hi] - p[lo]) * (pos - lo)
+    return out
+
+def price_report(path: str, window: Optional[int] = None,
+                 percentiles: Sequence[float] = (50.0, 90.0), **filters) -> List[Dict[str, object]]:
+    """Loads the needed columns from an export and returns per-product stats as rows."""
+    cols = load_price_columns(path, columns=("product_id", "price", "seen_at"), **filters)
+    agg = aggregate_prices(cols["product_id"], cols["price"], cols["seen_at"], window=window, percentiles=percentiles)
+    names = list(agg)
+    return [dict(zip(names, row)) for row in zip(*(agg[n].tolist() for n in names))]
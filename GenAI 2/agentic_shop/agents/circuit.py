@@ -0,0 +1,149 @@
+import sys
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Deque, Dict, Optional, Tuple
+
+import requests
+
+from agentic_shop.config import (CIRCUIT_FAILURE_RATE, CIRCUIT_MIN_REQUESTS, CIRCUIT_WINDOW,
+                                 CIRCUIT_OPEN_SECONDS, CIRCUIT_HALF_OPEN_PROBES)
+
+CLOSED, OPEN, HALF_OPEN = "closed", "open", "half_open"
+_TRANSITION_METRIC = {CLOSED: "closed", OPEN: "opened", HALF_OPEN: "half_opened"}
+
+class CircuitOpen(Exception):
+    """Call rejected locally because the upstream's circuit is open."""
+
+@dataclass(frozen=True)
+class Admission:
+    """Returned by allow() and handed back to record(): which state period admitted the call."""
+    generation: int
+    probe: bool = False
+
+def is_upstream_failure(exc: BaseException) -> bool:
+    """Network errors and 5xx count against the circuit; 4xx are the caller's problem."""
+    if isinstance(exc, requests.HTTPError) and exc.response is not None:
+        return exc.response.status_code >= 500
+    return isinstance(exc, requests.RequestException)
+
+class CircuitBreaker:
+    """
+    Error-rate circuit breaker for one upstream host.
+
+    closed:    calls pass; outcomes from the last `window` seconds are kept, and once
+               there are `min_requests` of them with a failure share >= `failure_rate`
+               the circuit opens.
+    open:      calls fail fast with CircuitOpen for `open_seconds`.
+    half_open: up to `half_open_probes` calls go through; a success closes the
+               circuit, a failure opens it again for another `open_seconds`.
+
+    Outcomes only count in the state period that admitted the call: a slow call let
+    through while closed cannot close or reopen a half-open circuit.
+    """
+    def __init__(self, name: str, failure_rate: float = CIRCUIT_FAILURE_RATE,
+                 min_requests: int = CIRCUIT_MIN_REQUESTS, window: float = CIRCUIT_WINDOW,
+                 open_seconds: float = CIRCUIT_OPEN_SECONDS,
+                 half_open_probes: int = CIRCUIT_HALF_OPEN_PROBES, clock=time.monotonic):
+        self.name = name
+        self.failure_rate = failure_rate
+        self.min_requests = max(1, min_requests)
+        self.window = window
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+        self.clock = clock
+        self.state = CLOSED
+        self._outcomes: Deque[Tuple[float, bool]] = deque()
+        self._opened_at = 0.0
+        self._probes = 0
+        self._generation = 0  # bumped on every transition
+        self._lock = threading.Lock()
+        self.metrics: Dict[str, int] = {"calls": 0, "failures": 0, "rejected": 0,
+                                        "opened": 0, "half_opened": 0, "closed": 0}
+
+    def _transition(self, state: str, now: float):
+        print(f"[circuit] {self.name}: {self.state} -> {state}", file=sys.stderr)
+        self.state = state
+        self.metrics[_TRANSITION_METRIC[state]] += 1
+        self._generation += 1
+        self._probes = 0
+        if state == OPEN:
+            self._opened_at = now
+        self._outcomes.clear()
+
+    def allow(self) -> Admission:
+        """Reserves a call slot or raises CircuitOpen; pass the result to record()."""
+        with self._lock:
+            now = self.clock()
+            if self.state == OPEN and now - self._opened_at >= self.open_seconds:
+                self._transition(HALF_OPEN, now)
+            if self.state == OPEN or (self.state == HALF_OPEN and self._probes >= self.half_open_probes):
+                self.metrics["rejected"] += 1
+                retry_in = max(0.0, self.open_seconds - (now - self._opened_at))
+                raise CircuitOpen(f"{self.name} circuit {self.state}; retry in {retry_in:.0f}s")
+            probe = self.state == HALF_OPEN
+            if probe:
+                self._probes += 1
+            self.metrics["calls"] += 1
+            return Admission(self._generation, probe)
+
+    def record(self, admission: Admission, ok: bool):
+        """Reports the outcome of a call admitted by allow()."""
+        with self._lock:
+            now = self.clock()
+            if not ok:
+                self.metrics["failures"] += 1
+            if admission.generation != self._generation:
+                return  # straggler admitted before the last state change
+            if self.state == HALF_OPEN:
+                if admission.probe:
+                    self._transition(CLOSED if ok else OPEN, now)
+                return
+            self._outcomes.append((now, ok))
+            while self._outcomes and now - self._outcomes[0][0] > self.window:
+                self._outcomes.popleft()
+            failures = sum(1 for _, good in self._outcomes if not good)
+            if len(self._outcomes) >= self.min_requests and failures >= self.failure_rate * len(self._outcomes):
+                self._transition(OPEN, now)
+
+    @contextmanager
+    def guard(self):
+        """allow() + record() around a block; non-upstream errors count as successes."""
+        admission = self.allow()
+        try:
+            yield
+        except BaseException as e:
+            self.record(admission, not is_upstream_failure(e))
+            raise
+        self.record(admission, True)
+
+    def snapshot(self) -> Dict[str, object]:
+        with self._lock:
+            return {"state": self.state, **self.metrics}
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+def get_breaker(host: str) -> CircuitBreaker:
+    """Process-wide breaker for an upstream host, created on first use."""
+    with _breakers_lock:
+        b = _breakers.get(host)
+        if b is None:
+            b = _breakers[host] = CircuitBreaker(host)
+        return b
+
+def breaker_metrics() -> Dict[str, Dict[str, object]]:
+    """State and transition counters for every upstream seen so far."""
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {b.name: b.snapshot() for b in breakers}
+
+def reset_breakers(host: Optional[str] = None):
+    """Forgets breaker state (all hosts, or one), e.g. between tests."""
+    with _breakers_lock:
+        if host is None:
+            _breakers.clear()
+        else:
+            _breakers.pop(host, None)
@@ -0,0 +1,124 @@
+import html
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agentic_shop.agents.utils import Product, Review
+from agentic_shop.config import ENRICH_CONCURRENCY, ENRICH_DEADLINE, ENRICH_CACHE_TTL, ENRICH_CACHE_SIZE
+
+EBAY_PREFIX = "ebay:"
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+MAX_DESCRIPTION_CHARS = 1000
+
+# item_id, etag -> (item JSON or None when unchanged, etag)
+ItemFetcher = Callable[[str, Optional[str]], Tuple[Optional[Dict[str, Any]], Optional[str]]]
+
+def _ebay_get_item(item_id: str, etag: Optional[str]):
+    # imported on first use so the eBay provider (requests, tenacity) loads only when needed
+    from agentic_shop.agents.providers.ebay import get_item
+    return get_item(item_id, etag)
+
+def _plain_text(s: str) -> str:
+    return _WS_RE.sub(" ", html.unescape(_TAG_RE.sub(" ", s or ""))).strip()
+
+def apply_item_details(p: Product, item: Dict[str, Any]):
+    """Copies description, review rating and seller feedback from a getItem payload onto `p`."""
+    rating_obj = item.get("primaryProductReviewRating") or {}
+    rating = None
+    if rating_obj.get("averageRating") is not None:
+        try:
+            rating = float(rating_obj["averageRating"])
+        except Exception:
+            rating = None
+    if p.rating is None:
+        p.rating = rating
+
+    text = item.get("shortDescription") or _plain_text(item.get("description", ""))[:MAX_DESCRIPTION_CHARS]
+    if text and not any(r.source == "ebay:item" for r in p.reviews):
+        p.reviews.append(Review(rating=rating, text=text, source="ebay:item"))
+
+    seller = item.get("seller") or {}
+    p.extra.update({k: v for k, v in {
+        "condition": item.get("condition"),
+        "brand": item.get("brand"),
+        "review_count": rating_obj.get("reviewCount"),
+        "seller": seller.get("username"),
+        "seller_feedback_pct": seller.get("feedbackPercentage"),
+        "seller_feedback_score": seller.get("feedbackScore"),
+    }.items() if v is not None})
+
+class ItemEnrichmentAgent:
+    """
+    Fills Product.reviews/extra for eBay listings from the Browse getItem endpoint.
+    Items are fetched concurrently (bounded by max_workers) under one stage deadline,
+    cached in memory, and revalidated with If-None-Match once older than `ttl`.
+    """
+    def __init__(self, fetch: ItemFetcher = _ebay_get_item,
+                 max_workers: int = ENRICH_CONCURRENCY,
+                 deadline: float = ENRICH_DEADLINE,
+                 ttl: int = ENRICH_CACHE_TTL,
+                 cache_size: int = ENRICH_CACHE_SIZE):
+        self.fetch = fetch
+        self.max_workers = max(1, max_workers)
+        self.deadline = deadline
+        self.ttl = ttl
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[str, Tuple[float, Optional[str], Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.stats = {"fresh_hits": 0, "revalidated": 0, "fetched": 0, "errors": 0, "timeouts": 0}
+
+    def _cached(self, item_id: str) -> Optional[Tuple[float, Optional[str], Dict[str, Any]]]:
+        with self._lock:
+            hit = self._cache.get(item_id)
+            if hit is not None:
+                self._cache.move_to_end(item_id)
+            return hit
+
+    def _remember(self, item_id: str, etag: Optional[str], item: Dict[str, Any]):
+        with self._lock:
+            self._cache[item_id] = (time.time(), etag, item)
+            self._cache.move_to_end(item_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _load(self, item_id: str) -> Optional[Dict[str, Any]]:
+        hit = self._cached(item_id)
+        if hit and time.time() - hit[0] < self.ttl:
+            self.stats["fresh_hits"] += 1
+            return hit[2]
+        try:
+            item, etag = self.fetch(item_id, hit[1] if hit else None)
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"[eBay] getItem {item_id} failed: {e}", file=sys.stderr)
+            return hit[2] if hit else None  # stale detail beats none
+        if item is None and hit:  # 304 Not Modified
+            self.stats["revalidated"] += 1
+            item = hit[2]
+        elif item is None:
+            return None
+        else:
+            self.stats["fetched"] += 1
+        self._remember(item_id, etag, item)
+        return item
+
+    def enrich(self, products: List[Product]) -> List[Product]:
+        """Enriches eBay products in place; products not done by the deadline are left as-is."""
+        targets = [p for p in products if p.id.startswith(EBAY_PREFIX) and len(p.id) > len(EBAY_PREFIX)]
+        if not targets:
+            return products
+        pool = ThreadPoolExecutor(max_workers=min(self.max_workers, len(targets)), thread_name_prefix="enrich")
+        futures = {pool.submit(self._load, p.id[len(EBAY_PREFIX):]): p for p in targets}
+        done, not_done = wait(futures, timeout=self.deadline)
+        pool.shutdown(wait=False, cancel_futures=True)
+        self.stats["timeouts"] += len(not_done)
+        for fut in done:
+            item = fut.result()
+            if item:
+                apply_item_details(futures[fut], item)
+        return products
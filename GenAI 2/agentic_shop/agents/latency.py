@@ -0,0 +1,152 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Optional, TypeVar
+
+import requests
+
+from agentic_shop.config import (LATENCY_WINDOW, LATENCY_MIN_SAMPLES, TIMEOUT_MULTIPLIER,
+                                 TIMEOUT_FLOOR, HEDGE_MIN_DELAY, HEDGE_MAX_WORKERS)
+
+T = TypeVar("T")
+
+class LatencyTracker:
+    """
+    Rolling per-endpoint latency samples (the last `window` completed requests).
+    Until an endpoint has `min_samples` observations, callers get their fixed
+    defaults; afterwards timeouts follow p99 * `multiplier` and hedges fire at p95.
+    """
+    def __init__(self, window: int = LATENCY_WINDOW, min_samples: int = LATENCY_MIN_SAMPLES,
+                 multiplier: float = TIMEOUT_MULTIPLIER, floor: float = TIMEOUT_FLOOR,
+                 hedge_min_delay: float = HEDGE_MIN_DELAY):
+        self.window = window
+        self.min_samples = min_samples
+        self.multiplier = multiplier
+        self.floor = floor
+        self.hedge_min_delay = hedge_min_delay
+        self._samples: Dict[str, Deque[float]] = {}
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+
+    def _count(self, endpoint: str, field: str):
+        s = self.stats.setdefault(endpoint, {"requests": 0, "errors": 0, "timeouts": 0,
+                                             "hedges": 0, "hedge_wins": 0})
+        s[field] += 1
+
+    def count(self, endpoint: str, field: str):
+        """Bumps one of the per-endpoint counters (requests, errors, timeouts, hedges, hedge_wins)."""
+        with self._lock:
+            self._count(endpoint, field)
+
+    def record(self, endpoint: str, seconds: float):
+        with self._lock:
+            self._samples.setdefault(endpoint, deque(maxlen=self.window)).append(seconds)
+            self._count(endpoint, "requests")
+
+    @contextmanager
+    def observe(self, endpoint: str, budget: Optional[float] = None):
+        """
+        Times the enclosed call. Completed responses become samples; a timeout is
+        recorded as a sample of at least `budget`, so a slower upstream pushes p99
+        (and the adaptive timeout) back up instead of timing out forever.
+        """
+        start = time.monotonic()
+        try:
+            yield
+        except requests.Timeout:
+            elapsed = time.monotonic() - start
+            self.record(endpoint, max(elapsed, budget or 0.0))
+            self.count(endpoint, "timeouts")
+            raise
+        except Exception:
+            self.count(endpoint, "errors")
+            raise
+        self.record(endpoint, time.monotonic() - start)
+
+    def percentile(self, endpoint: str, q: float) -> Optional[float]:
+        """Nearest-rank percentile (q in 0..100), or None while samples are scarce."""
+        with self._lock:
+            samples = sorted(self._samples.get(endpoint, ()))
+        if len(samples) < self.min_samples:
+            return None
+        rank = min(len(samples) - 1, max(0, int(round(q / 100.0 * len(samples))) - 1))
+        return samples[rank]
+
+    def timeout_for(self, endpoint: str, default: float) -> float:
+        """Adaptive timeout, never above the endpoint's fixed `default`."""
+        p99 = self.percentile(endpoint, 99)
+        if p99 is None:
+            return default
+        return min(default, max(self.floor, p99 * self.multiplier))
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """Seconds to wait before sending a duplicate request (None = don't hedge yet)."""
+        p95 = self.percentile(endpoint, 95)
+        return None if p95 is None else max(self.hedge_min_delay, p95)
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        """Per-endpoint counters plus current p50/p95/p99 for logging."""
+        out: Dict[str, Dict[str, float]] = {}
+        for endpoint in list(self.stats):
+            row: Dict[str, float] = dict(self.stats[endpoint])
+            for q in (50, 95, 99):
+                p = self.percentile(endpoint, q)
+                if p is not None:
+                    row[f"p{q}"] = round(p, 4)
+            out[endpoint] = row
+        return out
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+def _hedge_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="hedge")
+        return _executor
+
+def hedged_call(fn: Callable[[], T], delay: float, tracker: Optional["LatencyTracker"] = None,
+                endpoint: str = "", executor: Optional[ThreadPoolExecutor] = None,
+                permit: Optional[Callable[[], bool]] = None) -> T:
+    """
+    Runs `fn`; if it has not finished after `delay` seconds, starts one duplicate
+    and returns whichever succeeds first. Only for idempotent reads. The losing
+    call keeps running until its own timeout and its result is discarded.
+    Raises the first error only when both attempts fail.
+
+    `permit` is asked right before the duplicate is sent (e.g. to take a rate-limit
+    token); when it returns False no hedge is sent and the primary is awaited.
+    """
+    pool = executor or _hedge_executor()
+    primary = pool.submit(fn)
+    done, _ = wait([primary], timeout=delay)
+    if done or (permit is not None and not permit()):
+        return primary.result()
+    backup = pool.submit(fn)
+    if tracker is not None:
+        tracker.count(endpoint, "hedges")
+    pending = {primary, backup}
+    error: Optional[BaseException] = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for f in done:
+            if f.exception() is None:
+                if f is backup and tracker is not None:
+                    tracker.count(endpoint, "hedge_wins")
+                return f.result()
+            error = error or f.exception()
+    raise error
+
+_tracker: Optional[LatencyTracker] = None
+_tracker_lock = threading.Lock()
+
+def get_latency_tracker() -> LatencyTracker:
+    """Process-wide tracker shared by every provider call."""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            _tracker = LatencyTracker()
+        return _tracker
@@ -0,0 +1,151 @@
+"""
+Near-duplicate title matching for cross-retailer price comparison.
+
+Titles are turned into shingle sets (word tokens plus character trigrams), sketched
+with vectorized MinHash and bucketed with LSH banding, so only listings that share a
+band are compared. Candidate pairs are confirmed with exact Jaccard similarity and
+merged with union-find, which keeps clustering roughly linear in the number of
+listings.
+"""
+import re
+import zlib
+from collections import defaultdict
+from itertools import chain
+from typing import Dict, FrozenSet, List, Optional, Sequence
+
+import numpy as np
+
+from agentic_shop.agents.utils import normalize_title
+from agentic_shop.config import MATCH_THRESHOLD
+
+_MERSENNE = np.uint64((1 << 31) - 1)
+_NUMERIC_TOKEN_RE = re.compile(r"\d+[a-z]*")  # number plus attached unit: 1tb, 128gb, 1000xm
+_ORDINAL_RE = re.compile(r"^(\d+)(?:st|nd|rd|th)$")
+_CHUNK = 1 << 15               # features hashed per NumPy pass
+_MAX_BUCKET_PAIRS = 64         # larger LSH buckets only compare each member to an anchor and its neighbour
+
+def shingles(title: str) -> FrozenSet[str]:
+    norm = normalize_title(title)
+    feats = set(norm.split())
+    padded = f" {norm} "
+    feats.update("#" + padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(feats)
+
+def numeric_tokens(title: str) -> FrozenSet[str]:
+    """Numbers with their units (sizes, capacities, model numbers); ordinals reduced to digits."""
+    return frozenset(_ORDINAL_RE.sub(r"\1", t) for t in _NUMERIC_TOKEN_RE.findall(normalize_title(title)))
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a and not b:
+        return 1.0
+    inter = len(a & b)
+    return inter / (len(a) + len(b) - inter)
+
+class _UnionFind:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, x: int) -> int:
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a: int, b: int):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[max(ra, rb)] = min(ra, rb)
+
+class ProductMatcher:
+    def __init__(self, threshold: float = MATCH_THRESHOLD, num_perm: int = 64, bands: int = 16,
+                 strict_numbers: bool = True, seed: int = 7):
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        # listings whose numbers conflict (128GB vs 256GB, Pro 2 vs Pro 3) never merge
+        self.strict_numbers = strict_numbers
+        rng = np.random.default_rng(seed)
+        self._a = rng.integers(1, int(_MERSENNE), size=(num_perm, 1), dtype=np.uint64)
+        self._b = rng.integers(0, int(_MERSENNE), size=(num_perm, 1), dtype=np.uint64)
+
+    def signatures(self, feature_sets: Sequence[FrozenSet[str]]) -> np.ndarray:
+        """MinHash signatures, shape (len(feature_sets), num_perm)."""
+        n = len(feature_sets)
+        sig = np.full((n, self.num_perm), np.iinfo(np.uint32).max, dtype=np.uint64)
+        hashes: List[int] = []
+        owners: List[int] = []
+        for i, feats in enumerate(feature_sets):
+            hashes.extend(zlib.crc32(f.encode("utf-8")) for f in feats)
+            owners.extend([i] * len(feats))
+        if not hashes:
+            return sig
+        h = np.asarray(hashes, dtype=np.uint64)
+        docs = np.asarray(owners, dtype=np.int64)
+        for start in range(0, h.size, _CHUNK):
+            hv, dv = h[start:start + _CHUNK], docs[start:start + _CHUNK]
+            permuted = (self._a * hv + self._b) % _MERSENNE          # (num_perm, chunk)
+            bounds = np.flatnonzero(np.r_[True, dv[1:] != dv[:-1]])  # owners are contiguous
+            mins = np.minimum.reduceat(permuted, bounds, axis=1)      # (num_perm, docs in chunk)
+            rows = dv[bounds]
+            sig[rows] = np.minimum(sig[rows], mins.T)
+        return sig
+
+    def _compatible(self, a: FrozenSet[str], b: FrozenSet[str], na: FrozenSet[str], nb: FrozenSet[str]) -> bool:
+        if self.strict_numbers and na and nb and not (na <= nb or nb <= na):
+            return False
+        return jaccard(a, b) >= self.threshold
+
+    def _clusters_compatible(self, a: Sequence[FrozenSet[str]], b: Sequence[FrozenSet[str]]) -> bool:
+        """Every number set of one cluster must nest with every number set of the other."""
+        if not self.strict_numbers:
+            return True
+        return all(x <= y or y <= x for x in a for y in b)
+
+    def cluster(self, titles: Sequence[str]) -> List[int]:
+        """Cluster label per title; labels are the index of the cluster's first title."""
+        n = len(titles)
+        if n == 0:
+            return []
+        feats = [shingles(t) for t in titles]
+        nums = [numeric_tokens(t) for t in titles]
+        sig = self.signatures(feats).astype(np.uint32)
+        rows = self.num_perm // self.bands
+
+        uf = _UnionFind(n)
+        # distinct non-empty number sets per cluster root: merging is transitive, so a
+        # title without numbers must not bridge "1TB" and "2TB" into one cluster
+        cluster_nums: Dict[int, List[FrozenSet[str]]] = {i: [nums[i]] for i in range(n) if nums[i]}
+        for band in range(self.bands):
+            buckets: Dict[bytes, List[int]] = {}
+            for i, row in enumerate(sig[:, band * rows:(band + 1) * rows]):
+                buckets.setdefault(row.tobytes(), []).append(i)
+            for members in buckets.values():
+                if len(members) < 2:
+                    continue
+                if len(members) <= _MAX_BUCKET_PAIRS:
+                    pairs = ((a, b) for x, a in enumerate(members) for b in members[x + 1:])
+                else:
+                    # anchor pairs plus each member's successor, so listings that don't
+                    # match the anchor can still chain to each other
+                    pairs = chain(((members[0], b) for b in members[1:]), zip(members[1:], members[2:]))
+                for i, j in pairs:
+                    # pairs already joined by an earlier band skip verification
+                    ri, rj = uf.find(i), uf.find(j)
+                    if ri == rj or not self._compatible(feats[i], feats[j], nums[i], nums[j]):
+                        continue
+                    if not self._clusters_compatible(cluster_nums.get(ri, ()), cluster_nums.get(rj, ())):
+                        continue
+                    uf.union(ri, rj)
+                    merged = set(cluster_nums.pop(ri, ())) | set(cluster_nums.pop(rj, ()))
+                    if merged:
+                        cluster_nums[uf.find(ri)] = list(merged)
+        return [uf.find(i) for i in range(n)]
+
+    def group(self, titles: Sequence[str]) -> Dict[int, List[int]]:
+        groups: Dict[int, List[int]] = defaultdict(list)
+        for i, label in enumerate(self.cluster(titles)):
+            groups[label].append(i)
+        return dict(groups)
@@ -1,19 +1,27 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 import statistics
 from collections import defaultdict
 from agentic_shop.agents.utils import Product, normalize_title
-from agentic_shop.agents.storage import track_price, get_price_history
+from agentic_shop.agents.storage import track_prices_bulk, get_price_histories
+from agentic_shop.agents.matching import ProductMatcher
 
 class PriceComparisonAgent:
+    def __init__(self, history_limit: Optional[int] = None, matcher: Optional[ProductMatcher] = None):
+        self.history_limit = history_limit  # last K points per product (None = full history)
+        self.matcher = matcher or ProductMatcher()
+
     def compare(self, products: List[Product]) -> Dict[str, Dict]:
         """
-        Groups products by normalized title and computes stats & best deal.
-        Also tracks price history in SQLite.
+        Groups near-duplicate listings (across retailers) and computes stats & best deal.
+        Groups are keyed by the normalized title of their first listing.
+        Also tracks price history in SQLite (one bulk write, one bulk read).
         """
         groups: Dict[str, List[Product]] = defaultdict(list)
-        for p in products:
-            groups[normalize_title(p.title)].append(p)
-            track_price(p.id, p.retailer, p.price)
+        labels = self.matcher.cluster([p.title for p in products])
+        for p, label in zip(products, labels):
+            groups[normalize_title(products[label].title)].append(p)
+        track_prices_bulk((p.id, p.retailer, p.price) for p in products)
+        history = get_price_histories([p.id for p in products], limit=self.history_limit)
 
         summary: Dict[str, Dict] = {}
         for key, items in groups.items():
@@ -26,6 +34,6 @@ class PriceComparisonAgent:
                 "max_price": max(prices),
                 "avg_price": round(statistics.mean(prices), 2),
                 "best_deal": best,
-                "history": {i.id: get_price_history(i.id) for i in items}
+                "history": {i.id: history[i.id] for i in items}
             }
         return summary
@@ -1,15 +1,50 @@
-from typing import List
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, as_completed, TimeoutError as FuturesTimeout
+from typing import List, Dict, Any, Callable, Tuple, Optional, Iterator
 from agentic_shop.agents.utils import Product
-from agentic_shop.agents.providers.ebay import search_ebay_browse
-from agentic_shop.config import SERPAPI_API_KEY
-from agentic_shop.agents.providers.serpapi_shopping import search_serpapi_shopping
+from agentic_shop.agents.providers.cache import SearchCache
+from agentic_shop.agents.providers.registry import enabled_providers
+from agentic_shop.config import SEARCH_DEADLINE
+
+ProviderFn = Callable[[str, int], List[Product]]
 
 class ProductSearchAgent:
-    """Real external sources: eBay Browse + Google Shopping (SerpApi)."""
-    def search(self, query: str, limit: int = 10) -> List[Product]:
+    """Fans a query out to the enabled providers (eBay Browse, Google Shopping via SerpApi, plugins)."""
+    def __init__(self,
+                 providers: List[Tuple[str, ProviderFn]] | None = None,
+                 concurrent: bool = True,
+                 deadline: float = SEARCH_DEADLINE,
+                 cache: Optional[SearchCache] = None,
+                 use_cache: bool = True):
+        # cache-key params per provider (e.g. marketplace), declared by registry specs
+        self.cache_params: Dict[str, Dict[str, Any]] = {}
+        if providers is None:
+            specs = enabled_providers()
+            providers = [(spec.name, spec.search) for spec in specs]
+            self.cache_params = {spec.name: spec.cache_params for spec in specs}
+        self.providers = list(providers)
+        self.concurrent = concurrent
+        self.deadline = deadline
+        self.cache = (cache or SearchCache()) if use_cache else None
+        # per-provider {"status", "elapsed", "count"} of the most recent search; concurrent
+        # callers should pass their own `stats` dict instead of reading this
+        self.last_stats: Dict[str, Dict[str, Any]] = {}
+
+    def search(self, query: str, limit: int = 10,
+               stats: Optional[Dict[str, Dict[str, Any]]] = None) -> List[Product]:
+        """Listings from every provider; per-provider stats go to `stats` (and last_stats)."""
+        stats = {} if stats is None else stats
+        if self.concurrent:
+            batches = self._fan_out(query, limit)
+        else:
+            batches = [self._call(name, fn, query, limit) for name, fn in self.providers]
+
         results: List[Product] = []
-        results.extend(search_ebay_browse(query, limit=limit))
-        results.extend(search_serpapi_shopping(SERPAPI_API_KEY, query, limit=limit))
+        for name, status, elapsed, products in batches:
+            stats[name] = {"status": status, "elapsed": round(elapsed, 3), "count": len(products)}
+            results.extend(products)
+        self.last_stats = stats
 
         # Deduplicate by (retailer, id)
         seen = set()
@@ -21,3 +56,79 @@ class ProductSearchAgent:
             seen.add(key)
             deduped.append(p)
         return deduped
+
+    def iter_search(self, query: str, limit: int = 10,
+                    stats: Optional[Dict[str, Dict[str, Any]]] = None) -> Iterator[Tuple[str, List[Product]]]:
+        """
+        Streaming variant of search(): yields (provider name, new products) as each
+        provider finishes, deduplicated against earlier batches. Uses the same
+        deadline and fills `stats` (and last_stats) the same way.
+        """
+        stats = {} if stats is None else stats
+        self.last_stats = stats
+        seen = set()
+
+        def emit(name: str, status: str, elapsed: float, products: List[Product]) -> Tuple[str, List[Product]]:
+            stats[name] = {"status": status, "elapsed": round(elapsed, 3), "count": len(products)}
+            fresh = []
+            for p in products:
+                key = (p.retailer, p.id)
+                if key not in seen:
+                    seen.add(key)
+                    fresh.append(p)
+            return name, fresh
+
+        if not self.concurrent:
+            for name, fn in self.providers:
+                yield emit(*self._call(name, fn, query, limit))
+            return
+        if not self.providers:
+            return
+        start = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=len(self.providers), thread_name_prefix="search")
+        futures = {pool.submit(self._call, name, fn, query, limit): name for name, fn in self.providers}
+        try:
+            for fut in as_completed(futures, timeout=self.deadline):
+                yield emit(*fut.result())
+        except FuturesTimeout:
+            for name in futures.values():
+                if name not in stats:
+                    stats[name] = {"status": "timeout", "elapsed": round(time.perf_counter() - start, 3),
+                                             "count": 0}
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _call(self, name: str, fn: ProviderFn, query: str, limit: int) -> Tuple[str, str, float, List[Product]]:
+        start = time.perf_counter()
+        try:
+            if self.cache is not None:
+                products = self.cache.get_or_fetch(name, query, limit, lambda: fn(query, limit),
+                                                   **self.cache_params.get(name, {}))
+            else:
+                products = fn(query, limit)
+            status = "ok"
+        except Exception as e:
+            print(f"[search:{name}] {e}", file=sys.stderr)
+            products, status = [], "error"
+        return name, status, time.perf_counter() - start, products
+
+    def _fan_out(self, query: str, limit: int) -> List[Tuple[str, str, float, List[Product]]]:
+        """
+        Queries every provider at once and keeps whatever finished before the deadline.
+        Stragglers are reported as 'timeout' and left to finish in the background.
+        """
+        if not self.providers:
+            return []
+        start = time.perf_counter()
+        pool = ThreadPoolExecutor(max_workers=len(self.providers), thread_name_prefix="search")
+        futures = {pool.submit(self._call, name, fn, query, limit): name for name, fn in self.providers}
+        done, _ = wait(futures, timeout=self.deadline)
+        pool.shutdown(wait=False, cancel_futures=True)
+
+        out = []
+        for fut, name in futures.items():  # keep registration order for stable output
+            if fut in done:
+                out.append(fut.result())
+            else:
+                out.append((name, "timeout", time.perf_counter() - start, []))
+        return out
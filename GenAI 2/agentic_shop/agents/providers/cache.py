@@ -0,0 +1,184 @@
+import json
+import os
+import sqlite3
+import sys
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import asdict, replace
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agentic_shop.agents.utils import Product, Review
+from agentic_shop.config import (SEARCH_CACHE_PATH, SEARCH_CACHE_TTLS, SEARCH_CACHE_DEFAULT_TTL,
+                                 SEARCH_CACHE_STALE, SEARCH_CACHE_MEMORY)
+
+Fetch = Callable[[], List[Product]]
+
+def normalize_query(query: str) -> str:
+    return " ".join((query or "").lower().split())
+
+def _dump(products: List[Product]) -> str:
+    return json.dumps([asdict(p) for p in products])
+
+def _load(payload: str) -> List[Product]:
+    out = []
+    for d in json.loads(payload):
+        d["reviews"] = [Review(**r) for r in d.get("reviews") or []]
+        out.append(Product(**d))
+    return out
+
+def _copies(products: List[Product]) -> List[Product]:
+    """Per-caller copies: enrichment appends reviews/extra in place, which must not leak into the cache."""
+    return [replace(p, reviews=list(p.reviews), extra=dict(p.extra)) for p in products]
+
+class SearchCache:
+    """
+    Response cache for provider searches keyed by (provider, normalized query, limit, params).
+
+    - fresh (age < provider TTL): served directly
+    - stale (age < TTL + stale window): served, and refreshed once in the background
+    - expired/missing: fetched; concurrent identical requests share one upstream call
+    Empty results are never stored, since providers return [] on errors.
+    """
+    def __init__(self, path: Optional[str] = SEARCH_CACHE_PATH,
+                 ttls: Optional[Dict[str, int]] = None,
+                 default_ttl: int = SEARCH_CACHE_DEFAULT_TTL,
+                 stale: int = SEARCH_CACHE_STALE,
+                 memory_size: int = SEARCH_CACHE_MEMORY):
+        self.path = path  # None keeps the cache in memory only
+        self.ttls = dict(SEARCH_CACHE_TTLS if ttls is None else ttls)
+        self.default_ttl = default_ttl
+        self.stale = stale
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, Tuple[float, List[Product]]]" = OrderedDict()
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._refresher = ThreadPoolExecutor(max_workers=2, thread_name_prefix="search-refresh")
+        self.stats = {"fresh_hits": 0, "stale_hits": 0, "misses": 0, "coalesced": 0, "refreshes": 0}
+
+    @staticmethod
+    def key(provider: str, query: str, limit: int, **params: Any) -> str:
+        return json.dumps([provider, normalize_query(query), limit, sorted(params.items())])
+
+    def ttl(self, provider: str) -> int:
+        return self.ttls.get(provider, self.default_ttl)
+
+    # --- storage tiers --------------------------------------------------------
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key       TEXT PRIMARY KEY,
+                    provider  TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    payload   TEXT NOT NULL
+                )
+            """)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key: str, stored_at: float, products: List[Product]):
+        self._memory[key] = (stored_at, products)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _lookup(self, key: str) -> Optional[Tuple[float, List[Product]]]:
+        with self._lock:
+            hit = self._memory.get(key)
+            if hit is not None:
+                self._memory.move_to_end(key)
+                return hit
+            if self.path is None:
+                return None
+            row = self._db().execute("SELECT stored_at, payload FROM search_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            entry = (row[0], _load(row[1]))
+            self._remember(key, *entry)
+            return entry
+
+    def _store(self, provider: str, key: str, products: List[Product]):
+        if not products:
+            return
+        now = time.time()
+        with self._lock:
+            self._remember(key, now, products)
+            if self.path is not None:
+                conn = self._db()
+                with conn:
+                    conn.execute("INSERT OR REPLACE INTO search_cache VALUES (?, ?, ?, ?)",
+                                 (key, provider, now, _dump(products)))
+                    # drop entries past their stale window
+                    conn.execute("DELETE FROM search_cache WHERE provider = ? AND stored_at < ?",
+                                 (provider, now - self.ttl(provider) - self.stale))
+
+    # --- request coalescing ---------------------------------------------------
+    def _fetch(self, provider: str, key: str, fetch: Fetch) -> List[Product]:
+        with self._lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = self._inflight[key] = Future()
+            else:
+                self.stats["coalesced"] += 1
+        if not leader:
+            return _copies(fut.result())
+        try:
+            products = fetch()
+            self._store(provider, key, products)
+            fut.set_result(products)
+            return _copies(products)
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def get_or_fetch(self, provider: str, query: str, limit: int, fetch: Fetch, **params: Any) -> List[Product]:
+        key = self.key(provider, query, limit, **params)
+        entry = self._lookup(key)
+        if entry is not None:
+            age = time.time() - entry[0]
+            ttl = self.ttl(provider)
+            if age < ttl:
+                self.stats["fresh_hits"] += 1
+                return _copies(entry[1])
+            if age < ttl + self.stale:
+                self.stats["stale_hits"] += 1
+                with self._lock:
+                    refreshing = key in self._inflight
+                if not refreshing:
+                    self.stats["refreshes"] += 1
+                    self._refresher.submit(self._refresh, provider, key, fetch)
+                return _copies(entry[1])
+        self.stats["misses"] += 1
+        return self._fetch(provider, key, fetch)
+
+    def _refresh(self, provider: str, key: str, fetch: Fetch):
+        try:
+            self._fetch(provider, key, fetch)
+        except Exception as e:
+            print(f"[search-cache] background refresh for {provider} failed: {e}", file=sys.stderr)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self.path is not None:
+                conn = self._db()
+                with conn:
+                    conn.execute("DELETE FROM search_cache")
+
+    def close(self):
+        self._refresher.shutdown(wait=False)
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,11 +1,23 @@
+import hashlib
+import math
+import os
+import sqlite3
+import sys
+import threading
 import time
-from typing import List, Tuple, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from typing import List, Tuple, Dict, Any, Optional, Iterator, Callable
 
 import requests
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from agentic_shop.agents.utils import Product
-from agentic_shop.config import EBAY_ENV, EBAY_CLIENT_ID, EBAY_CLIENT_SECRET, EBAY_OAUTH_SCOPES, MARKETPLACE
+from agentic_shop.agents.transport import request
+from agentic_shop.agents.circuit import CircuitOpen
+from agentic_shop.agents.ratelimit import get_rate_limiter, RateLimited
+from agentic_shop.config import (EBAY_ENV, EBAY_CLIENT_ID, EBAY_CLIENT_SECRET, EBAY_OAUTH_SCOPES, MARKETPLACE,
+                                 EBAY_TOKEN_REFRESH_MARGIN, EBAY_TOKEN_CACHE_PATH)
 
 # OAuth token endpoints
 TOKEN_ENDPOINT_PROD = "https://api.ebay.com/identity/v1/oauth2/token"
@@ -15,53 +27,193 @@ TOKEN_ENDPOINT_SBX  = "https://api.sandbox.ebay.com/identity/v1/oauth2/token"
 BROWSE_ENDPOINT_PROD = "https://api.ebay.com/buy/browse/v1/item_summary/search"
 BROWSE_ENDPOINT_SBX  = "https://api.sandbox.ebay.com/buy/browse/v1/item_summary/search"
 
+# Browse item detail endpoints
+ITEM_ENDPOINT_PROD = "https://api.ebay.com/buy/browse/v1/item/"
+ITEM_ENDPOINT_SBX  = "https://api.sandbox.ebay.com/buy/browse/v1/item/"
+
+# Browse pagination limits
+BROWSE_MAX_PAGE_SIZE = 200
+BROWSE_MAX_OFFSET = 10000
+BROWSE_STREAM_PAGE_SIZE = 50
+
 class EbayAuthError(Exception): ...
 class EbayHTTPError(Exception): ...
 class EbayRateLimit(Exception): ...
 
-# simple module-level cache
-_token_cache: Dict[str, Any] = {"token": None, "exp": 0}
+class EbayTokenManager:
+    """
+    Thread-safe OAuth token cache with single-flight refresh.
 
-def _token_expired() -> bool:
-    return not _token_cache["token"] or time.time() >= _token_cache["exp"]
+    - Only one caller mints a token at a time; everyone else waits on the lock and
+      reuses the result.
+    - A background timer refreshes the token `refresh_margin` seconds before it expires,
+      so callers normally never block on the identity endpoint.
+    - With `shared_path`, tokens are kept in a SQLite file and minted inside a
+      BEGIN IMMEDIATE transaction, so a fleet of worker processes shares one token.
+    """
+    def __init__(self, mint: Callable[[], Tuple[str, int]],
+                 shared_path: str = EBAY_TOKEN_CACHE_PATH,
+                 cache_key: str = "",
+                 refresh_margin: int = EBAY_TOKEN_REFRESH_MARGIN,
+                 background: bool = True,
+                 clock: Callable[[], float] = time.time):
+        self.mint = mint
+        self.shared_path = shared_path
+        self.cache_key = cache_key
+        self.refresh_margin = refresh_margin
+        self.background = background
+        self.clock = clock
+        self.stats = {"mints": 0, "shared_hits": 0, "background_refreshes": 0}
+        self._token: Optional[str] = None
+        self._exp = 0.0  # absolute expiry reported by eBay
+        self._lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+        self._failures = 0  # consecutive failed background refreshes
+        self._closed = False
 
-def _get_token() -> str:
-    """Client-credentials OAuth token for Browse API."""
-    if EBAY_ENV not in ("production", "sandbox"):
-        raise EbayAuthError("EBAY_ENV must be 'production' or 'sandbox'")
-    if not EBAY_CLIENT_ID or not EBAY_CLIENT_SECRET:
-        raise EbayAuthError("Missing EBAY_CLIENT_ID/EBAY_CLIENT_SECRET in .env")
+    def _usable(self, exp: float, margin: float) -> bool:
+        return self.clock() < exp - margin
+
+    def get(self) -> str:
+        token, exp = self._token, self._exp
+        if token and self._usable(exp, 60):  # never hand out a token in its last minute
+            return token
+        with self._lock:
+            if not (self._token and self._usable(self._exp, 60)):
+                self._refresh_locked(margin=60)
+            return self._token
+
+    def refresh(self):
+        """Proactive refresh; a no-op when another caller or process already did it."""
+        with self._lock:
+            self._refresh_locked(margin=self.refresh_margin)
+
+    def _refresh_locked(self, margin: float):
+        if self._token and self._usable(self._exp, margin):
+            return
+        if self.shared_path:
+            token, exp = self._shared_fetch(margin)
+        else:
+            token, exp = self._mint()
+        self._token, self._exp = token, exp
+        self._failures = 0
+        self._schedule()
+
+    def _mint(self) -> Tuple[str, float]:
+        token, expires_in = self.mint()
+        self.stats["mints"] += 1
+        return token, self.clock() + expires_in
+
+    def _shared_fetch(self, margin: float) -> Tuple[str, float]:
+        os.makedirs(os.path.dirname(os.path.abspath(self.shared_path)), exist_ok=True)
+        conn = sqlite3.connect(self.shared_path, timeout=60, isolation_level=None)
+        try:
+            try:
+                os.chmod(self.shared_path, 0o600)  # holds live bearer tokens
+            except OSError:
+                pass
+            conn.execute("CREATE TABLE IF NOT EXISTS oauth_tokens (key TEXT PRIMARY KEY, token TEXT NOT NULL, exp REAL NOT NULL)")
+            conn.execute("BEGIN IMMEDIATE")  # one minting process at a time
+            try:
+                row = conn.execute("SELECT token, exp FROM oauth_tokens WHERE key = ?", (self.cache_key,)).fetchone()
+                if row and self._usable(row[1], margin):
+                    self.stats["shared_hits"] += 1
+                    conn.execute("COMMIT")
+                    return row[0], row[1]
+                token, exp = self._mint()
+                conn.execute("INSERT OR REPLACE INTO oauth_tokens (key, token, exp) VALUES (?, ?, ?)",
+                             (self.cache_key, token, exp))
+                conn.execute("COMMIT")
+                return token, exp
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
 
-    if not _token_expired():
-        return _token_cache["token"]
+    def _schedule(self, delay: Optional[float] = None):
+        if not self.background or self._closed:
+            return
+        if self._timer is not None:
+            self._timer.cancel()
+        if delay is None:
+            delay = max(1.0, self._exp - self.refresh_margin - self.clock())
+        self._timer = threading.Timer(delay, self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
 
+    def _background_refresh(self):
+        self.stats["background_refreshes"] += 1
+        try:
+            self.refresh()
+        except Exception as e:
+            # callers still hold a valid token; retry with backoff (get() also retries synchronously)
+            self._failures += 1
+            delay = min(300.0, 5.0 * 2 ** (self._failures - 1))
+            print(f"[eBay OAuth] background refresh failed: {e}; retrying in {delay:.0f}s", file=sys.stderr)
+            self._schedule(delay)
+
+    def close(self):
+        self._closed = True
+        if self._timer is not None:
+            self._timer.cancel()
+
+def _mint_token() -> Tuple[str, int]:
+    """Client-credentials grant; returns (access token, lifetime in seconds)."""
     token_url = TOKEN_ENDPOINT_SBX if EBAY_ENV == "sandbox" else TOKEN_ENDPOINT_PROD
     data = {
         "grant_type": "client_credentials",
         "scope": " ".join(EBAY_OAUTH_SCOPES),
     }
     try:
-        r = requests.post(token_url, data=data, auth=(EBAY_CLIENT_ID, EBAY_CLIENT_SECRET), timeout=20)
+        r = request("ebay", "POST", token_url, endpoint="ebay.oauth", data=data,
+                    auth=(EBAY_CLIENT_ID, EBAY_CLIENT_SECRET), timeout=20)
         r.raise_for_status()
         j = r.json()
         access = j.get("access_token")
         expires = int(j.get("expires_in", 7200))
         if not access:
             raise EbayAuthError(f"OAuth error: {j}")
-        _token_cache["token"] = access
-        _token_cache["exp"] = time.time() + max(expires - 60, 60)  # refresh 1 min early
-        return access
+        return access, expires
     except requests.RequestException as e:
         raise EbayAuthError(f"OAuth HTTP error: {e}")
 
+_token_manager: Optional[EbayTokenManager] = None
+_token_manager_lock = threading.Lock()
+
+def get_token_manager() -> EbayTokenManager:
+    global _token_manager
+    with _token_manager_lock:
+        if _token_manager is None:
+            key = hashlib.sha256(f"{EBAY_ENV}|{EBAY_CLIENT_ID}|{' '.join(EBAY_OAUTH_SCOPES)}".encode()).hexdigest()
+            _token_manager = EbayTokenManager(_mint_token, cache_key=key)
+        return _token_manager
+
+def close_token_manager():
+    """Stops the background refresh timer (if a token manager was ever created)."""
+    global _token_manager
+    with _token_manager_lock:
+        if _token_manager is not None:
+            _token_manager.close()
+            _token_manager = None
+
+def _get_token() -> str:
+    """Client-credentials OAuth token for Browse API."""
+    if EBAY_ENV not in ("production", "sandbox"):
+        raise EbayAuthError("EBAY_ENV must be 'production' or 'sandbox'")
+    if not EBAY_CLIENT_ID or not EBAY_CLIENT_SECRET:
+        raise EbayAuthError("Missing EBAY_CLIENT_ID/EBAY_CLIENT_SECRET in .env")
+    return get_token_manager().get()
+
 @retry(
     reraise=True,
     stop=stop_after_attempt(4),
     wait=wait_exponential(multiplier=1, min=1, max=16),
     retry=retry_if_exception_type((EbayHTTPError, EbayRateLimit))
 )
-def _browse_search(q: str, limit: int) -> Dict[str, Any]:
+def _browse_search(q: str, limit: int, offset: int = 0) -> Dict[str, Any]:
     token = _get_token()
+    get_rate_limiter().acquire("ebay", EBAY_CLIENT_ID)  # waits for a slot or raises RateLimited
     endpoint = BROWSE_ENDPOINT_SBX if EBAY_ENV == "sandbox" else BROWSE_ENDPOINT_PROD
     headers = {
         "Authorization": f"Bearer {token}",
@@ -70,9 +222,12 @@ def _browse_search(q: str, limit: int) -> Dict[str, Any]:
         "User-Agent": "agentic-assistant/1.0",
     }
     params = {"q": q, "limit": str(limit)}
+    if offset:
+        params["offset"] = str(offset)
 
     try:
-        r = requests.get(endpoint, headers=headers, params=params, timeout=20)
+        r = request("ebay", "GET", endpoint, endpoint="ebay.browse", headers=headers, params=params, timeout=20,
+                    rate_limit=("ebay", EBAY_CLIENT_ID))
         status = r.status_code
         if status == 429:
             raise EbayRateLimit("429 Too Many Requests (Browse)")
@@ -84,54 +239,126 @@ def _browse_search(q: str, limit: int) -> Dict[str, Any]:
         # network/client errors -> retry if transient
         raise EbayHTTPError(str(e))
 
-def search_ebay_browse(query: str, limit: int = 10) -> List[Product]:
-    """Search eBay via Buy Browse API. Strict, no fallbacks."""
+@retry(
+    reraise=True,
+    stop=stop_after_attempt(3),
+    wait=wait_exponential(multiplier=1, min=1, max=8),
+    retry=retry_if_exception_type((EbayHTTPError, EbayRateLimit))
+)
+def get_item(item_id: str, etag: Optional[str] = None) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+    """
+    Browse getItem. With `etag`, sends a conditional request and returns (None, etag)
+    when the item is unchanged (304). Otherwise returns (item JSON, new ETag).
+    """
+    token = _get_token()
+    get_rate_limiter().acquire("ebay", EBAY_CLIENT_ID)
+    endpoint = (ITEM_ENDPOINT_SBX if EBAY_ENV == "sandbox" else ITEM_ENDPOINT_PROD) + quote(item_id, safe="")
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "X-EBAY-C-MARKETPLACE-ID": MARKETPLACE,
+        "Accept": "application/json",
+        "User-Agent": "agentic-assistant/1.0",
+    }
+    if etag:
+        headers["If-None-Match"] = etag
+    try:
+        r = request("ebay", "GET", endpoint, endpoint="ebay.item", headers=headers, timeout=20,
+                    rate_limit=("ebay", EBAY_CLIENT_ID))
+        status = r.status_code
+        if status == 304:
+            return None, etag
+        if status == 429:
+            raise EbayRateLimit("429 Too Many Requests (getItem)")
+        if status >= 500:
+            raise EbayHTTPError(f"Server {status}")
+        r.raise_for_status()
+        return r.json(), r.headers.get("ETag")
+    except requests.RequestException as e:
+        raise EbayHTTPError(str(e))
+
+def _fetch_page(query: str, limit: int, offset: int) -> Optional[Dict[str, Any]]:
+    """One Browse page, or None (after logging) on any error."""
     try:
-        data = _browse_search(query, limit)
+        return _browse_search(query, limit, offset)
     except EbayAuthError as e:
-        print(f"[eBay OAuth] {e}")
-        return []
+        print(f"[eBay OAuth] {e}", file=sys.stderr)
     except EbayRateLimit as e:
-        print(f"[eBay] Rate limit: {e} — reduce request frequency or request higher limits.")
-        return []
+        print(f"[eBay] Rate limit: {e} — reduce request frequency or request higher limits.", file=sys.stderr)
+    except RateLimited as e:
+        print(f"[eBay] Request shed: {e}", file=sys.stderr)
+    except CircuitOpen as e:
+        print(f"[eBay] Failing fast: {e}", file=sys.stderr)
     except EbayHTTPError as e:
-        print(f"[eBay] HTTP error: {e}")
-        return []
+        print(f"[eBay] HTTP error: {e}", file=sys.stderr)
     except Exception as e:
-        print(f"[eBay] Unexpected: {e}")
-        return []
-
-    items = data.get("itemSummaries", []) or []
-    out: List[Product] = []
-    for it in items:
-        item_id = it.get("itemId", "")
-        title = it.get("title", "")
-        price_obj = it.get("price") or {}
-        price = float(price_obj.get("value", 0.0)) if price_obj else 0.0
-        currency = price_obj.get("currency", "USD") if price_obj else "USD"
-        url = it.get("itemWebUrl") or it.get("itemAffiliateWebUrl") or ""
-        img = (it.get("image") or {}).get("imageUrl") or \
-              (it.get("thumbnailImages") or [{}])[0].get("imageUrl")
-
-        # buyer reviews if present (not always returned)
-        rating = None
-        buyer_reviews = it.get("buyerReviews") or {}
-        if buyer_reviews.get("ratingAverage") is not None:
-            try:
-                rating = float(buyer_reviews["ratingAverage"])
-            except Exception:
-                rating = None
-
-        out.append(Product(
-            id=f"ebay:{item_id}",
-            title=title,
-            price=price,
-            currency=currency,
-            retailer="eBay",
-            url=url,
-            image_url=img,
-            rating=rating,
-            reviews=[],
-            extra={}
-        ))
-    return out
+        print(f"[eBay] Unexpected: {e}", file=sys.stderr)
+    return None
+
+def _to_product(it: Dict[str, Any]) -> Product:
+    item_id = it.get("itemId", "")
+    title = it.get("title", "")
+    price_obj = it.get("price") or {}
+    price = float(price_obj.get("value", 0.0)) if price_obj else 0.0
+    if not math.isfinite(price):  # float() accepts "NaN"/"Infinity"
+        price = 0.0
+    currency = price_obj.get("currency", "USD") if price_obj else "USD"
+    url = it.get("itemWebUrl") or it.get("itemAffiliateWebUrl") or ""
+    img = (it.get("image") or {}).get("imageUrl") or \
+          (it.get("thumbnailImages") or [{}])[0].get("imageUrl")
+
+    # buyer reviews if present (not always returned)
+    rating = None
+    buyer_reviews = it.get("buyerReviews") or {}
+    if buyer_reviews.get("ratingAverage") is not None:
+        try:
+            rating = float(buyer_reviews["ratingAverage"])
+        except Exception:
+            rating = None
+
+    return Product(
+        id=f"ebay:{item_id}",
+        title=title,
+        price=price,
+        currency=currency,
+        retailer="eBay",
+        url=url,
+        image_url=img,
+        rating=rating,
+        reviews=[],
+        extra={}
+    )
+
+def iter_ebay_browse(query: str, max_results: int = 200, page_size: int = BROWSE_STREAM_PAGE_SIZE) -> Iterator[Product]:
+    """
+    Streams Browse results page by page, following offset/next pagination.
+    The next page is fetched in the background while the current one is consumed.
+    """
+    max_results = min(max_results, BROWSE_MAX_OFFSET)
+    page_size = max(1, min(page_size, BROWSE_MAX_PAGE_SIZE, max_results))
+    pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ebay-page")
+    try:
+        pending = pool.submit(_fetch_page, query, page_size, 0)
+        offset = yielded = 0
+        while pending is not None:
+            data = pending.result()
+            pending = None
+            if not data:
+                return
+            items = data.get("itemSummaries", []) or []
+            offset += page_size
+            total = min(max_results, data.get("total", max_results))
+            more = bool(data.get("next")) and len(items) >= page_size and offset < total
+            if more and yielded + len(items) < max_results:
+                pending = pool.submit(_fetch_page, query, min(page_size, max_results - offset), offset)
+            for it in items:
+                if yielded >= max_results:
+                    return
+                yield _to_product(it)
+                yielded += 1
+    finally:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+def search_ebay_browse(query: str, limit: int = 10) -> List[Product]:
+    """Search eBay via Buy Browse API. Strict, no fallbacks."""
+    # one request for up to 200 results; larger limits paginate
+    return list(iter_ebay_browse(query, max_results=limit, page_size=BROWSE_MAX_PAGE_SIZE))
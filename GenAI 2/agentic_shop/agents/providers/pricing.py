@@ -0,0 +1,104 @@
+"""
+Price/currency parsing for marketplace feeds.
+
+Structured numeric fields win over display strings. Display strings are parsed
+with precompiled, table-driven patterns that understand currency prefixes and
+suffixes, locale thousands/decimal separators and "low to high" ranges.
+"""
+import math
+import re
+from typing import Any, Optional, Tuple
+
+DEFAULT_CURRENCY = "USD"
+
+# (symbol as shown in feeds, ISO code); matched longest first
+_SYMBOLS = [
+    ("US$", "USD"), ("US $", "USD"), ("CA$", "CAD"), ("C$", "CAD"), ("AU$", "AUD"), ("A$", "AUD"),
+    ("NZ$", "NZD"), ("HK$", "HKD"), ("S$", "SGD"), ("R$", "BRL"), ("MX$", "MXN"),
+    ("$", "USD"), ("€", "EUR"), ("£", "GBP"), ("₹", "INR"), ("¥", "JPY"), ("₩", "KRW"),
+    ("₽", "RUB"), ("₺", "TRY"), ("₪", "ILS"), ("zł", "PLN"), ("Rs.", "INR"), ("Rs", "INR"),
+]
+_ISO_CODES = ("USD", "EUR", "GBP", "INR", "JPY", "CAD", "AUD", "NZD", "HKD", "SGD", "BRL", "MXN",
+              "KRW", "RUB", "TRY", "ILS", "PLN", "CHF", "SEK", "NOK", "DKK", "CNY", "ZAR")
+# currencies whose feeds conventionally write 1.299,99
+_COMMA_DECIMAL = frozenset({"EUR", "BRL", "TRY", "PLN", "RUB", "SEK", "NOK", "DKK", "ZAR"})
+
+_SYMBOL_PATTERN = "|".join(re.escape(s) for s, _ in sorted(_SYMBOLS, key=lambda x: -len(x[0])))
+_SYMBOL_RE = re.compile(_SYMBOL_PATTERN)
+_SYMBOL_TO_CODE = dict(_SYMBOLS)
+_CODE_PATTERN = r"\b(" + "|".join(_ISO_CODES) + r")\b"
+_CODE_RE = re.compile(_CODE_PATTERN)
+# numbers: space/NBSP/apostrophe (' or U+2019) grouped thousands, digits with . and , separators, or .99
+_NUMBER_RE = re.compile(r"\d{1,3}(?:[ '\u2019\u00a0\u202f]\d{3})+(?:[.,]\d{1,2})?(?!\d)|\d(?:[\d.,]*\d)?|(?<![\w.,])\.\d+")
+# a currency marker right before / right after a number
+_MARK_BEFORE_RE = re.compile(r"(?:" + _SYMBOL_PATTERN + "|" + _CODE_PATTERN + r")\s*$")
+_MARK_AFTER_RE = re.compile(r"\s*(?:" + _SYMBOL_PATTERN + "|" + _CODE_PATTERN + ")")
+_GROUPED_RE = re.compile(r"^\d{1,3}(?:[.,]\d{2,3})+$")
+_SPACES = str.maketrans("", "", " '\u2019\u00a0\u202f")
+
+def detect_currency(s: str, default: str = DEFAULT_CURRENCY) -> str:
+    m = _CODE_RE.search(s)
+    if m:
+        return m.group(1)
+    m = _SYMBOL_RE.search(s)
+    return _SYMBOL_TO_CODE[m.group(0)] if m else default
+
+def _price_number(s: str) -> Optional["re.Match[str]"]:
+    """The first number next to a currency marker ("2 for $10", "Save 20% $80"), else the first number."""
+    first = None
+    for m in _NUMBER_RE.finditer(s):
+        start = m.start()
+        if _MARK_AFTER_RE.match(s, m.end()) or _MARK_BEFORE_RE.search(s, max(0, start - 8), start):
+            return m
+        first = first or m
+    return first
+
+def _to_float(num: str, currency: str) -> float:
+    num = num.translate(_SPACES)
+    has_dot, has_comma = "." in num, "," in num
+    if has_dot and has_comma:
+        # whichever separator comes last is the decimal point
+        if num.rfind(",") > num.rfind("."):
+            num = num.replace(".", "").replace(",", ".")
+        else:
+            num = num.replace(",", "")
+    elif has_comma:
+        head, _, tail = num.rpartition(",")
+        if num.count(",") == 1 and len(tail) != 3:
+            num = head + "." + tail              # 49,99
+        else:
+            num = num.replace(",", "")           # 1,299 / 1,29,999
+    elif has_dot:
+        tail = num.rpartition(".")[2]
+        if num.count(".") > 1 or (len(tail) == 3 and currency in _COMMA_DECIMAL and _GROUPED_RE.match(num)):
+            num = num.replace(".", "")           # 1.299.999 / €1.299
+    return float(num)
+
+def _finite_number(x: Any) -> bool:
+    # JSON feeds can carry NaN/Infinity; those fall through to the display string
+    return isinstance(x, (int, float)) and not isinstance(x, bool) and math.isfinite(x)
+
+def parse_price(value: Any, extracted: Any = None, default_currency: str = DEFAULT_CURRENCY) -> Tuple[float, str]:
+    """
+    Returns (amount, ISO currency). `extracted` is a structured numeric field such as
+    SerpApi's `extracted_price` and takes precedence; `value` is the display string
+    used for the currency and as a fallback amount. Ranges yield the lower bound.
+    """
+    s = value if isinstance(value, str) else ""
+    currency = detect_currency(s, default_currency) if s else default_currency
+
+    if _finite_number(extracted):
+        return float(extracted), currency
+    if _finite_number(value):
+        return float(value), currency
+    if isinstance(extracted, str) and not s:
+        s = extracted
+        currency = detect_currency(s, default_currency)
+
+    m = _price_number(s)
+    if not m:
+        return 0.0, currency
+    try:
+        return _to_float(m.group(0), currency), currency
+    except ValueError:
+        return 0.0, currency
@@ -0,0 +1,137 @@
+"""
+Search provider registry.
+
+Providers are declared as ProviderSpec entries pointing at "module:function" and
+are only imported when a search first calls them, so importing the agent does not
+pull in requests/tenacity or any provider module. Third-party packages can add
+providers through the "agentic_shop.providers" entry-point group; an entry point
+may load to a ProviderSpec or directly to a search(query, limit) function.
+"""
+import importlib
+import sys
+import threading
+from dataclasses import dataclass, field
+from importlib.metadata import entry_points
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agentic_shop.agents.utils import Product
+from agentic_shop.config import SEARCH_PROVIDERS, MARKETPLACE, EBAY_CLIENT_ID, EBAY_CLIENT_SECRET, SERPAPI_API_KEY
+
+ENTRY_POINT_GROUP = "agentic_shop.providers"
+
+SearchFn = Callable[[str, int], List[Product]]
+
+@dataclass
+class ProviderSpec:
+    name: str
+    target: str                                  # "package.module:function"
+    capabilities: Tuple[str, ...] = ("search",)
+    cost: str = "free"                           # free | quota | paid
+    latency_class: str = "medium"                # fast | medium | slow
+    cache_params: Dict[str, Any] = field(default_factory=dict)  # params that belong in the cache key
+    available: Callable[[], bool] = lambda: True  # e.g. credentials configured
+    _fn: Optional[SearchFn] = field(default=None, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def load(self) -> SearchFn:
+        if self._fn is None:
+            with self._lock:
+                if self._fn is None:
+                    module, _, attr = self.target.partition(":")
+                    self._fn = getattr(importlib.import_module(module), attr)
+        return self._fn
+
+    @property
+    def loaded(self) -> bool:
+        return self._fn is not None
+
+    def search(self, query: str, limit: int) -> List[Product]:
+        return self.load()(query, limit)
+
+BUILTIN_PROVIDERS: List[ProviderSpec] = [
+    ProviderSpec(
+        name="ebay",
+        target="agentic_shop.agents.providers.ebay:search_ebay_browse",
+        capabilities=("search", "stream", "item_details", "ratings"),
+        cost="quota",
+        latency_class="medium",
+        cache_params={"marketplace": MARKETPLACE},
+        available=lambda: bool(EBAY_CLIENT_ID and EBAY_CLIENT_SECRET),
+    ),
+    ProviderSpec(
+        name="serpapi",
+        target="agentic_shop.agents.providers.serpapi_shopping:search",
+        capabilities=("search", "multi_retailer", "ratings"),
+        cost="paid",
+        latency_class="slow",
+        cache_params={"gl": "us", "hl": "en"},
+        available=lambda: bool(SERPAPI_API_KEY),
+    ),
+]
+
+_registry: Dict[str, ProviderSpec] = {}
+_registry_lock = threading.Lock()
+_plugins_loaded = False
+
+def register(spec: ProviderSpec, replace: bool = False):
+    with _registry_lock:
+        if spec.name in _registry and not replace:
+            raise ValueError(f"Provider {spec.name!r} is already registered")
+        _registry[spec.name] = spec
+
+def _load_plugins():
+    global _plugins_loaded
+    if _plugins_loaded:
+        return
+    for spec in BUILTIN_PROVIDERS:
+        _registry.setdefault(spec.name, spec)
+    try:
+        eps = entry_points(group=ENTRY_POINT_GROUP)
+    except Exception as e:
+        print(f"[providers] entry points unavailable: {e}", file=sys.stderr)
+        eps = []
+    for ep in eps:
+        try:
+            obj = ep.load()
+        except Exception as e:
+            print(f"[providers] failed to load plugin {ep.name!r}: {e}", file=sys.stderr)
+            continue
+        if isinstance(obj, ProviderSpec):
+            spec = obj
+        elif callable(obj):
+            spec = ProviderSpec(name=ep.name, target=ep.value)
+        else:
+            print(f"[providers] plugin {ep.name!r} is neither a ProviderSpec nor callable; skipping",
+                  file=sys.stderr)
+            continue
+        if spec.name in _registry:  # built-ins and explicit register() calls win
+            print(f"[providers] plugin {ep.name!r} provides {spec.name!r}, which is already registered; skipping",
+                  file=sys.stderr)
+            continue
+        _registry[spec.name] = spec
+    _plugins_loaded = True
+
+def all_providers() -> Dict[str, ProviderSpec]:
+    with _registry_lock:
+        _load_plugins()
+        return dict(_registry)
+
+def get_provider(name: str) -> ProviderSpec:
+    spec = all_providers().get(name)
+    if spec is None:
+        raise KeyError(f"Unknown search provider: {name!r}")
+    return spec
+
+def enabled_providers(names: Optional[List[str]] = None) -> List[ProviderSpec]:
+    """Specs for `names` (default: SEARCH_PROVIDERS) whose credentials are configured, in order."""
+    specs = all_providers()
+    out = []
+    for name in names if names is not None else SEARCH_PROVIDERS:
+        spec = specs.get(name)
+        if spec is None:
+            print(f"[providers] unknown provider {name!r} in SEARCH_PROVIDERS; skipping", file=sys.stderr)
+        elif spec.available():
+            out.append(spec)
+        else:
+            print(f"[providers] {name!r} disabled: credentials not configured", file=sys.stderr)
+    return out
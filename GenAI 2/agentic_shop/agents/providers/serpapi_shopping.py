@@ -1,50 +1,14 @@
-import re
-import requests
+import sys
 from typing import List
 from agentic_shop.agents.utils import Product
+from agentic_shop.agents.transport import request
+from agentic_shop.agents.circuit import CircuitOpen
+from agentic_shop.agents.ratelimit import get_rate_limiter, RateLimited
+from agentic_shop.agents.providers.pricing import parse_price
+from agentic_shop.config import SERPAPI_API_KEY
 
 API = "https://serpapi.com/search.json"
 
-_CURRENCY_BY_SYMBOL = {
-    "$": "USD", "€": "EUR", "£": "GBP", "₹": "INR", "¥": "JPY", "C$": "CAD", "A$": "AUD"
-}
-
-def _parse_price(price_str: str) -> (float, str):
-    """
-    Convert strings like "$49.99", "US $39.00", "£29.99", "49.00 USD", "$49.99 to $59.99"
-    into (49.99, "USD"). If it's a range, take the lower bound.
-    """
-    if not price_str:
-        return 0.0, "USD"
-    s = price_str.strip()
-
-    # Try to detect currency symbol
-    cur = "USD"
-    # prioritize multi-char symbols like C$, A$
-    if s.startswith("C$"):
-        cur = "CAD"
-    elif s.startswith("A$"):
-        cur = "AUD"
-    else:
-        for sym, cc in _CURRENCY_BY_SYMBOL.items():
-            if s.startswith(sym):
-                cur = cc
-                break
-        # also handle trailing currency code
-        m = re.search(r"\b([A-Z]{3})\b", s)
-        if m:
-            cur = m.group(1)
-
-    # choose first numeric occurrence
-    m = re.search(r"([0-9]+(?:[.,][0-9]{1,2})?)", s)
-    if not m:
-        return 0.0, cur
-    val = m.group(1).replace(",", "")
-    try:
-        return float(val), cur
-    except Exception:
-        return 0.0, cur
-
 def search_serpapi_shopping(api_key: str, query: str, limit: int = 10, gl: str = "us", hl: str = "en") -> List[Product]:
     """
     Google Shopping via SerpApi. Returns multiple retailers for price comparison.
@@ -61,10 +25,18 @@ def search_serpapi_shopping(api_key: str, query: str, limit: int = 10, gl: str =
         "api_key": api_key,
     }
     try:
-        r = requests.get(API, params=params, timeout=25)
+        get_rate_limiter().acquire("serpapi", api_key)
+        r = request("serpapi", "GET", API, endpoint="serpapi.search", params=params, timeout=25)
         r.raise_for_status()
         data = r.json()
-    except Exception:
+    except RateLimited as e:
+        print(f"[SerpApi] Request shed: {e}", file=sys.stderr)
+        return []
+    except CircuitOpen as e:
+        print(f"[SerpApi] Failing fast: {e}", file=sys.stderr)
+        return []
+    except Exception as e:
+        print(f"[SerpApi] HTTP error: {e}", file=sys.stderr)
         return []
 
     items = data.get("shopping_results", []) or []
@@ -81,7 +53,7 @@ def search_serpapi_shopping(api_key: str, query: str, limit: int = 10, gl: str =
             if isinstance(arr, list) and arr:
                 thumb = arr[0].get("thumbnail")
 
-        price_val, currency = _parse_price(it.get("price", "") or it.get("extracted_price", ""))
+        price_val, currency = parse_price(it.get("price"), extracted=it.get("extracted_price"))
         # SerpApi may also provide "rating"
         rating = None
         if it.get("rating") is not None:
@@ -103,3 +75,7 @@ def search_serpapi_shopping(api_key: str, query: str, limit: int = 10, gl: str =
             extra={}
         ))
     return out
+
+def search(query: str, limit: int = 10) -> List[Product]:
+    """Registry entry point: SerpApi search with the configured key."""
+    return search_serpapi_shopping(SERPAPI_API_KEY, query, limit=limit)
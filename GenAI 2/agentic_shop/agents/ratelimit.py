@@ -0,0 +1,127 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+from agentic_shop.config import RATE_LIMIT_PATH, RATE_LIMITS, RATE_LIMIT_MAX_WAIT
+
+class RateLimited(Exception):
+    """Request shed locally: the wait would exceed the allowed maximum or the daily quota is used up."""
+
+def credential_key(secret: str) -> str:
+    """Stable, non-reversible id for an API credential."""
+    return hashlib.sha256((secret or "").encode("utf-8")).hexdigest()[:12]
+
+class RateLimiter:
+    """
+    Token bucket per (provider, credential) plus a daily quota counter. State lives
+    in SQLite and every acquire runs in a BEGIN IMMEDIATE transaction, so threads and
+    worker processes sharing the file draw from the same buckets.
+
+    Callers reserve tokens up front and sleep off any deficit, which keeps bursts
+    under the configured rate instead of discovering the limit through 429s.
+    """
+    def __init__(self, path: Optional[str] = RATE_LIMIT_PATH,
+                 limits: Optional[Dict[str, Tuple[float, int, int]]] = None,
+                 max_wait: float = RATE_LIMIT_MAX_WAIT,
+                 clock=time.time, sleep=time.sleep):
+        self.path = path  # None keeps state in memory (single process)
+        self.limits = dict(RATE_LIMITS if limits is None else limits)
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._metrics: Dict[str, Dict[str, float]] = {}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            target = ":memory:"
+            if self.path is not None:
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+                target = self.path
+            conn = sqlite3.connect(target, timeout=30, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_buckets (
+                    key     TEXT PRIMARY KEY,
+                    tokens  REAL NOT NULL,
+                    updated REAL NOT NULL,
+                    day     TEXT NOT NULL,
+                    used    INTEGER NOT NULL
+                )
+            """)
+            self._conn = conn
+        return self._conn
+
+    def _count(self, key: str, field: str, value: float = 1):
+        m = self._metrics.setdefault(key, {"granted": 0, "waited": 0, "wait_seconds": 0.0, "shed": 0})
+        m[field] += value
+
+    def acquire(self, provider: str, credential: str = "", tokens: int = 1,
+                max_wait: Optional[float] = None) -> float:
+        """
+        Blocks until `tokens` are available and returns the seconds waited.
+        Raises RateLimited instead of waiting longer than `max_wait`, or when the
+        daily quota for this provider/credential is exhausted.
+        """
+        if provider not in self.limits:
+            return 0.0
+        rate, burst, daily = self.limits[provider]
+        max_wait = self.max_wait if max_wait is None else max_wait
+        key = f"{provider}:{credential_key(credential)}"
+        with self._lock:
+            conn = self._db()
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = self.clock()
+                today = datetime.fromtimestamp(now, timezone.utc).strftime("%Y-%m-%d")
+                row = conn.execute("SELECT tokens, updated, day, used FROM rate_buckets WHERE key = ?", (key,)).fetchone()
+                level, updated, day, used = row if row else (float(burst), now, today, 0)
+                if day != today:
+                    day, used = today, 0
+                level = min(float(burst), level + max(0.0, now - updated) * rate)
+                if daily and used + tokens > daily:
+                    raise RateLimited(f"{provider} daily quota of {daily} requests used up")
+                wait = max(0.0, (tokens - level) / rate) if rate > 0 else 0.0
+                if wait > max_wait:
+                    raise RateLimited(f"{provider} rate limit: next slot in {wait:.1f}s")
+                conn.execute(
+                    "INSERT OR REPLACE INTO rate_buckets (key, tokens, updated, day, used) VALUES (?, ?, ?, ?, ?)",
+                    (key, level - tokens, now, day, used + tokens)
+                )
+                conn.execute("COMMIT")
+            except BaseException as e:
+                conn.execute("ROLLBACK")
+                if isinstance(e, RateLimited):
+                    self._count(key, "shed")
+                raise
+            self._count(key, "granted")
+            if wait:
+                self._count(key, "waited")
+                self._count(key, "wait_seconds", wait)
+        if wait:
+            self.sleep(wait)
+        return wait
+
+    def metrics(self) -> Dict[str, Dict[str, float]]:
+        """Per-bucket counters for this process plus the shared quota usage and token level."""
+        with self._lock:
+            out = {k: dict(v) for k, v in self._metrics.items()}
+            for key, level, day, used in self._db().execute("SELECT key, tokens, day, used FROM rate_buckets"):
+                m = out.setdefault(key, {"granted": 0, "waited": 0, "wait_seconds": 0.0, "shed": 0})
+                m.update({"tokens": round(level, 3), "quota_day": day, "quota_used": used})
+            return out
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            _limiter = RateLimiter()
+        return _limiter
@@ -1,36 +1,83 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
 from agentic_shop.agents.utils import Product
 
+_NEUTRAL = {"pos": 0.5}
+
+def _round3(scores: np.ndarray) -> np.ndarray:
+    """
+    Elementwise round(x, 3) matching Python's correctly rounded round(): np.round
+    (scale, rint, unscale) can differ on values that sit on a rounding boundary,
+    so those few are redone with the builtin.
+    """
+    out = np.round(scores, 3)
+    frac = scores * 1000.0 - np.floor(scores * 1000.0)
+    for i in np.flatnonzero(np.abs(frac - 0.5) < 1e-6).tolist():
+        out[i] = round(float(scores[i]), 3)
+    return out
+
 class RecommendationEngineAgent:
+    def score(self,
+              products: List[Product],
+              sentiments: Dict[str, Dict],
+              budget: float | None = None) -> np.ndarray:
+        """
+        Scores every product in one vectorized pass (rounded to 3 decimals):
+        - Price fit (closer to budget is better; under budget rewarded)
+        - Sentiment positive ratio
+        - Product rating if provided
+        """
+        return self._score(products, np.array(self._positives(products, sentiments), dtype=np.float64), budget)
+
+    @staticmethod
+    def _positives(products: List[Product], sentiments: Dict[str, Dict]) -> List[float]:
+        """Positive-sentiment share per product; neutral 0.5 when a product was not analyzed."""
+        return [sentiments.get(p.id, _NEUTRAL).get("pos", 0.5) for p in products]
+
+    def _score(self, products: List[Product], pos: np.ndarray, budget: float | None) -> np.ndarray:
+        n = len(products)
+        price = np.fromiter((p.price for p in products), dtype=np.float64, count=n)
+        rating = np.fromiter((p.rating or 0.0 for p in products), dtype=np.float64, count=n)
+        # price fit
+        if budget is not None and budget > 0:
+            under = 1.0 - (budget - price) / max(budget, 1e-9) * 0.5  # gentle penalty when far below budget
+            over = np.maximum(0.0, 1.0 - (price - budget) / (budget * 2))  # penalize over-budget
+            price_score = np.where(price <= budget, under, over)
+        else:
+            price_score = np.full(n, 0.7)
+        rating_score = np.where(rating != 0.0, rating / 5.0, 0.5)
+        return _round3(0.5*price_score + 0.3*pos + 0.2*rating_score)
+
     def recommend(self,
                   products: List[Product],
                   price_summary: Dict[str, Dict],
                   sentiments: Dict[str, Dict],
-                  budget: float | None = None) -> List[Dict[str, Any]]:
+                  budget: float | None = None,
+                  top_k: Optional[int] = None) -> List[Dict[str, Any]]:
         """
-        Simple scoring:
-        - Price fit (closer to budget is better; under budget rewarded)
-        - Sentiment positive ratio
-        - Product rating if provided
+        Products ranked by score (ties keep input order). With `top_k`, only the
+        best k are selected (partial selection, no full sort) and returned.
         """
-        scored = []
-        for p in products:
-            s = sentiments.get(p.id, {"pos": 0.5})
-            pos = s.get("pos", 0.5)
-            # price fit
-            if budget is not None and budget > 0:
-                if p.price <= budget:
-                    price_score = 1.0 - (budget - p.price) / max(budget, 1e-9) * 0.5  # gentle penalty when far below budget
-                else:
-                    price_score = max(0.0, 1.0 - (p.price - budget) / (budget * 2))  # penalize over-budget
-            else:
-                price_score = 0.7
-            rating_score = (p.rating / 5.0) if p.rating else 0.5
-            score = 0.5*price_score + 0.3*pos + 0.2*rating_score
-            scored.append({
-                "product": p,
-                "score": round(score, 3),
-                "sentiment_pos": pos
-            })
-        scored.sort(key=lambda x: x["score"], reverse=True)
-        return scored
+        if not products:
+            return []
+        pos = self._positives(products, sentiments)
+        scores = self._score(products, np.array(pos, dtype=np.float64), budget)
+        n = len(scores)
+        # a NaN/inf price must not break selection: such listings rank last
+        rank = np.where(np.isfinite(scores), scores, -np.inf)
+        if top_k is not None and top_k < n:
+            k = max(0, top_k)
+            if k == 0:
+                return []
+            # k-th best score, then everything above it plus the earliest ties at it
+            cutoff = np.partition(rank, n - k)[n - k]
+            above = np.flatnonzero(rank > cutoff)
+            ties = np.flatnonzero(rank == cutoff)[:k - len(above)]
+            idx = np.concatenate([above, ties])
+        else:
+            idx = np.arange(n)
+        order = idx[np.lexsort((idx, -rank[idx]))]
+        return [{"product": products[i], "score": s, "sentiment_pos": pos[i]}
+                for i, s in zip(order.tolist(), scores[order].tolist())]
@@ -1,52 +1,65 @@
-import requests
-from typing import List, Dict
-from agentic_shop.config import HF_API_TOKEN
+from typing import List, Dict, Optional
 from agentic_shop.agents.utils import Product
+from agentic_shop.agents.sentiment import SentimentBackend, get_backend
+from agentic_shop.agents.sentiment_cache import SentimentCache
 
-HF_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
-HF_ENDPOINT = f"https://api-inference.huggingface.co/models/{HF_MODEL}"
+MAX_TEXTS_PER_PRODUCT = 8  # keep usage modest
 
 class ReviewAnalysisAgent:
-    def __init__(self, enabled: bool = True):
-        self.enabled = enabled and bool(HF_API_TOKEN)
+    def __init__(self, enabled: bool = True,
+                 backend: Optional[SentimentBackend] = None,
+                 cache: Optional[SentimentCache] = None,
+                 use_cache: bool = True):
+        self.backend = backend if backend is not None else get_backend()
+        self.enabled = enabled and self.backend.available
+        # only remote backends are worth a disk round-trip
+        if cache is None and use_cache and self.backend.remote:
+            cache = SentimentCache(model=self.backend.name)
+        self.cache = cache if use_cache else None
 
     def analyze(self, products: List[Product]) -> Dict[str, Dict]:
         """
         Returns sentiment per product (positive ratio, negative ratio).
-        If no HF token or no texts available, returns neutral defaults.
+        If sentiment is disabled or no texts are available, returns neutral defaults.
+        Texts from all products are scored together in one backend call.
         """
         results: Dict[str, Dict] = {}
+        owners: List[str] = []   # product id for each text in `texts`
+        texts: List[str] = []
         for p in products:
-            texts = [r.text for r in p.reviews if r.text] or []
+            ptexts = [r.text for r in p.reviews if r.text] or []
             # Fallback to title if absolutely nothing to analyze
-            if not texts and p.title:
-                texts = [p.title]
-            if not texts:
+            if not ptexts and p.title:
+                ptexts = [p.title]
+            if not ptexts or not self.enabled:
                 results[p.id] = {"pos": 0.5, "neg": 0.5, "details": []}
                 continue
-            if not self.enabled:
-                results[p.id] = {"pos": 0.5, "neg": 0.5, "details": []}
+            for t in ptexts[:MAX_TEXTS_PER_PRODUCT]:
+                owners.append(p.id)
+                texts.append(t)
+
+        scores = self._score_texts(texts)
+        acc: Dict[str, Dict] = {}
+        for pid, sc in zip(owners, scores):
+            a = acc.setdefault(pid, {"pos": 0.0, "neg": 0.0, "details": []})
+            if sc is None:
                 continue
-            pos = neg = 0
-            details = []
-            for t in texts[:8]:  # keep usage modest
-                try:
-                    resp = requests.post(
-                        HF_ENDPOINT,
-                        headers={"Authorization": f"Bearer {HF_API_TOKEN}"},
-                        json={"inputs": t},
-                        timeout=30
-                    )
-                    resp.raise_for_status()
-                    arr = resp.json()
-                    # Expected [[{label: "NEGATIVE", score: ...}, {label: "POSITIVE", score: ...}]]
-                    if isinstance(arr, list) and arr and isinstance(arr[0], list):
-                        scores = {d["label"]: d["score"] for d in arr[0]}
-                        pos += scores.get("POSITIVE", 0.0)
-                        neg += scores.get("NEGATIVE", 0.0)
-                        details.append(scores)
-                except Exception:
-                    pass
-            total = max(pos + neg, 1e-9)
-            results[p.id] = {"pos": round(pos/total, 3), "neg": round(neg/total, 3), "details": details}
+            a["pos"] += sc.get("POSITIVE", 0.0)
+            a["neg"] += sc.get("NEGATIVE", 0.0)
+            a["details"].append(sc)
+        for pid, a in acc.items():
+            total = max(a["pos"] + a["neg"], 1e-9)
+            results[pid] = {"pos": round(a["pos"]/total, 3), "neg": round(a["neg"]/total, 3), "details": a["details"]}
         return results
+
+    def _score_texts(self, texts: List[str]) -> List[Optional[Dict[str, float]]]:
+        """Scores each distinct text once, serving repeats from the cache; None marks a failed text."""
+        unique = list(dict.fromkeys(texts))
+        cached = self.cache.get_many(unique) if self.cache else [None] * len(unique)
+        misses = [t for t, sc in zip(unique, cached) if sc is None]
+        fresh = self.backend.score(misses) if misses else []
+        if self.cache:
+            self.cache.put_many(misses, fresh)
+        by_text = {t: sc for t, sc in zip(unique, cached) if sc is not None}
+        by_text.update(zip(misses, fresh))
+        return [by_text.get(t) for t in texts]
@@ -0,0 +1,121 @@
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from agentic_shop.agents.storage import PriceStore, get_store
+from agentic_shop.config import PRICE_RAW_RETENTION_DAYS, PRICE_HOURLY_RETENTION_DAYS
+
+HOUR = 3600
+DAY = 86400
+RESOLUTIONS = {"hour": HOUR, "day": DAY}
+
+# Widest span served from each resolution; anything longer falls back to daily buckets.
+RAW_MAX_SPAN = 2 * DAY
+HOURLY_MAX_SPAN = 90 * DAY
+
+# (bucket_start ISO, retailer, min, max, avg, last, samples)
+TrendPoint = Tuple[str, str, float, float, float, float, int]
+
+def _epoch(dt: Optional[datetime]) -> Optional[int]:
+    return int(dt.timestamp()) if dt is not None else None
+
+def rollup(store: Optional[PriceStore] = None, full: bool = False) -> Dict[str, int]:
+    """
+    Compacts raw sightings into hourly and daily buckets. Only buckets at or after
+    each resolution's watermark are recomputed; `full=True` rebuilds from every raw
+    row still present (e.g. after backfilling old observations).
+    Returns the number of buckets written per resolution.
+    """
+    conn = (store or get_store()).connection()
+    written: Dict[str, int] = {}
+    with conn:
+        newest = conn.execute("SELECT MAX(seen_at) FROM price_history").fetchone()[0]
+        for name, width in RESOLUTIONS.items():
+            row = conn.execute("SELECT watermark FROM rollup_state WHERE resolution = ?", (width,)).fetchone()
+            start = 0 if full or row is None else row[0]
+            cur = conn.execute("""
+                INSERT OR REPLACE INTO price_rollup
+                    (product_id, resolution, bucket_start, retailer_id,
+                     min_price, max_price, avg_price, last_price, samples, last_seen)
+                SELECT product_id, :w, bucket, retailer_id,
+                       MIN(price), MAX(price), AVG(price), MAX(CASE WHEN rn = 1 THEN price END), COUNT(*), MAX(seen_at)
+                FROM (
+                    SELECT product_id, retailer_id, price, seen_at, (seen_at / :w) * :w AS bucket,
+                           ROW_NUMBER() OVER (PARTITION BY product_id, retailer_id, seen_at / :w
+                                              ORDER BY seen_at DESC, id DESC) AS rn
+                    FROM price_history WHERE seen_at >= :start
+                )
+                GROUP BY product_id, retailer_id, bucket
+            """, {"w": width, "start": start})
+            written[name] = cur.rowcount
+            if newest is not None:
+                # the newest bucket may still receive sightings; everything before it is final
+                conn.execute("INSERT OR REPLACE INTO rollup_state (resolution, watermark) VALUES (?, ?)",
+                             (width, (newest // width) * width))
+    return written
+
+def apply_retention(store: Optional[PriceStore] = None,
+                    raw_days: int = PRICE_RAW_RETENTION_DAYS,
+                    hourly_days: int = PRICE_HOURLY_RETENTION_DAYS,
+                    now: Optional[datetime] = None) -> Dict[str, int]:
+    """
+    Rolls up pending sightings, then deletes raw rows older than `raw_days` and
+    hourly buckets older than `hourly_days`. Daily buckets are kept forever.
+    Raw rows are only dropped up to the daily watermark, so nothing is lost unrolled.
+    """
+    store = store or get_store()
+    rollup(store)
+    conn = store.connection()
+    ts = _epoch(now) or int(time.time())
+    with conn:
+        row = conn.execute("SELECT watermark FROM rollup_state WHERE resolution = ?", (DAY,)).fetchone()
+        raw_cutoff = min(((ts - raw_days * DAY) // DAY) * DAY, row[0] if row else 0)
+        raw = conn.execute("DELETE FROM price_history WHERE seen_at < ?", (raw_cutoff,)).rowcount
+        hourly = conn.execute(
+            "DELETE FROM price_rollup WHERE resolution = ? AND bucket_start < ?",
+            (HOUR, ts - hourly_days * DAY)
+        ).rowcount
+    return {"raw": raw, "hour": hourly}
+
+def pick_resolution(since: int, until: int, now: int,
+                    raw_days: int = PRICE_RAW_RETENTION_DAYS,
+                    hourly_days: int = PRICE_HOURLY_RETENTION_DAYS) -> str:
+    """Coarsest-enough resolution for the span that still has data at `since`."""
+    span = until - since
+    if span <= RAW_MAX_SPAN and since >= now - raw_days * DAY:
+        return "raw"
+    if span <= HOURLY_MAX_SPAN and since >= now - hourly_days * DAY:
+        return "hour"
+    return "day"
+
+def get_price_trend(product_id: str, since: datetime, until: Optional[datetime] = None,
+                    resolution: Optional[str] = None,
+                    store: Optional[PriceStore] = None) -> Dict[str, object]:
+    """
+    Price trend for one product, oldest first. The resolution (raw/hour/day) is
+    picked from the requested span unless given explicitly.
+    Returns {"resolution": ..., "points": [TrendPoint, ...]}.
+    """
+    now = int(time.time())
+    lo, hi = _epoch(since), _epoch(until) or now
+    res = resolution or pick_resolution(lo, hi, now)
+    conn = (store or get_store()).connection()
+    if res == "raw":
+        rows = conn.execute("""
+            SELECT strftime('%Y-%m-%dT%H:%M:%S', h.seen_at, 'unixepoch'), r.name,
+                   h.price, h.price, h.price, h.price, 1
+            FROM price_history h JOIN retailers r ON r.id = h.retailer_id
+            WHERE h.product_id = ? AND h.seen_at BETWEEN ? AND ?
+            ORDER BY h.seen_at, h.id
+        """, (product_id, lo, hi)).fetchall()
+    else:
+        width = RESOLUTIONS[res]
+        rows = conn.execute("""
+            SELECT strftime('%Y-%m-%dT%H:%M:%S', b.bucket_start, 'unixepoch'), r.name,
+                   b.min_price, b.max_price, round(b.avg_price, 2), b.last_price, b.samples
+            FROM price_rollup b JOIN retailers r ON r.id = b.retailer_id
+            WHERE b.product_id = ? AND b.resolution = ? AND b.bucket_start BETWEEN ? AND ?
+            ORDER BY b.bucket_start, r.name
+        """, (product_id, width, (lo // width) * width, hi)).fetchall()
+    points: List[TrendPoint] = [tuple(r) for r in rows]
+    return {"resolution": res, "points": points}
@@ -0,0 +1,161 @@
+import re
+from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Optional
+
+import numpy as np
+
+from agentic_shop.config import (HF_API_TOKEN, HF_BATCH_SIZE, HF_MAX_CONCURRENCY, SENTIMENT_BACKEND,
+                                 ADAPTIVE_TIMEOUTS)
+from agentic_shop.agents.circuit import get_breaker
+from agentic_shop.agents.latency import get_latency_tracker
+from agentic_shop.agents.transport import get_session
+
+HF_MODEL = "distilbert-base-uncased-finetuned-sst-2-english"
+HF_HOST = "api-inference.huggingface.co"
+HF_ENDPOINT = f"https://{HF_HOST}/models/{HF_MODEL}"
+
+Scores = Dict[str, float]
+
+class SentimentBackend(ABC):
+    """Scores a batch of texts as {"POSITIVE": p, "NEGATIVE": n}; None marks a text that could not be scored."""
+    name: str = "base"
+    remote: bool = False  # remote backends are worth caching
+
+    @property
+    def available(self) -> bool:
+        return True
+
+    @abstractmethod
+    def score(self, texts: List[str]) -> List[Optional[Scores]]:
+        ...
+
+class HFInferenceBackend(SentimentBackend):
+    """Hugging Face Inference API, batched and run concurrently."""
+    name = HF_MODEL
+    remote = True
+
+    def __init__(self, token: str = HF_API_TOKEN,
+                 batch_size: int = HF_BATCH_SIZE,
+                 max_concurrency: int = HF_MAX_CONCURRENCY):
+        self.token = token
+        self.batch_size = max(1, batch_size)
+        self.max_concurrency = max(1, max_concurrency)
+
+    @property
+    def available(self) -> bool:
+        return bool(self.token)
+
+    def score(self, texts: List[str]) -> List[Optional[Scores]]:
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        if not batches:
+            return []
+        if len(batches) == 1:
+            return self._score_batch(batches[0])
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(batches))) as pool:
+            out: List[Optional[Scores]] = []
+            for scored in pool.map(self._score_batch, batches):
+                out.extend(scored)
+            return out
+
+    def _score_batch(self, batch: List[str]) -> List[Optional[Scores]]:
+        tracker = get_latency_tracker()
+        # adaptive timeout only: inference calls are metered, so they are never hedged
+        timeout = tracker.timeout_for("hf.inference", 30) if ADAPTIVE_TIMEOUTS else 30
+        try:
+            with get_breaker(HF_HOST).guard(), tracker.observe("hf.inference", timeout):
+                resp = get_session("hf").post(
+                    HF_ENDPOINT,
+                    headers={"Authorization": f"Bearer {self.token}"},
+                    json={"inputs": batch},
+                    timeout=timeout
+                )
+                resp.raise_for_status()
+            arr = resp.json()
+        except Exception:
+            return [None] * len(batch)
+        # Expected one entry per input: [[{label: "NEGATIVE", score: ...}, {label: "POSITIVE", score: ...}], ...]
+        if not isinstance(arr, list) or len(arr) != len(batch):
+            return [None] * len(batch)
+        out: List[Optional[Scores]] = []
+        for item in arr:
+            if isinstance(item, list) and item and isinstance(item[0], dict):
+                out.append({d["label"]: d["score"] for d in item})
+            else:
+                out.append(None)
+        return out
+
+# Small product-review lexicon: word -> polarity weight
+_LEXICON: Dict[str, float] = {
+    # positive
+    "good": 1.0, "great": 2.0, "excellent": 2.5, "amazing": 2.5, "awesome": 2.0, "love": 2.0, "loved": 2.0,
+    "perfect": 2.5, "best": 2.0, "nice": 1.0, "fast": 1.0, "solid": 1.0, "reliable": 1.5, "comfortable": 1.5,
+    "recommend": 1.5, "recommended": 1.5, "happy": 1.5, "satisfied": 1.5, "quality": 0.5, "durable": 1.5,
+    "works": 1.0, "worth": 1.0, "easy": 1.0, "premium": 1.0, "sturdy": 1.0, "crisp": 1.0, "clear": 0.5,
+    "new": 0.5, "genuine": 1.0, "sealed": 0.5, "bargain": 1.5, "fantastic": 2.5, "smooth": 1.0,
+    # negative
+    "bad": -1.5, "poor": -1.5, "terrible": -2.5, "awful": -2.5, "worst": -2.5, "broken": -2.0, "broke": -2.0,
+    "defective": -2.5, "cheap": -0.5, "flimsy": -1.5, "slow": -1.0, "return": -1.0, "returned": -1.5,
+    "refund": -1.5, "disappointed": -2.0, "disappointing": -2.0, "waste": -2.0, "useless": -2.5, "fake": -2.5,
+    "damaged": -2.0, "cracked": -2.0, "faulty": -2.0, "noisy": -1.0, "overpriced": -1.5, "problem": -1.0,
+    "problems": -1.0, "issue": -1.0, "issues": -1.0, "stopped": -1.5, "junk": -2.5, "used": -0.5,
+    "refurbished": -0.25, "parts": -1.0, "scratched": -1.0, "scratches": -1.0, "missing": -1.5,
+}
+_NEGATORS = frozenset({"not", "no", "never", "don't", "doesn't", "didn't", "isn't", "wasn't", "won't", "cannot", "can't"})
+_TOKEN_RE = re.compile(r"[a-z']+")
+_NEGATION_SPAN = 3  # tokens after a negator whose polarity is flipped
+
+class LexiconBackend(SentimentBackend):
+    """
+    CPU-only, offline scorer. Texts are tokenized once, then polarity sums for the
+    whole batch are computed with NumPy and squashed into probabilities.
+    """
+    name = "lexicon-v1"
+
+    def __init__(self, lexicon: Optional[Dict[str, float]] = None, temperature: float = 1.5):
+        lex = lexicon if lexicon is not None else _LEXICON
+        self.vocab = {w: i for i, w in enumerate(lex)}
+        self.weights = np.array(list(lex.values()), dtype=np.float64)
+        self.temperature = temperature
+
+    def score(self, texts: List[str]) -> List[Optional[Scores]]:
+        if not texts:
+            return []
+        doc_ids: List[int] = []
+        tok_ids: List[int] = []
+        flips: List[bool] = []
+        vocab = self.vocab
+        for d, text in enumerate(texts):
+            negate_until = -1
+            for j, tok in enumerate(_TOKEN_RE.findall(text.lower())):
+                if tok in _NEGATORS:
+                    negate_until = j + _NEGATION_SPAN
+                    continue
+                idx = vocab.get(tok)
+                if idx is not None:
+                    doc_ids.append(d)
+                    tok_ids.append(idx)
+                    flips.append(j <= negate_until)
+
+        n = len(texts)
+        docs = np.asarray(doc_ids, dtype=np.int64)
+        contrib = self.weights[np.asarray(tok_ids, dtype=np.int64)]
+        contrib = np.where(np.asarray(flips, dtype=bool), -0.75 * contrib, contrib)
+        sums = np.bincount(docs, weights=contrib, minlength=n)
+        counts = np.bincount(docs, minlength=n)
+        # dampen long texts so they don't saturate on sheer word count
+        z = sums / (np.sqrt(np.maximum(counts, 1)) * self.temperature)
+        pos = np.round(1.0 / (1.0 + np.exp(-z)), 4)
+        return [{"POSITIVE": float(p), "NEGATIVE": float(1.0 - p)} for p in pos]
+
+def get_backend(name: str = SENTIMENT_BACKEND) -> SentimentBackend:
+    """Resolves 'hf', 'local' or 'auto' (HF when a token is configured, else local)."""
+    name = (name or "auto").lower()
+    if name in ("hf", "huggingface"):
+        return HFInferenceBackend()
+    if name in ("local", "lexicon"):
+        return LexiconBackend()
+    if name == "auto":
+        hf = HFInferenceBackend()
+        return hf if hf.available else LexiconBackend()
+    raise ValueError(f"Unknown sentiment backend: {name!r}")
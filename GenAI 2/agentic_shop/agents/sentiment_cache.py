@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from agentic_shop.config import (SENTIMENT_CACHE_PATH, SENTIMENT_CACHE_TTL,
+                                 SENTIMENT_CACHE_MAX_ROWS, SENTIMENT_CACHE_MEMORY)
+
+Scores = Dict[str, float]
+
+_RECOUNT_EVERY = 256  # writes between full COUNT(*)s (other processes may share the file)
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+class SentimentCache:
+    """
+    Content-addressed cache of sentiment scores keyed by (model, sha256(text)).
+    An in-memory LRU sits in front of a SQLite table; entries expire after `ttl`
+    seconds and the oldest rows are evicted once the table exceeds `max_rows`.
+    """
+    def __init__(self, path: str = SENTIMENT_CACHE_PATH, model: str = "",
+                 ttl: int = SENTIMENT_CACHE_TTL, max_rows: int = SENTIMENT_CACHE_MAX_ROWS,
+                 memory_size: int = SENTIMENT_CACHE_MEMORY):
+        self.path = path
+        self.model = model
+        self.ttl = ttl
+        self.max_rows = max_rows
+        self.memory_size = memory_size
+        self._memory: "OrderedDict[str, Tuple[float, Scores]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._rows: Optional[int] = None  # running row count, resynced every _RECOUNT_EVERY writes
+        self._writes = 0
+        self.stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "evictions": 0}
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS sentiment_cache (
+                    model      TEXT NOT NULL,
+                    text_hash  TEXT NOT NULL,
+                    scores     TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    PRIMARY KEY (model, text_hash)
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sentiment_cache_created ON sentiment_cache(created_at)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _remember(self, key: str, created_at: float, scores: Scores):
+        self._memory[key] = (created_at, scores)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts: List[str]) -> List[Optional[Scores]]:
+        """Returns cached scores for each text (None on miss or expiry)."""
+        now = time.time()
+        keys = [text_key(t) for t in texts]
+        out: List[Optional[Scores]] = [None] * len(texts)
+        with self._lock:
+            pending: Dict[str, List[int]] = {}
+            for i, k in enumerate(keys):
+                hit = self._memory.get(k)
+                if hit and now - hit[0] < self.ttl:
+                    self._memory.move_to_end(k)
+                    out[i] = hit[1]
+                    self.stats["memory_hits"] += 1
+                else:
+                    pending.setdefault(k, []).append(i)
+            if pending:
+                rows = self._db().execute(
+                    "SELECT text_hash, scores, created_at FROM sentiment_cache "
+                    "WHERE model = ? AND created_at > ? AND text_hash IN (SELECT value FROM json_each(?))",
+                    (self.model, now - self.ttl, json.dumps(list(pending)))
+                ).fetchall()
+                for k, raw, created_at in rows:
+                    scores = json.loads(raw)
+                    self._remember(k, created_at, scores)
+                    for i in pending[k]:
+                        out[i] = scores
+                        self.stats["disk_hits"] += 1
+            found = sum(1 for s in out if s is not None)
+            self.stats["hits"] += found
+            self.stats["misses"] += len(texts) - found
+        return out
+
+    def put_many(self, texts: List[str], scores: List[Optional[Scores]]):
+        """Stores scores for texts; None entries (failed inferences) are skipped."""
+        now = time.time()
+        fresh = [(text_key(t), s) for t, s in zip(texts, scores) if s is not None]
+        if not fresh:
+            return
+        rows = [(self.model, k, json.dumps(s), now) for k, s in dict(fresh).items()]
+        with self._lock:
+            for k, s in fresh:
+                self._remember(k, now, s)
+            conn = self._db()
+            with conn:
+                if self._rows is None or self._writes % _RECOUNT_EVERY == 0:
+                    self._rows = conn.execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0]
+                self._writes += 1
+                # replaced keys don't grow the table; the lookup is a primary-key probe per key
+                existing = conn.execute(
+                    "SELECT COUNT(*) FROM sentiment_cache WHERE model = ? "
+                    "AND text_hash IN (SELECT value FROM json_each(?))",
+                    (self.model, json.dumps([r[1] for r in rows]))
+                ).fetchone()[0]
+                conn.executemany("INSERT OR REPLACE INTO sentiment_cache VALUES (?, ?, ?, ?)", rows)
+                self._rows += len(rows) - existing
+                self._evict(conn, now)
+
+    def _evict(self, conn: sqlite3.Connection, now: float):
+        expired = conn.execute("DELETE FROM sentiment_cache WHERE created_at <= ?", (now - self.ttl,)).rowcount
+        self._rows -= expired
+        excess = self._rows - self.max_rows
+        if excess > 0:
+            excess = conn.execute(
+                "DELETE FROM sentiment_cache WHERE rowid IN "
+                "(SELECT rowid FROM sentiment_cache ORDER BY created_at LIMIT ?)", (excess,)
+            ).rowcount
+            self._rows -= excess
+        self.stats["evictions"] += expired + max(excess, 0)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._rows = None
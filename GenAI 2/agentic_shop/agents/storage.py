@@ -1,40 +1,262 @@
+import json
 import sqlite3
 import os
-from datetime import datetime
-from typing import List, Tuple
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from agentic_shop.config import DB_PATH
 
-def _ensure_db():
-    os.makedirs(os.path.dirname(os.path.abspath(DB_PATH)), exist_ok=True)
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        c.execute("""
-            CREATE TABLE IF NOT EXISTS price_history (
-                product_id TEXT,
-                retailer   TEXT,
-                price      REAL,
-                seen_at    TEXT
-            )
-        """)
-        conn.commit()
+Observation = Tuple[str, str, float]  # (product_id, retailer, price)
 
-def track_price(product_id: str, retailer: str, price: float):
-    _ensure_db()
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        c.execute(
-            "INSERT INTO price_history (product_id, retailer, price, seen_at) VALUES (?, ?, ?, ?)",
-            (product_id, retailer, price, datetime.utcnow().isoformat())
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",     # readers never block the writer
+    "PRAGMA synchronous=NORMAL",   # fsync at checkpoints, not on every commit
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-16000",    # ~16 MB page cache
+)
+
+_HISTORY_COLUMNS = "r.name, h.price, strftime('%Y-%m-%dT%H:%M:%S', h.seen_at, 'unixepoch')"
+
+# --- schema migrations -------------------------------------------------------
+# Each migration upgrades the schema by one version (tracked in PRAGMA user_version).
+
+def _m1_legacy_table(conn: sqlite3.Connection):
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS price_history (
+            product_id TEXT,
+            retailer   TEXT,
+            price      REAL,
+            seen_at    TEXT
         )
-        conn.commit()
+    """)
 
-def get_price_history(product_id: str) -> List[Tuple[str, float, str]]:
-    _ensure_db()
-    with sqlite3.connect(DB_PATH) as conn:
-        c = conn.cursor()
-        rows = c.execute(
-            "SELECT retailer, price, seen_at FROM price_history WHERE product_id = ? ORDER BY seen_at DESC",
+def _m2_indexed_epoch_schema(conn: sqlite3.Connection):
+    """Integer primary key, epoch-second timestamps, interned retailers, (product_id, seen_at) index."""
+    conn.execute("""
+        CREATE TABLE retailers (
+            id   INTEGER PRIMARY KEY,
+            name TEXT NOT NULL UNIQUE
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE price_history_v2 (
+            id          INTEGER PRIMARY KEY,
+            product_id  TEXT    NOT NULL,
+            retailer_id INTEGER NOT NULL REFERENCES retailers(id),
+            price       REAL    NOT NULL,
+            seen_at     INTEGER NOT NULL
+        )
+    """)
+    conn.execute("INSERT INTO retailers (name) SELECT DISTINCT COALESCE(retailer, '') FROM price_history")
+    conn.execute("""
+        INSERT INTO price_history_v2 (product_id, retailer_id, price, seen_at)
+        SELECT h.product_id, r.id, h.price, COALESCE(CAST(strftime('%s', h.seen_at) AS INTEGER), 0)
+        FROM price_history h JOIN retailers r ON r.name = COALESCE(h.retailer, '')
+        WHERE h.product_id IS NOT NULL AND h.price IS NOT NULL
+        ORDER BY h.rowid
+    """)
+    conn.execute("DROP TABLE price_history")
+    conn.execute("ALTER TABLE price_history_v2 RENAME TO price_history")
+    conn.execute("CREATE INDEX idx_price_history_product_seen ON price_history(product_id, seen_at)")
+
+def _m3_rollups(conn: sqlite3.Connection):
+    """Hourly/daily min/max/avg/last buckets (see agents/rollup.py)."""
+    conn.execute("""
+        CREATE TABLE price_rollup (
+            product_id   TEXT    NOT NULL,
+            resolution   INTEGER NOT NULL,  -- bucket width in seconds
+            bucket_start INTEGER NOT NULL,
+            retailer_id  INTEGER NOT NULL REFERENCES retailers(id),
+            min_price    REAL    NOT NULL,
+            max_price    REAL    NOT NULL,
+            avg_price    REAL    NOT NULL,
+            last_price   REAL    NOT NULL,
+            samples      INTEGER NOT NULL,
+            last_seen    INTEGER NOT NULL,
+            PRIMARY KEY (product_id, resolution, bucket_start, retailer_id)
+        ) WITHOUT ROWID
+    """)
+    conn.execute("""
+        CREATE TABLE rollup_state (
+            resolution INTEGER PRIMARY KEY,
+            watermark  INTEGER NOT NULL  -- first bucket that may still change
+        )
+    """)
+    conn.execute("CREATE INDEX idx_price_history_seen ON price_history(seen_at)")
+
+_MIGRATIONS = [_m1_legacy_table, _m2_indexed_epoch_schema, _m3_rollups]
+SCHEMA_VERSION = len(_MIGRATIONS)
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """
+    Brings the database up to SCHEMA_VERSION in place. Each step runs in its own
+    IMMEDIATE transaction, so concurrent processes never migrate twice.
+    Expects a connection opened with isolation_level=None. Returns the final version.
+    """
+    while True:
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= SCHEMA_VERSION:
+                conn.execute("COMMIT")
+                return version
+            _MIGRATIONS[version](conn)
+            conn.execute(f"PRAGMA user_version = {version + 1}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+class PriceStore:
+    """
+    Owns the price history database: one long-lived connection per thread,
+    schema setup once per process, WAL mode and batched writes.
+    """
+    def __init__(self, path: str = DB_PATH):
+        self.path = path
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._conns: List[sqlite3.Connection] = []
+        self._ready = False
+        self._retailers: Dict[str, int] = {}
+
+    def connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            return conn
+        if not self._ready:
+            self._setup()
+        # each connection is used only by its own thread; close() may run on another one
+        conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        self._local.conn = conn
+        with self._lock:
+            self._conns.append(conn)
+        return conn
+
+    def _setup(self):
+        with self._lock:
+            if self._ready:
+                return
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            try:
+                migrate(conn)
+            finally:
+                conn.close()
+            self._ready = True
+
+    def _retailer_ids(self, conn: sqlite3.Connection, names: Iterable[str]) -> Tuple[Dict[str, int], Dict[str, int]]:
+        """
+        Interns retailer names into the `retailers` lookup table. Returns (all ids, new ids);
+        the caller caches the new ids only once its transaction has committed.
+        """
+        missing = [n for n in set(names) if n not in self._retailers]
+        fresh: Dict[str, int] = {}
+        if missing:
+            conn.executemany("INSERT OR IGNORE INTO retailers (name) VALUES (?)", [(n,) for n in missing])
+            for rid, name in conn.execute(
+                "SELECT id, name FROM retailers WHERE name IN (SELECT value FROM json_each(?))",
+                (json.dumps(missing),)
+            ):
+                fresh[name] = rid
+        return {**self._retailers, **fresh}, fresh
+
+    def track_price(self, product_id: str, retailer: str, price: float):
+        self.track_prices_bulk([(product_id, retailer, price)])
+
+    def track_prices_bulk(self, observations: Iterable[Observation], seen_at: Optional[datetime] = None) -> int:
+        """Inserts all observations in a single transaction; returns the number written."""
+        ts = int((seen_at or datetime.now(timezone.utc)).timestamp())
+        obs = list(observations)
+        if not obs:
+            return 0
+        conn = self.connection()
+        with conn:
+            ids, fresh = self._retailer_ids(conn, (retailer for _, retailer, _ in obs))
+            conn.executemany(
+                "INSERT INTO price_history (product_id, retailer_id, price, seen_at) VALUES (?, ?, ?, ?)",
+                [(pid, ids[retailer], price, ts) for pid, retailer, price in obs]
+            )
+        # a rolled-back transaction never reaches here, so no id of an undone row is cached
+        with self._lock:
+            self._retailers.update(fresh)
+        return len(obs)
+
+    def get_price_history(self, product_id: str) -> List[Tuple[str, float, str]]:
+        """Newest first, as (retailer, price, ISO-8601 UTC timestamp)."""
+        return self.connection().execute(
+            f"SELECT {_HISTORY_COLUMNS} FROM price_history h JOIN retailers r ON r.id = h.retailer_id "
+            "WHERE h.product_id = ? ORDER BY h.seen_at DESC, h.id DESC",
             (product_id,)
         ).fetchall()
-        return rows
+
+    def get_price_histories(self, product_ids: Iterable[str],
+                            limit: Optional[int] = None,
+                            since: Optional[datetime] = None) -> Dict[str, List[Tuple[str, float, str]]]:
+        """
+        Histories for many products in one query, newest first per product.
+        `limit` keeps the last K points per product; `since` drops older points.
+        """
+        ids = list(dict.fromkeys(product_ids))
+        out: Dict[str, List[Tuple[str, float, str]]] = {pid: [] for pid in ids}
+        if not ids:
+            return out
+        rows = self.connection().execute(
+            f"""
+            SELECT product_id, {_HISTORY_COLUMNS} FROM (
+                SELECT h.*, ROW_NUMBER() OVER (PARTITION BY h.product_id ORDER BY h.seen_at DESC, h.id DESC) AS rn
+                FROM price_history h
+                WHERE h.product_id IN (SELECT value FROM json_each(?)) AND h.seen_at >= ?
+            ) h JOIN retailers r ON r.id = h.retailer_id
+            WHERE ? IS NULL OR h.rn <= ?
+            ORDER BY h.product_id, h.rn
+            """,
+            (json.dumps(ids), int(since.timestamp()) if since else 0, limit, limit)
+        )
+        for pid, retailer, price, seen_at in rows:
+            out[pid].append((retailer, price, seen_at))
+        return out
+
+    def close(self):
+        with self._lock:
+            for conn in self._conns:
+                conn.close()
+            self._conns.clear()
+        self._local = threading.local()
+
+_stores: Dict[str, PriceStore] = {}
+_stores_lock = threading.Lock()
+
+def get_store(path: Optional[str] = None) -> PriceStore:
+    """Shared store for `path` (default: $DB_PATH, else config.DB_PATH)."""
+    path = os.path.abspath(path or os.getenv("DB_PATH") or DB_PATH)
+    with _stores_lock:
+        store = _stores.get(path)
+        if store is None:
+            store = _stores[path] = PriceStore(path)
+        return store
+
+def close_stores():
+    """Closes every shared store's connections (process shutdown)."""
+    with _stores_lock:
+        stores = list(_stores.values())
+        _stores.clear()
+    for store in stores:
+        store.close()
+
+def track_price(product_id: str, retailer: str, price: float):
+    get_store().track_price(product_id, retailer, price)
+
+def track_prices_bulk(observations: Iterable[Observation], seen_at: Optional[datetime] = None) -> int:
+    return get_store().track_prices_bulk(observations, seen_at=seen_at)
+
+def get_price_history(product_id: str) -> List[Tuple[str, float, str]]:
+    return get_store().get_price_history(product_id)
+
+def get_price_histories(product_ids: Iterable[str],
+                        limit: Optional[int] = None,
+                        since: Optional[datetime] = None) -> Dict[str, List[Tuple[str, float, str]]]:
+    return get_store().get_price_histories(product_ids, limit=limit, since=since)
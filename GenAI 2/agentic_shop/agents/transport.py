@@ -0,0 +1,101 @@
+import threading
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from agentic_shop.agents.circuit import get_breaker, is_upstream_failure
+from agentic_shop.agents.latency import LatencyTracker, get_latency_tracker, hedged_call
+from agentic_shop.agents.ratelimit import get_rate_limiter, RateLimited
+from agentic_shop.config import (HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE, HTTP_POOL_BLOCK,
+                                 ADAPTIVE_TIMEOUTS, HEDGE_ENDPOINTS)
+
+# One pooled, keep-alive session per logical client (e.g. "ebay", "serpapi", "hf").
+_sessions: Dict[str, requests.Session] = {}
+_lock = threading.Lock()
+
+def _build_session(pool_connections: int, pool_maxsize: int, pool_block: bool) -> requests.Session:
+    s = requests.Session()
+    # retries are handled by callers (tenacity), so the adapter never retries on its own
+    adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize,
+                          pool_block=pool_block, max_retries=0)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
+    s.headers.update({"User-Agent": "agentic-assistant/1.0"})
+    return s
+
+def get_session(name: str = "default",
+                pool_connections: int = HTTP_POOL_CONNECTIONS,
+                pool_maxsize: int = HTTP_POOL_MAXSIZE,
+                pool_block: bool = HTTP_POOL_BLOCK) -> requests.Session:
+    """
+    Returns the shared session for `name`, creating it on first use.
+    Pool sizes only apply when the session is created.
+    """
+    s = _sessions.get(name)
+    if s is not None:
+        return s
+    with _lock:
+        s = _sessions.get(name)
+        if s is None:
+            s = _sessions[name] = _build_session(pool_connections, pool_maxsize, pool_block)
+        return s
+
+def close_sessions():
+    """Closes every pooled session (e.g. at process shutdown or in tests)."""
+    with _lock:
+        for s in _sessions.values():
+            s.close()
+        _sessions.clear()
+
+def _hedge_permit(rate_limit: Optional[Tuple[str, str]]):
+    if rate_limit is None:
+        return None
+
+    def permit() -> bool:
+        try:
+            get_rate_limiter().acquire(*rate_limit, max_wait=0)
+            return True
+        except RateLimited:
+            return False
+    return permit
+
+def request(name: str, method: str, url: str, endpoint: Optional[str] = None, timeout: float = 30.0,
+            hedge: Optional[bool] = None, tracker: Optional[LatencyTracker] = None,
+            rate_limit: Optional[Tuple[str, str]] = None, **kwargs) -> requests.Response:
+    """
+    Sends one request on the pooled session for `name` with latency-aware execution.
+    `timeout` is the fixed ceiling; once `endpoint` has enough samples the call uses
+    the adaptive timeout instead. Endpoints in HEDGE_ENDPOINTS (or hedge=True) send a
+    duplicate after their p95 delay and return whichever response arrives first.
+    The caller pays the rate limiter for the first request; with `rate_limit`
+    (provider, credential) a hedge takes its own token without waiting and is
+    skipped when none is available.
+
+    Every call goes through the circuit breaker of the URL's host: while it is open
+    this raises CircuitOpen immediately instead of waiting out the timeout.
+    """
+    tracker = tracker or get_latency_tracker()
+    key = endpoint or name
+    budget = tracker.timeout_for(key, timeout) if ADAPTIVE_TIMEOUTS else timeout
+    session = get_session(name)
+
+    def attempt() -> requests.Response:
+        with tracker.observe(key, budget):
+            return session.request(method, url, timeout=budget, **kwargs)
+
+    delay = tracker.hedge_delay(key) if (key in HEDGE_ENDPOINTS if hedge is None else hedge) else None
+    breaker = get_breaker(urlsplit(url).hostname or name)
+    admission = breaker.allow()
+    try:
+        if delay is None or delay >= budget:
+            resp = attempt()
+        else:
+            resp = hedged_call(attempt, delay, tracker=tracker, endpoint=key,
+                               permit=_hedge_permit(rate_limit))
+    except BaseException as e:
+        breaker.record(admission, not is_upstream_failure(e))
+        raise
+    breaker.record(admission, resp.status_code < 500)
+    return resp
@@ -0,0 +1,174 @@
+"""
+Batch mode: many shopping queries in one process.
+
+Queries come from JSONL ({"id", "query", "budget", "max_results"}) or CSV with the
+same columns; only "query" is required. They run with bounded concurrency over
+one Orchestrator, so HTTP sessions, the eBay token, caches and the price DB are
+set up once. Each finished query is appended to the output JSONL immediately;
+rerunning with the same output file skips queries already answered and retries
+the ones that failed.
+"""
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Set
+
+from agentic_shop.pipeline import run_pipeline
+from agentic_shop.serialization import result_to_dict
+from agentic_shop.config import BATCH_CONCURRENCY
+
+def _budget(value: Any) -> Optional[float]:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    return float(value)
+
+def read_queries(path: str, max_results: int = 10) -> List[Dict[str, Any]]:
+    """
+    Loads batch input; ids default to the 1-based record number. Malformed records
+    (bad JSON, no query, non-numeric budget/max_results) and duplicate ids are
+    skipped with a warning naming the record; for duplicates the first one wins.
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        if path.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [line for line in f if line.strip()]
+    out = []
+    seen: Set[str] = set()
+    for n, row in enumerate(rows, 1):
+        if isinstance(row, str):
+            try:
+                row = json.loads(row)
+            except ValueError as e:
+                print(f"[batch] record {n}: invalid JSON ({e}), skipped", file=sys.stderr)
+                continue
+            if not isinstance(row, dict):
+                print(f"[batch] record {n}: not a JSON object, skipped", file=sys.stderr)
+                continue
+        query = (row.get("query") or "").strip()
+        if not query:
+            print(f"[batch] record {n}: missing query, skipped", file=sys.stderr)
+            continue
+        raw_id = row.get("id")
+        job_id = str(n if raw_id is None or raw_id == "" else raw_id)
+        if job_id in seen:
+            print(f"[batch] record {n}: duplicate id {job_id!r}, skipped", file=sys.stderr)
+            continue
+        try:
+            budget = _budget(row.get("budget"))
+            limit = int(row.get("max_results") or max_results)
+        except (TypeError, ValueError) as e:
+            print(f"[batch] record {n}: bad budget/max_results ({e}), skipped", file=sys.stderr)
+            continue
+        seen.add(job_id)
+        out.append({"id": job_id, "query": query, "budget": budget, "max_results": limit})
+    return out
+
+def completed_ids(path: str) -> Set[str]:
+    """Ids with a finished (ok or empty) record in an existing output file."""
+    done: Set[str] = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue  # torn last line from a crash
+            if rec.get("status") in ("ok", "empty"):
+                done.add(str(rec.get("id")))
+    return done
+
+def _drop_torn_tail(path: str):
+    """Cuts a partial last line (crash mid-write) so appended records start on their own line."""
+    if not os.path.exists(path):
+        return
+    with open(path, "rb+") as f:
+        size = f.seek(0, os.SEEK_END)
+        pos = size
+        while pos > 0:
+            step = min(4096, pos)
+            f.seek(pos - step)
+            chunk = f.read(step)
+            nl = chunk.rfind(b"\n")
+            if nl != -1:
+                pos = pos - step + nl + 1
+                break
+            pos -= step
+        if pos < size:
+            f.truncate(pos)
+
+class BatchRunner:
+    def __init__(self, orchestrator, concurrency: int = BATCH_CONCURRENCY, top: Optional[int] = 10,
+                 progress_every: float = 5.0):
+        self.orch = orchestrator
+        self.concurrency = max(1, concurrency)
+        self.top = top
+        self.progress_every = progress_every
+        self.stats = {"total": 0, "skipped": 0, "ok": 0, "empty": 0, "failed": 0}
+
+    async def _one(self, job: Dict[str, Any]) -> Dict[str, Any]:
+        o = self.orch
+        start = time.perf_counter()
+        try:
+            result = await run_pipeline(o.search_agent, o.enrich_agent, o.price_agent, o.review_agent,
+                                        o.reco_agent, job["query"], job["budget"], job["max_results"],
+                                        top_k=self.top)
+            rec = result_to_dict(result)
+            rec["status"] = "ok" if result["products"] else "empty"
+        except Exception as e:
+            rec = {"query": job["query"], "budget": job["budget"], "status": "failed", "error": repr(e)}
+        rec["id"] = job["id"]
+        rec["elapsed"] = round(time.perf_counter() - start, 3)
+        return rec
+
+    def _progress(self, started: float, final: bool = False):
+        s = self.stats
+        done = s["ok"] + s["empty"] + s["failed"]
+        todo = s["total"] - s["skipped"]
+        rate = done / max(time.perf_counter() - started, 1e-9)
+        eta = (todo - done) / rate if rate else float("inf")
+        print(f"[batch] {done}/{todo} done ({s['failed']} failed, {s['empty']} empty, {s['skipped']} resumed) "
+              f"{rate:.2f} q/s" + ("" if final else f", eta {eta:.0f}s"), file=sys.stderr)
+
+    async def run_async(self, jobs: List[Dict[str, Any]], out_path: str) -> Dict[str, int]:
+        done = completed_ids(out_path)
+        pending = [j for j in jobs if j["id"] not in done]
+        self.stats.update(total=len(jobs), skipped=len(jobs) - len(pending))
+        # each pipeline keeps a few stages in threads at once; size the pool for that
+        loop = asyncio.get_running_loop()
+        loop.set_default_executor(ThreadPoolExecutor(max_workers=max(8, self.concurrency * 4),
+                                                     thread_name_prefix="batch"))
+        queue: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        for job in pending:
+            queue.put_nowait(job)
+        started = time.perf_counter()
+        last_report = started
+
+        _drop_torn_tail(out_path)
+        with open(out_path, "a", encoding="utf-8") as out:
+            async def worker():
+                nonlocal last_report
+                while True:
+                    try:
+                        job = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    rec = await self._one(job)
+                    out.write(json.dumps(rec, default=str) + "\n")
+                    out.flush()  # a crash loses at most the queries in flight
+                    self.stats[rec["status"]] += 1
+                    if time.perf_counter() - last_report >= self.progress_every:
+                        last_report = time.perf_counter()
+                        self._progress(started)
+
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(pending)) or 1)))
+        self._progress(started, final=True)
+        return dict(self.stats)
+
+    def run(self, jobs: List[Dict[str, Any]], out_path: str) -> Dict[str, int]:
+        return asyncio.run(self.run_async(jobs, out_path))
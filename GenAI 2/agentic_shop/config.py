@@ -21,6 +21,94 @@ MARKETPLACE = os.getenv("MARKETPLACE", "EBAY_US")
 HF_API_TOKEN = os.getenv("HF_API_TOKEN", "")
 
 # SQLite file for price history
-DB_PATH = os.path.join(os.path.dirname(__file__), "..", "data", "price_history.db")
+DB_PATH = os.getenv("DB_PATH") or os.path.join(os.path.dirname(__file__), "..", "data", "price_history.db")
 
 SERPAPI_API_KEY = os.getenv("SERPAPI_API_KEY", "")
+
+# Overall deadline (seconds) for one fan-out search across all providers
+SEARCH_DEADLINE = float(os.getenv("SEARCH_DEADLINE", "30"))
+
+# Shared HTTP connection pools (see agents/transport.py)
+HTTP_POOL_CONNECTIONS = int(os.getenv("HTTP_POOL_CONNECTIONS", "10"))  # distinct hosts kept pooled
+HTTP_POOL_MAXSIZE = int(os.getenv("HTTP_POOL_MAXSIZE", "16"))          # keep-alive connections per host
+HTTP_POOL_BLOCK = (os.getenv("HTTP_POOL_BLOCK") or "false").lower() in ("1", "true", "yes")
+
+# Hugging Face sentiment batching
+HF_BATCH_SIZE = int(os.getenv("HF_BATCH_SIZE", "32"))         # texts per inference request
+HF_MAX_CONCURRENCY = int(os.getenv("HF_MAX_CONCURRENCY", "4"))  # batches in flight at once
+
+# Persistent sentiment cache (SQLite next to the price history DB)
+SENTIMENT_CACHE_PATH = os.getenv("SENTIMENT_CACHE_PATH") or os.path.join(os.path.dirname(DB_PATH), "sentiment_cache.db")
+SENTIMENT_CACHE_TTL = int(os.getenv("SENTIMENT_CACHE_TTL", str(30 * 24 * 3600)))  # seconds
+SENTIMENT_CACHE_MAX_ROWS = int(os.getenv("SENTIMENT_CACHE_MAX_ROWS", "200000"))
+SENTIMENT_CACHE_MEMORY = int(os.getenv("SENTIMENT_CACHE_MEMORY", "4096"))        # in-memory LRU entries
+
+# Sentiment backend: 'auto' (HF when HF_API_TOKEN is set, else local), 'hf' or 'local'
+SENTIMENT_BACKEND = (os.getenv("SENTIMENT_BACKEND") or "auto").lower()
+
+# Price history retention (see agents/rollup.py)
+PRICE_RAW_RETENTION_DAYS = int(os.getenv("PRICE_RAW_RETENTION_DAYS", "30"))       # raw sightings
+PRICE_HOURLY_RETENTION_DAYS = int(os.getenv("PRICE_HOURLY_RETENTION_DAYS", "365"))  # hourly buckets; daily kept forever
+
+# Provider search response cache (see agents/providers/cache.py)
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH") or os.path.join(os.path.dirname(DB_PATH), "search_cache.db")
+SEARCH_CACHE_TTLS = {  # seconds a response is served as fresh, per provider
+    "ebay": int(os.getenv("SEARCH_CACHE_TTL_EBAY", "900")),
+    "serpapi": int(os.getenv("SEARCH_CACHE_TTL_SERPAPI", "3600")),  # SerpApi searches cost quota
+}
+SEARCH_CACHE_DEFAULT_TTL = int(os.getenv("SEARCH_CACHE_TTL", "900"))
+SEARCH_CACHE_STALE = int(os.getenv("SEARCH_CACHE_STALE", "3600"))  # extra seconds served stale while refreshing
+SEARCH_CACHE_MEMORY = int(os.getenv("SEARCH_CACHE_MEMORY", "512"))
+
+# Client-side rate limits per provider+credential (see agents/ratelimit.py); daily quota 0 = unlimited
+RATE_LIMIT_PATH = os.getenv("RATE_LIMIT_PATH") or os.path.join(os.path.dirname(DB_PATH), "ratelimit.db")
+RATE_LIMITS = {  # provider -> (requests/second, burst, daily quota)
+    "ebay": (float(os.getenv("EBAY_RATE_PER_SEC", "5")), int(os.getenv("EBAY_BURST", "10")),
+             int(os.getenv("EBAY_DAILY_QUOTA", "5000"))),
+    "serpapi": (float(os.getenv("SERPAPI_RATE_PER_SEC", "1")), int(os.getenv("SERPAPI_BURST", "5")),
+                int(os.getenv("SERPAPI_DAILY_QUOTA", "0"))),
+}
+RATE_LIMIT_MAX_WAIT = float(os.getenv("RATE_LIMIT_MAX_WAIT", "10"))  # longer waits are shed instead
+
+# eBay OAuth token management
+EBAY_TOKEN_REFRESH_MARGIN = int(os.getenv("EBAY_TOKEN_REFRESH_MARGIN", "300"))  # refresh this many seconds before expiry
+EBAY_TOKEN_CACHE_PATH = os.getenv("EBAY_TOKEN_CACHE_PATH", "")  # optional SQLite file shared by worker processes
+
+# eBay item-detail enrichment (see agents/enrichment.py)
+ENRICH_CONCURRENCY = int(os.getenv("ENRICH_CONCURRENCY", "8"))     # getItem calls in flight
+ENRICH_DEADLINE = float(os.getenv("ENRICH_DEADLINE", "15"))        # seconds for the whole stage
+ENRICH_CACHE_TTL = int(os.getenv("ENRICH_CACHE_TTL", "3600"))      # serve cached items without revalidating
+ENRICH_CACHE_SIZE = int(os.getenv("ENRICH_CACHE_SIZE", "5000"))
+
+# Search providers to enable, in order (see agents/providers/registry.py)
+SEARCH_PROVIDERS = [p.strip() for p in (os.getenv("SEARCH_PROVIDERS") or "ebay,serpapi").split(",") if p.strip()]
+
+# Cross-retailer product matching (see agents/matching.py)
+MATCH_THRESHOLD = float(os.getenv("MATCH_THRESHOLD", "0.6"))  # Jaccard similarity of title shingles
+
+# Latency-aware provider calls (see agents/latency.py); fixed per-call timeouts remain the ceiling
+ADAPTIVE_TIMEOUTS = os.getenv("ADAPTIVE_TIMEOUTS", "true").lower() in ("1", "true", "yes")
+LATENCY_WINDOW = int(os.getenv("LATENCY_WINDOW", "200"))            # recent samples kept per endpoint
+LATENCY_MIN_SAMPLES = int(os.getenv("LATENCY_MIN_SAMPLES", "20"))   # fixed timeouts until this many
+TIMEOUT_MULTIPLIER = float(os.getenv("TIMEOUT_MULTIPLIER", "3"))    # adaptive timeout = p99 * multiplier
+TIMEOUT_FLOOR = float(os.getenv("TIMEOUT_FLOOR", "2"))              # seconds
+# Endpoints that may send a duplicate request after their p95 latency (idempotent, unmetered reads only)
+HEDGE_ENDPOINTS = {e.strip() for e in os.getenv("HEDGE_ENDPOINTS", "ebay.browse,ebay.item").split(",") if e.strip()}
+HEDGE_MIN_DELAY = float(os.getenv("HEDGE_MIN_DELAY", "0.05"))
+HEDGE_MAX_WORKERS = int(os.getenv("HEDGE_MAX_WORKERS", "32"))
+
+# Circuit breaker per upstream host (see agents/circuit.py)
+CIRCUIT_FAILURE_RATE = float(os.getenv("CIRCUIT_FAILURE_RATE", "0.5"))  # failure share that opens the circuit
+CIRCUIT_MIN_REQUESTS = int(os.getenv("CIRCUIT_MIN_REQUESTS", "5"))      # calls in the window before it can open
+CIRCUIT_WINDOW = float(os.getenv("CIRCUIT_WINDOW", "60"))               # seconds of outcomes considered
+CIRCUIT_OPEN_SECONDS = float(os.getenv("CIRCUIT_OPEN_SECONDS", "30"))   # fail fast this long before probing
+CIRCUIT_HALF_OPEN_PROBES = int(os.getenv("CIRCUIT_HALF_OPEN_PROBES", "1"))
+
+# Batch mode (see agentic_shop/batch.py)
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "4"))  # queries in flight
+
+# HTTP service mode (see agentic_shop/server.py)
+SERVER_MAX_CONCURRENCY = int(os.getenv("SERVER_MAX_CONCURRENCY", "8"))  # shopping requests in flight
+SERVER_QUEUE_TIMEOUT = float(os.getenv("SERVER_QUEUE_TIMEOUT", "2"))    # seconds to wait for a slot before 503
+SERVER_MAX_BODY = int(os.getenv("SERVER_MAX_BODY", "65536"))            # bytes
+SERVER_MAX_RESULTS = int(os.getenv("SERVER_MAX_RESULTS", "50"))        # largest limit a client may ask for (one Browse page)
@@ -1,73 +1,50 @@
-from typing import Dict, Any, List
-from rich.console import Console
-from rich.table import Table
+import asyncio
+from typing import Dict, Any, List, Optional
 
 from agentic_shop.agents.product_search import ProductSearchAgent
+from agentic_shop.agents.enrichment import ItemEnrichmentAgent
 from agentic_shop.agents.price_comparison import PriceComparisonAgent
 from agentic_shop.agents.review_analysis import ReviewAnalysisAgent
 from agentic_shop.agents.recommendation import RecommendationEngineAgent
 from agentic_shop.agents.utils import Product
-from agentic_shop.config import EBAY_ENV
-
-console = Console()
+from agentic_shop.pipeline import run_pipeline
+from agentic_shop.render import Renderer, NullRenderer
 
 class Orchestrator:
-    def __init__(self, sentiment_enabled: bool = True):
+    def __init__(self, sentiment_enabled: bool = True, enrich_enabled: bool = True,
+                 renderer: Optional[Renderer] = None):
+        # no output unless a renderer is given (run.py picks rich tables or JSON)
+        self.renderer = renderer or NullRenderer()
         self.search_agent = ProductSearchAgent()
+        self.enrich_agent = ItemEnrichmentAgent() if enrich_enabled else None
         self.price_agent = PriceComparisonAgent()
         self.review_agent = ReviewAnalysisAgent(enabled=sentiment_enabled)
         self.reco_agent = RecommendationEngineAgent()
 
     def run(self, query: str, budget: float | None, max_results: int = 10) -> Dict[str, Any]:
-        console.rule("[bold cyan]Product Search")
+        out = self.renderer
+        out.section("Product Search")
         products: List[Product] = self.search_agent.search(query, limit=max_results)
         if not products:
-            console.print(
-                "[yellow]No products returned by the eBay API.[/yellow] "
-                f"(Environment: {EBAY_ENV}). "
-                "If you're on sandbox, you must create sandbox test listings, "
-                "or switch to production keys."
-            )
-            return {"error": "No products found.", "products": []}
-
-        table = Table(title="Found Products")
-        table.add_column("Retailer")
-        table.add_column("Title")
-        table.add_column("Price")
-        table.add_column("URL")
-        for p in products:
-            table.add_row(p.retailer, p.title[:60], f"{p.price:.2f} {p.currency}", p.url)
-        console.print(table)
+            out.no_products()
+            result = {"error": "No products found.", "products": []}
+            out.result(result)
+            return result
+        if self.enrich_agent is not None:
+            self.enrich_agent.enrich(products)
+        out.products(products)
 
-        console.rule("[bold cyan]Price Comparison & History")
+        out.section("Price Comparison & History")
         summary = self.price_agent.compare(products)
 
-        console.rule("[bold cyan]Review Analysis (Sentiment)")
+        out.section("Review Analysis (Sentiment)")
         sentiments = self.review_agent.analyze(products)
 
-        console.rule("[bold cyan]Recommendations")
+        out.section("Recommendations")
         ranked = self.reco_agent.recommend(products, summary, sentiments, budget=budget)
+        out.ranked(ranked)
 
-        out_table = Table(title="Top Recommendations")
-        out_table.add_column("Score")
-        out_table.add_column("Retailer")
-        out_table.add_column("Title")
-        out_table.add_column("Price")
-        out_table.add_column("Sentiment+")
-        out_table.add_column("URL")
-        for r in ranked[:10]:
-            p = r["product"]
-            out_table.add_row(
-                str(r["score"]),
-                p.retailer,
-                p.title[:50],
-                f"{p.price:.2f} {p.currency}",
-                f"{r['sentiment_pos']:.2f}",
-                p.url
-            )
-        console.print(out_table)
-
-        return {
+        result = {
             "query": query,
             "budget": budget,
             "products": products,
@@ -75,3 +52,27 @@ class Orchestrator:
             "sentiments": sentiments,
             "ranked": ranked
         }
+        out.result(result)
+        return result
+
+    async def run_async(self, query: str, budget: float | None, max_results: int = 10) -> Dict[str, Any]:
+        """
+        Same result as run() (plus per-stage "timings"), but independent stages overlap:
+        provider batches stream into enrichment and sentiment while price comparison
+        runs alongside them (see agentic_shop/pipeline.py).
+        """
+        result = await run_pipeline(self.search_agent, self.enrich_agent, self.price_agent,
+                                    self.review_agent, self.reco_agent, query, budget, max_results)
+        out = self.renderer
+        if result["products"]:
+            out.products(result["products"])
+            out.ranked(result["ranked"])
+        else:
+            out.no_products()
+        out.timings(result["timings"])
+        out.result(result)
+        return result
+
+    def run_concurrent(self, query: str, budget: float | None, max_results: int = 10) -> Dict[str, Any]:
+        """Blocking wrapper around run_async for callers without an event loop."""
+        return asyncio.run(self.run_async(query, budget, max_results))
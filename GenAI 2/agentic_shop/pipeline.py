@@ -0,0 +1,121 @@
+"""
+Asyncio pipeline for one shopping query.
+
+Stage DAG (arrows are data dependencies):
+
+    search ──(each provider batch)──> enrich ──> reviews ──┐
+       └──(all batches)──> prices ─────────────────────────┴──> recommend
+
+Provider batches are streamed out of search as they arrive, so enrichment and
+sentiment for the first retailer overlap with the remaining searches. Price
+comparison needs every listing but no enrichment, so it runs alongside the
+review branches. The agents themselves are blocking and run in worker threads.
+"""
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agentic_shop.agents.utils import Product
+
+class StageTimings:
+    """Wall-clock span of each stage, measured from the start of the query."""
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self._spans: Dict[str, List[Tuple[float, float]]] = {}
+
+    def add(self, stage: str, start: float, end: float):
+        self._spans.setdefault(stage, []).append((start - self.origin, end - self.origin))
+
+    def report(self) -> Dict[str, Dict[str, float]]:
+        """
+        {stage: {start, end, wall, busy, runs}}: `wall` spans the first start to the
+        last end, `busy` sums the individual runs (stages like enrich run per batch).
+        """
+        out: Dict[str, Dict[str, float]] = {}
+        for stage, spans in self._spans.items():
+            start = min(s for s, _ in spans)
+            end = max(e for _, e in spans)
+            out[stage] = {"start": round(start, 4), "end": round(end, 4), "wall": round(end - start, 4),
+                          "busy": round(sum(e - s for s, e in spans), 4), "runs": len(spans)}
+        out["total"] = {"start": 0.0, "end": round(time.perf_counter() - self.origin, 4),
+                        "wall": round(time.perf_counter() - self.origin, 4)}
+        return out
+
+async def _stage(timings: StageTimings, name: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+    start = time.perf_counter()
+    try:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+    finally:
+        timings.add(name, start, time.perf_counter())
+
+async def run_pipeline(search_agent, enrich_agent, price_agent, review_agent, reco_agent,
+                       query: str, budget: Optional[float], max_results: int = 10,
+                       top_k: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Runs one query through the stage DAG and returns the same fields as
+    Orchestrator.run plus "search_stats" (per-provider status of this query) and
+    "timings" (see StageTimings.report). `enrich_agent`
+    may be None to skip enrichment; `top_k` limits "ranked" to the best k.
+    """
+    timings = StageTimings()
+    search_stats: Dict[str, Dict[str, Any]] = {}  # per call: the agent may serve concurrent queries
+    loop = asyncio.get_running_loop()
+    batches: "asyncio.Queue[Optional[Tuple[str, List[Product]]]]" = asyncio.Queue()
+
+    def produce():
+        try:
+            for batch in search_agent.iter_search(query, limit=max_results, stats=search_stats):
+                loop.call_soon_threadsafe(batches.put_nowait, batch)
+        finally:
+            loop.call_soon_threadsafe(batches.put_nowait, None)
+
+    async def branch(products: List[Product]) -> Dict[str, Dict]:
+        if enrich_agent is not None:
+            await _stage(timings, "enrich", enrich_agent.enrich, products)
+        return await _stage(timings, "reviews", review_agent.analyze, products)
+
+    search_task = asyncio.create_task(_stage(timings, "search", produce))
+    by_provider: Dict[str, List[Product]] = {}
+    branches: List["asyncio.Task[Dict[str, Dict]]"] = []
+    try:
+        while (batch := await batches.get()) is not None:
+            name, products = batch
+            by_provider[name] = products
+            if products:
+                branches.append(asyncio.create_task(branch(products)))
+        await search_task
+
+        # registration order, as in ProductSearchAgent.search
+        order = [name for name, _ in search_agent.providers]
+        products = [p for name in order for p in by_provider.get(name, [])]
+        if not products:
+            return {"error": "No products found.", "products": [], "search_stats": search_stats,
+                    "timings": timings.report()}
+
+        summary, branch_results = await asyncio.gather(
+            _stage(timings, "prices", price_agent.compare, products),
+            asyncio.gather(*branches),
+        )
+    finally:
+        # on failure or cancellation, don't leave search or branch tasks running unobserved
+        tasks = [search_task, *branches]
+        for t in tasks:
+            if not t.done():
+                t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    sentiments: Dict[str, Dict] = {}
+    for partial in branch_results:
+        sentiments.update(partial)
+
+    ranked = await _stage(timings, "recommend", reco_agent.recommend, products, summary, sentiments,
+                          budget=budget, top_k=top_k)
+    return {
+        "query": query,
+        "budget": budget,
+        "products": products,
+        "summary": summary,
+        "sentiments": sentiments,
+        "ranked": ranked,
+        "search_stats": search_stats,
+        "timings": timings.report(),
+    }
@@ -0,0 +1,120 @@
+import json
+import sys
+from typing import Any, Dict, List, Optional, TextIO
+
+from agentic_shop.agents.utils import Product
+from agentic_shop.serialization import result_to_dict
+from agentic_shop.config import EBAY_ENV
+
+class Renderer:
+    """
+    Presentation hooks called by the Orchestrator as a query progresses. The base
+    class does nothing, so library, batch and server callers pay nothing for output.
+    """
+    def section(self, title: str):
+        pass
+
+    def no_products(self):
+        pass
+
+    def products(self, products: List[Product]):
+        pass
+
+    def ranked(self, ranked: List[Dict[str, Any]]):
+        pass
+
+    def timings(self, timings: Dict[str, Dict[str, float]]):
+        pass
+
+    def result(self, result: Dict[str, Any]):
+        """Called once with the final result (including error results)."""
+        pass
+
+class NullRenderer(Renderer):
+    pass
+
+class JsonRenderer(Renderer):
+    """Writes the final result as one JSON document (see serialization.result_to_dict)."""
+    def __init__(self, stream: Optional[TextIO] = None, top: Optional[int] = 10, indent: Optional[int] = None):
+        self.stream = stream
+        self.top = top
+        self.indent = indent
+
+    def result(self, result: Dict[str, Any]):
+        stream = self.stream or sys.stdout
+        stream.write(json.dumps(result_to_dict(result, top=self.top), default=str, indent=self.indent) + "\n")
+        stream.flush()
+
+class RichRenderer(Renderer):
+    """Terminal tables via rich, which is imported only when this renderer is built."""
+    def __init__(self, top: int = 10, file: Optional[TextIO] = None):
+        from rich.console import Console
+        from rich.table import Table
+        self.console = Console(file=file)
+        self._table = Table
+        self.top = top
+
+    def section(self, title: str):
+        self.console.rule(f"[bold cyan]{title}")
+
+    def no_products(self):
+        self.console.print(
+            "[yellow]No products returned by the eBay API.[/yellow] "
+            f"(Environment: {EBAY_ENV}). "
+            "If you're on sandbox, you must create sandbox test listings, "
+            "or switch to production keys."
+        )
+
+    def products(self, products: List[Product]):
+        table = self._table(title="Found Products")
+        table.add_column("Retailer")
+        table.add_column("Title")
+        table.add_column("Price")
+        table.add_column("URL")
+        for p in products:
+            table.add_row(p.retailer, p.title[:60], f"{p.price:.2f} {p.currency}", p.url)
+        self.console.print(table)
+
+    def ranked(self, ranked: List[Dict[str, Any]]):
+        out_table = self._table(title="Top Recommendations")
+        out_table.add_column("Score")
+        out_table.add_column("Retailer")
+        out_table.add_column("Title")
+        out_table.add_column("Price")
+        out_table.add_column("Sentiment+")
+        out_table.add_column("URL")
+        for r in ranked[:self.top]:
+            p = r["product"]
+            out_table.add_row(
+                str(r["score"]),
+                p.retailer,
+                p.title[:50],
+                f"{p.price:.2f} {p.currency}",
+                f"{r['sentiment_pos']:.2f}",
+                p.url
+            )
+        self.console.print(out_table)
+
+    def timings(self, timings: Dict[str, Dict[str, float]]):
+        table = self._table(title="Stage Timings (s)")
+        for col in ("Stage", "Start", "End", "Wall", "Busy"):
+            table.add_column(col)
+        for stage, t in timings.items():
+            table.add_row(stage, f"{t['start']:.3f}", f"{t['end']:.3f}", f"{t['wall']:.3f}",
+                          f"{t['busy']:.3f}" if "busy" in t else "")
+        self.console.print(table)
+
+RENDERERS = ("auto", "rich", "json", "none")
+
+def get_renderer(name: str = "auto") -> Renderer:
+    """'auto' picks rich tables on a terminal and JSON when output is piped."""
+    name = (name or "auto").lower()
+    if name == "auto":
+        name = "rich" if sys.stdout.isatty() else "json"
+    if name == "rich":
+        return RichRenderer()
+    if name == "json":
+        return JsonRenderer()
+    if name in ("none", "null"):
+        return NullRenderer()
+    raise ValueError(f"unknown renderer {name!r}; expected one of {', '.join(RENDERERS)}")
@@ -0,0 +1,36 @@
+from dataclasses import asdict
+from typing import Any, Dict, Optional
+
+from agentic_shop.agents.utils import Product
+
+def product_to_dict(p: Product) -> Dict[str, Any]:
+    return asdict(p)
+
+def result_to_dict(result: Dict[str, Any], top: Optional[int] = None) -> Dict[str, Any]:
+    """
+    JSON-ready form of an Orchestrator result. Products appear once in full under
+    "products"; summary groups and rankings refer to them by id. Sentiment details
+    are dropped and `top` limits the ranking (None keeps all).
+    """
+    out: Dict[str, Any] = {k: result[k] for k in ("query", "budget", "error") if k in result}
+    out["products"] = [product_to_dict(p) for p in result.get("products", [])]
+    out["summary"] = {
+        key: {
+            "count": g["count"],
+            "min_price": g["min_price"],
+            "max_price": g["max_price"],
+            "avg_price": g["avg_price"],
+            "best_deal": g["best_deal"].id,
+            "items": [i.id for i in g["items"]],
+            "history": g["history"],
+        }
+        for key, g in result.get("summary", {}).items()
+    }
+    out["sentiments"] = {pid: {"pos": s.get("pos"), "neg": s.get("neg")}
+                         for pid, s in result.get("sentiments", {}).items()}
+    ranked = result.get("ranked", [])
+    out["ranked"] = [{"product_id": r["product"].id, "score": r["score"], "sentiment_pos": r["sentiment_pos"]}
+                     for r in (ranked if top is None else ranked[:top])]
+    if "timings" in result:
+        out["timings"] = result["timings"]
+    return out
@@ -0,0 +1,241 @@
+"""
+Long-running HTTP service around the Orchestrator (plain ASGI, no framework).
+
+One process keeps the pooled sessions, eBay token, search/sentiment caches and
+price DB connections warm across requests. Endpoints (GET query string or POST
+JSON body, same parameter names):
+
+    GET  /health
+    GET  /metrics                              circuit breakers, latency, rate limits
+    *    /search     q, limit                  listings from every provider
+    *    /compare    q, limit                  search + price comparison
+    *    /recommend  q, budget, limit, top     full pipeline with per-stage timings
+
+`limit` is capped at `max_results` and `top` at `limit` (400 outside 1..max).
+At most `max_concurrency` shopping requests run at once; a request that cannot
+get a slot within `queue_timeout` seconds is answered 503 with Retry-After.
+Serve it with any ASGI server, e.g. `python run.py --serve` (needs uvicorn).
+"""
+import asyncio
+import json
+import sys
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs
+
+from agentic_shop.pipeline import run_pipeline
+from agentic_shop.serialization import product_to_dict, result_to_dict
+from agentic_shop.config import SERVER_MAX_CONCURRENCY, SERVER_QUEUE_TIMEOUT, SERVER_MAX_BODY, SERVER_MAX_RESULTS
+
+Send = Callable[[Dict[str, Any]], Awaitable[None]]
+Receive = Callable[[], Awaitable[Dict[str, Any]]]
+
+class HTTPError(Exception):
+    def __init__(self, status: int, message: str, headers: Optional[List[Tuple[bytes, bytes]]] = None):
+        super().__init__(message)
+        self.status = status
+        self.headers = headers or []
+
+def _param(params: Dict[str, Any], name: str, cast, default=None, required: bool = False):
+    value = params.get(name)
+    if value in (None, ""):
+        if required:
+            raise HTTPError(400, f"missing parameter: {name}")
+        return default
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        raise HTTPError(400, f"invalid {name}: {value!r}")
+
+def _count(params: Dict[str, Any], name: str, default: int, high: int) -> int:
+    """Integer parameter that must lie in 1..high."""
+    value = _param(params, name, int, default)
+    if not 1 <= value <= high:
+        raise HTTPError(400, f"{name} must be between 1 and {high}")
+    return value
+
+class ShopServer:
+    """ASGI application; build the Orchestrator lazily so importing this module stays cheap."""
+    def __init__(self, orchestrator=None, max_concurrency: int = SERVER_MAX_CONCURRENCY,
+                 queue_timeout: float = SERVER_QUEUE_TIMEOUT, max_body: int = SERVER_MAX_BODY,
+                 max_results: int = SERVER_MAX_RESULTS,
+                 warm_token: bool = True, sentiment_enabled: bool = True, enrich_enabled: bool = True):
+        self.orch = orchestrator
+        # used only when the Orchestrator is built here (see startup)
+        self.sentiment_enabled = sentiment_enabled
+        self.enrich_enabled = enrich_enabled
+        self.max_concurrency = max(1, max_concurrency)
+        self.queue_timeout = queue_timeout
+        self.max_body = max_body
+        self.max_results = max(1, max_results)
+        self.warm_token = warm_token
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._starting: Optional[asyncio.Lock] = None
+        self.stats = {"requests": 0, "rejected": 0, "errors": 0, "in_flight": 0}
+        self._routes = {
+            "/health": self._health,
+            "/metrics": self._metrics,
+            "/search": self._search,
+            "/compare": self._compare,
+            "/recommend": self._recommend,
+        }
+
+    async def startup(self):
+        if self.orch is None:
+            from agentic_shop.orchestrator import Orchestrator
+            self.orch = await asyncio.to_thread(Orchestrator, sentiment_enabled=self.sentiment_enabled,
+                                                enrich_enabled=self.enrich_enabled)
+        if self.warm_token:
+            # mint the eBay token up front so the first request doesn't pay for OAuth
+            from agentic_shop.agents.providers.ebay import _get_token
+            try:
+                await asyncio.to_thread(_get_token)
+            except Exception as e:
+                print(f"[server] eBay token warm-up failed: {e}", file=sys.stderr)
+
+    async def shutdown(self):
+        from agentic_shop.agents.providers.ebay import close_token_manager
+        from agentic_shop.agents.storage import close_stores
+        from agentic_shop.agents.transport import close_sessions
+        close_token_manager()
+        close_sessions()
+        close_stores()
+
+    async def _health(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        return {"status": "ok", "in_flight": self.stats["in_flight"]}
+
+    async def _metrics(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        from agentic_shop.agents.circuit import breaker_metrics
+        from agentic_shop.agents.latency import get_latency_tracker
+        from agentic_shop.agents.ratelimit import get_rate_limiter
+        return {
+            "server": dict(self.stats),
+            "circuits": breaker_metrics(),
+            "latency": get_latency_tracker().snapshot(),
+            "rate_limits": await asyncio.to_thread(get_rate_limiter().metrics),
+        }
+
+    async def _search(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        q = _param(params, "q", str, required=True)
+        limit = _count(params, "limit", min(10, self.max_results), self.max_results)
+        products = await asyncio.to_thread(self.orch.search_agent.search, q, limit)
+        return {"query": q, "products": [product_to_dict(p) for p in products]}
+
+    async def _compare(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        q = _param(params, "q", str, required=True)
+        limit = _count(params, "limit", min(10, self.max_results), self.max_results)
+        products = await asyncio.to_thread(self.orch.search_agent.search, q, limit)
+        summary = await asyncio.to_thread(self.orch.price_agent.compare, products) if products else {}
+        out = result_to_dict({"query": q, "products": products, "summary": summary})
+        return {k: out[k] for k in ("query", "products", "summary")}
+
+    async def _recommend(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        q = _param(params, "q", str, required=True)
+        budget = _param(params, "budget", float)
+        limit = _count(params, "limit", min(10, self.max_results), self.max_results)
+        top = _count(params, "top", min(10, limit), limit)
+        o = self.orch
+        result = await run_pipeline(o.search_agent, o.enrich_agent, o.price_agent, o.review_agent,
+                                    o.reco_agent, q, budget, limit, top_k=top)
+        return result_to_dict(result)
+
+    async def __call__(self, scope: Dict[str, Any], receive: Receive, send: Send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+        if scope["type"] != "http":
+            return
+        status, body, headers = await self._handle(scope, receive)
+        await send({"type": "http.response.start", "status": status,
+                    "headers": [(b"content-type", b"application/json"),
+                                (b"content-length", str(len(body)).encode())] + headers})
+        await send({"type": "http.response.body", "body": body})
+
+    async def _lifespan(self, receive: Receive, send: Send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                try:
+                    await self.startup()
+                except Exception as e:
+                    await send({"type": "lifespan.startup.failed", "message": str(e)})
+                    return
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await self.shutdown()
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _read_params(self, scope: Dict[str, Any], receive: Receive) -> Dict[str, Any]:
+        params: Dict[str, Any] = {k: v[-1] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+        if scope["method"] != "POST":
+            return params
+        body = b""
+        more = True
+        while more:
+            message = await receive()
+            body += message.get("body", b"")
+            more = message.get("more_body", False)
+            if len(body) > self.max_body:
+                raise HTTPError(413, "request body too large")
+        if body:
+            try:
+                data = json.loads(body)
+            except ValueError:
+                raise HTTPError(400, "body must be JSON")
+            if not isinstance(data, dict):
+                raise HTTPError(400, "body must be a JSON object")
+            params.update(data)
+        return params
+
+    async def _handle(self, scope: Dict[str, Any], receive: Receive) -> Tuple[int, bytes, List[Tuple[bytes, bytes]]]:
+        self.stats["requests"] += 1
+        handler = self._routes.get(scope["path"].rstrip("/") or "/")
+        try:
+            if handler is None:
+                raise HTTPError(404, "not found")
+            if scope["method"] not in ("GET", "POST"):
+                raise HTTPError(405, "method not allowed")
+            params = await self._read_params(scope, receive)
+            if handler in (self._health, self._metrics):
+                payload = await handler(params)
+            else:
+                payload = await self._limited(handler, params)
+            return 200, json.dumps(payload, default=str).encode(), []
+        except HTTPError as e:
+            if e.status == 503:
+                self.stats["rejected"] += 1
+            return e.status, json.dumps({"error": str(e)}).encode(), e.headers
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"[server] {scope['path']} failed: {e!r}", file=sys.stderr)
+            return 500, json.dumps({"error": "internal error"}).encode(), []
+
+    async def _limited(self, handler, params: Dict[str, Any]) -> Dict[str, Any]:
+        if self.orch is None:  # served without lifespan support
+            self._starting = self._starting or asyncio.Lock()
+            async with self._starting:
+                if self.orch is None:
+                    await self.startup()
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_concurrency)
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            raise HTTPError(503, "server busy", [(b"retry-after", b"1")])
+        self.stats["in_flight"] += 1
+        try:
+            return await handler(params)
+        finally:
+            self.stats["in_flight"] -= 1
+            self._slots.release()
+
+def create_app(orchestrator=None, **kwargs) -> ShopServer:
+    return ShopServer(orchestrator, **kwargs)
+
+def serve(host: str = "127.0.0.1", port: int = 8000, **kwargs):
+    """Runs the app under uvicorn (optional dependency, imported only here)."""
+    try:
+        import uvicorn
+    except ImportError as e:  # pragma: no cover - depends on environment
+        raise ImportError("Server mode needs uvicorn: pip install uvicorn") from e
+    uvicorn.run(create_app(**kwargs), host=host, port=port, lifespan="on")
@@ -0,0 +1,49 @@
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+from agentic_shop.agents.analytics import aggregate_prices, export_price_history, price_report
+from agentic_shop.agents.storage import PriceStore
+
+def test_aggregate_matches_numpy_per_group():
+    rng = np.random.default_rng(0)
+    ids = rng.choice(np.array(["a", "b", "c"]), size=1000)
+    prices = rng.uniform(10, 100, size=1000)
+    agg = aggregate_prices(ids, prices, percentiles=(50, 90))
+    for i, pid in enumerate(agg["product_id"]):
+        sel = prices[ids == pid]
+        assert agg["count"][i] == sel.size
+        assert agg["min"][i] == sel.min() and agg["max"][i] == sel.max()
+        assert np.isclose(agg["avg"][i], sel.mean())
+        assert np.isclose(agg["p50"][i], np.percentile(sel, 50))
+        assert np.isclose(agg["p90"][i], np.percentile(sel, 90))
+
+def test_aggregate_over_windows():
+    agg = aggregate_prices(np.array(["a"] * 4), np.array([1.0, 3.0, 10.0, 20.0]),
+                           seen_at=np.array([0, 10, 100, 110]), window=100)
+    assert agg["window_start"].tolist() == [0, 100]
+    assert agg["avg"].tolist() == [2.0, 15.0]
+
+def test_parquet_export_roundtrip(tmp_path):
+    pytest.importorskip("pyarrow")
+    store = PriceStore(str(tmp_path / "h.db"))
+    t0 = datetime(2025, 3, 1, tzinfo=timezone.utc)
+    for day in range(3):
+        store.track_prices_bulk([("a", "eBay", 10.0 + day), ("a", "Best Buy", 20.0)], seen_at=t0 + timedelta(days=day))
+    out = str(tmp_path / "export")
+    assert export_price_history(out, store=store) == 6
+    rows = price_report(out, retailers=["eBay"], since=t0 + timedelta(days=1))
+    assert rows == [{"product_id": "a", "count": 2, "min": 11.0, "max": 12.0, "avg": 11.5, "p50": 11.5, "p90": 11.9}]
+    store.close()
+
+def test_incremental_export_keeps_whole_days(tmp_path):
+    pytest.importorskip("pyarrow")
+    store = PriceStore(str(tmp_path / "h.db"))
+    t0 = datetime(2025, 3, 1, 6, tzinfo=timezone.utc)
+    store.track_prices_bulk([("a", "eBay", 10.0)], seen_at=t0)
+    store.track_prices_bulk([("a", "eBay", 12.0)], seen_at=t0 + timedelta(hours=12))
+    out = str(tmp_path / "export")
+    assert export_price_history(out, store=store) == 2
+    # re-exporting from midday rewrites 2025-03-01, so the morning row must come along
+    assert export_price_history(out, store=store, since=t0 + timedelta(hours=6)) == 2
+    assert price_report(out)[0]["count"] == 2
+    store.close()
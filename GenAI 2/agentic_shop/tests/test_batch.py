@@ -0,0 +1,78 @@
+import json
+from types import SimpleNamespace
+
+from agentic_shop.agents.product_search import ProductSearchAgent
+from agentic_shop.agents.recommendation import RecommendationEngineAgent
+from agentic_shop.agents.utils import Product
+from agentic_shop.batch import BatchRunner, read_queries, completed_ids
+
+class Prices:
+    def __init__(self, fail=()):
+        self.fail = set(fail)
+    def compare(self, products):
+        if products[0].title in self.fail:
+            raise RuntimeError("db down")
+        return {}
+
+class Reviews:
+    def analyze(self, products):
+        return {p.id: {"pos": 0.6, "neg": 0.4} for p in products}
+
+def _orch(calls, fail=()):
+    def provider(query, limit):
+        calls.append(query)
+        if query == "nothing":
+            return []
+        return [Product(id=f"x:{query}", title=query, price=5.0, currency="USD", retailer="X", url="u")]
+    search = ProductSearchAgent(providers=[("x", provider)], use_cache=False)
+    return SimpleNamespace(search_agent=search, enrich_agent=None, price_agent=Prices(fail),
+                           review_agent=Reviews(), reco_agent=RecommendationEngineAgent())
+
+def test_read_queries_jsonl_and_csv(tmp_path):
+    j = tmp_path / "q.jsonl"
+    j.write_text('{"query": "tv", "budget": 300}\n\n{"id": "k", "query": "ssd", "max_results": 3}\n{"query": ""}\n')
+    jobs = read_queries(str(j))
+    assert [(q["id"], q["query"], q["budget"], q["max_results"]) for q in jobs] == [
+        ("1", "tv", 300.0, 10), ("k", "ssd", None, 3)]
+    c = tmp_path / "q.csv"
+    c.write_text("id,query,budget\na,drone,250\nb,airpods,\n")
+    assert [(q["id"], q["budget"]) for q in read_queries(str(c))] == [("a", 250.0), ("b", None)]
+
+def test_malformed_records_are_skipped(tmp_path, capsys):
+    j = tmp_path / "q.jsonl"
+    j.write_text('{"query": "tv"}\n{"query": "ssd", \n[1, 2]\n{"query": "drone", "budget": "cheap"}\n'
+                 '{"query": "mouse", "max_results": "x"}\n{"query": "lamp", "budget": 20}\n')
+    assert [q["query"] for q in read_queries(str(j))] == ["tv", "lamp"]
+    err = capsys.readouterr().err
+    for n in (2, 3, 4, 5):
+        assert f"record {n}:" in err
+
+def test_falsy_and_duplicate_ids(tmp_path, capsys):
+    j = tmp_path / "q.jsonl"
+    j.write_text('{"id": 0, "query": "tv"}\n{"id": 1, "query": "ssd"}\n{"id": 1, "query": "drone"}\n'
+                 '{"query": "mouse"}\n')
+    jobs = read_queries(str(j))
+    assert [(q["id"], q["query"]) for q in jobs] == [("0", "tv"), ("1", "ssd"), ("4", "mouse")]
+    assert "record 3: duplicate id '1'" in capsys.readouterr().err
+
+def test_batch_streams_results_and_resumes(tmp_path):
+    out = tmp_path / "out.jsonl"
+    jobs = [{"id": str(i), "query": q, "budget": 10.0, "max_results": 5}
+            for i, q in enumerate(["tv", "nothing", "bad", "ssd"])]
+    calls = []
+    stats = BatchRunner(_orch(calls, fail={"bad"}), concurrency=2).run(jobs, str(out))
+    assert stats == {"total": 4, "skipped": 0, "ok": 2, "empty": 1, "failed": 1}
+    recs = {r["id"]: r for r in map(json.loads, out.read_text().splitlines())}
+    assert recs["0"]["status"] == "ok" and recs["0"]["ranked"][0]["product_id"] == "x:tv"
+    assert recs["2"]["status"] == "failed" and "db down" in recs["2"]["error"]
+    assert completed_ids(str(out)) == {"0", "1", "3"}
+
+    with open(out, "a") as f:
+        f.write('{"id": "9", "sta')  # torn line from a crash
+    calls.clear()
+    stats = BatchRunner(_orch(calls), concurrency=2).run(jobs, str(out))
+    assert calls == ["bad"]  # only the failed query is retried
+    assert stats["skipped"] == 3 and stats["ok"] == 1
+    recs = [json.loads(line) for line in out.read_text().splitlines()]  # torn fragment was cut
+    assert [r["id"] for r in recs if r["status"] == "ok"][-1] == "2"
+    assert completed_ids(str(out)) == {"0", "1", "2", "3"}
@@ -0,0 +1,99 @@
+import pytest
+import requests
+
+from agentic_shop.agents import transport
+from agentic_shop.agents.circuit import (CircuitBreaker, CircuitOpen, CLOSED, OPEN, HALF_OPEN,
+                                         get_breaker, reset_breakers)
+from agentic_shop.agents.providers import serpapi_shopping
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+    def __call__(self):
+        return self.now
+
+def _fail(b: CircuitBreaker, n: int):
+    for _ in range(n):
+        b.record(b.allow(), False)
+
+def test_opens_on_error_rate_and_fails_fast():
+    clock = Clock()
+    b = CircuitBreaker("api", failure_rate=0.5, min_requests=4, window=60, open_seconds=30, clock=clock)
+    b.record(b.allow(), True)
+    _fail(b, 2)
+    assert b.state == CLOSED  # 3 calls < min_requests
+    _fail(b, 1)
+    assert b.state == OPEN
+    with pytest.raises(CircuitOpen):
+        b.allow()
+    assert b.metrics["rejected"] == 1 and b.metrics["opened"] == 1
+
+def test_half_open_probe_closes_or_reopens():
+    clock = Clock()
+    b = CircuitBreaker("api", min_requests=2, open_seconds=30, half_open_probes=1, clock=clock)
+    _fail(b, 2)
+    clock.now += 31
+    probe = b.allow()
+    assert b.state == HALF_OPEN
+    with pytest.raises(CircuitOpen):
+        b.allow()  # only one probe in flight
+    b.record(probe, False)
+    assert b.state == OPEN
+    clock.now += 31
+    b.record(b.allow(), True)
+    assert b.state == CLOSED
+    assert b.snapshot()["half_opened"] == 2 and b.snapshot()["closed"] == 1
+
+def test_late_call_from_closed_state_does_not_end_half_open():
+    clock = Clock()
+    b = CircuitBreaker("api", min_requests=2, open_seconds=30, half_open_probes=1, clock=clock)
+    slow = b.allow()  # admitted while closed, still in flight
+    _fail(b, 2)
+    clock.now += 31
+    probe = b.allow()
+    assert b.state == HALF_OPEN
+    b.record(slow, True)
+    assert b.state == HALF_OPEN  # only the probe decides
+    b.record(probe, True)
+    assert b.state == CLOSED
+
+def test_old_failures_leave_the_window():
+    clock = Clock()
+    b = CircuitBreaker("api", min_requests=3, window=10, clock=clock)
+    _fail(b, 2)
+    clock.now += 11
+    _fail(b, 1)
+    assert b.state == CLOSED
+
+def test_guard_ignores_client_errors():
+    b = CircuitBreaker("api", min_requests=1)
+    resp = requests.Response()
+    resp.status_code = 404
+    with pytest.raises(requests.HTTPError):
+        with b.guard():
+            raise requests.HTTPError(response=resp)
+    assert b.state == CLOSED
+    with pytest.raises(requests.ConnectionError):
+        with b.guard():
+            raise requests.ConnectionError("refused")
+    assert b.state == OPEN
+
+def test_provider_returns_empty_while_open(monkeypatch):
+    reset_breakers()
+    calls = []
+
+    class DownSession:
+        def request(self, method, url, **kwargs):
+            calls.append(url)
+            raise requests.ConnectionError("down")
+
+    monkeypatch.setattr(transport, "get_session", lambda name: DownSession())
+    monkeypatch.setattr(serpapi_shopping.get_rate_limiter(), "acquire", lambda *a, **k: 0.0)
+    breaker = get_breaker("serpapi.com")
+    for _ in range(breaker.min_requests):
+        assert serpapi_shopping.search_serpapi_shopping("key", "tv") == []
+    assert breaker.state == OPEN
+    attempts = len(calls)
+    assert serpapi_shopping.search_serpapi_shopping("key", "tv") == []
+    assert len(calls) == attempts  # failed fast without touching the network
+    reset_breakers()
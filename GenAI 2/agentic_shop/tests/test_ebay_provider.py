@@ -0,0 +1,92 @@
+import os
+import stat
+import threading
+import time
+
+import pytest
+
+from agentic_shop.agents.providers import ebay
+
+def _fake_browse(total, calls, gate=None):
+    def fake(q, limit, offset=0):
+        calls.append((limit, offset))
+        if gate is not None and offset:
+            gate.set()
+        items = [{"itemId": str(i), "title": f"item {i}", "price": {"value": "1.0", "currency": "USD"}}
+                 for i in range(offset, min(offset + limit, total))]
+        nxt = "https://next" if offset + limit < total else None
+        return {"itemSummaries": items, "total": total, "next": nxt, "offset": offset, "limit": limit}
+    return fake
+
+def test_stream_follows_pagination_and_prefetches(monkeypatch):
+    calls, gate = [], threading.Event()
+    monkeypatch.setattr(ebay, "_browse_search", _fake_browse(120, calls, gate))
+    stream = ebay.iter_ebay_browse("q", max_results=500, page_size=50)
+    first = next(stream)
+    assert first.id == "ebay:0"
+    assert gate.wait(1.0)  # page 2 requested while page 1 is still being consumed
+    rest = list(stream)
+    assert len(rest) == 119 and rest[-1].id == "ebay:119"
+    assert calls == [(50, 0), (50, 50), (50, 100)]
+
+def test_search_caps_results(monkeypatch):
+    calls = []
+    monkeypatch.setattr(ebay, "_browse_search", _fake_browse(1000, calls))
+    assert len(ebay.search_ebay_browse("q", limit=250)) == 250
+    assert calls == [(200, 0), (50, 200)]
+
+def _counting_mint(calls, delay=0.0):
+    def mint():
+        time.sleep(delay)
+        calls.append(1)
+        return f"tok{len(calls)}", 7200
+    return mint
+
+def test_token_refresh_is_single_flight():
+    calls = []
+    mgr = ebay.EbayTokenManager(_counting_mint(calls, delay=0.05), shared_path="", background=False)
+    tokens = []
+    threads = [threading.Thread(target=lambda: tokens.append(mgr.get())) for _ in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert calls == [1] and set(tokens) == {"tok1"}
+
+def test_shared_token_cache_across_managers(tmp_path):
+    calls = []
+    path = str(tmp_path / "tok.db")
+    a = ebay.EbayTokenManager(_counting_mint(calls), shared_path=path, cache_key="k", background=False)
+    b = ebay.EbayTokenManager(_counting_mint(calls), shared_path=path, cache_key="k", background=False)
+    assert a.get() == b.get() == "tok1"
+    assert len(calls) == 1 and b.stats["shared_hits"] == 1
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX file modes")
+def test_shared_token_cache_is_private(tmp_path):
+    path = str(tmp_path / "tok.db")
+    ebay.EbayTokenManager(_counting_mint([]), shared_path=path, cache_key="k", background=False).get()
+    assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+
+def test_failed_background_refresh_is_retried_with_backoff():
+    def mint():
+        raise ebay.EbayAuthError("identity endpoint down")
+    mgr = ebay.EbayTokenManager(mint, shared_path="", background=True)
+    try:
+        mgr._background_refresh()
+        assert mgr._timer is not None and mgr._timer.interval == 5.0
+        mgr._background_refresh()
+        assert mgr._timer.interval == 10.0
+    finally:
+        mgr.close()
+    assert mgr._timer.finished.is_set()  # close() cancels the pending retry
+
+def test_proactive_refresh_before_expiry():
+    calls, now = [], [1000.0]
+    mgr = ebay.EbayTokenManager(_counting_mint(calls), shared_path="", refresh_margin=300,
+                                background=False, clock=lambda: now[0])
+    assert mgr.get() == "tok1"
+    now[0] += 7200 - 200  # inside the refresh margin but still valid
+    mgr.refresh()
+    assert mgr.get() == "tok2"
+    mgr.refresh()  # fresh token: nothing to do
+    assert len(calls) == 2
@@ -0,0 +1,46 @@
+import time
+from agentic_shop.agents.enrichment import ItemEnrichmentAgent
+from agentic_shop.agents.utils import Product
+
+ITEM = {
+    "shortDescription": "Brand new, sealed. Great battery life.",
+    "primaryProductReviewRating": {"averageRating": "4.6", "reviewCount": 120},
+    "seller": {"username": "shop1", "feedbackPercentage": "99.8", "feedbackScore": 5000},
+    "condition": "New",
+}
+
+def _products(n):
+    return [Product(id=f"ebay:v1|{i}|0", title=f"item {i}", price=10.0, currency="USD", retailer="eBay", url="u")
+            for i in range(n)] + [Product(id="serpapi:1:x", title="other", price=1.0, currency="USD", retailer="R", url="u")]
+
+def test_enrich_is_concurrent_and_fills_reviews():
+    calls = []
+    def fetch(item_id, etag):
+        calls.append((item_id, etag))
+        time.sleep(0.1)
+        return ITEM, '"v1"'
+    agent = ItemEnrichmentAgent(fetch=fetch, max_workers=10)
+    products = _products(10)
+    start = time.perf_counter()
+    agent.enrich(products)
+    assert time.perf_counter() - start < 0.5  # 10 x 100ms calls overlap
+    assert len(calls) == 10 and calls[0][0].startswith("v1|")
+    p = products[0]
+    assert p.rating == 4.6 and p.reviews[0].text.startswith("Brand new")
+    assert p.extra["seller_feedback_pct"] == "99.8" and p.extra["review_count"] == 120
+    assert products[-1].reviews == []
+
+def test_item_cache_and_conditional_revalidation():
+    calls = []
+    def fetch(item_id, etag):
+        calls.append(etag)
+        return (None, etag) if etag else (ITEM, '"v1"')
+    agent = ItemEnrichmentAgent(fetch=fetch, ttl=3600)
+    agent.enrich(_products(1))
+    agent.enrich(_products(1))
+    assert calls == [None] and agent.stats["fresh_hits"] == 1
+    agent.ttl = 0
+    products = _products(1)
+    agent.enrich(products)
+    assert calls == [None, '"v1"'] and agent.stats["revalidated"] == 1
+    assert products[0].rating == 4.6
@@ -0,0 +1,132 @@
+import threading
+import time
+
+import pytest
+import requests
+
+from agentic_shop.agents import transport
+from agentic_shop.agents.latency import LatencyTracker, hedged_call
+from agentic_shop.agents.ratelimit import RateLimited
+
+def test_timeout_falls_back_until_enough_samples():
+    t = LatencyTracker(min_samples=5, multiplier=3, floor=0.5)
+    for _ in range(4):
+        t.record("x", 0.4)
+    assert t.timeout_for("x", 20) == 20
+    assert t.hedge_delay("x") is None
+    t.record("x", 0.4)
+    assert t.timeout_for("x", 20) == pytest.approx(1.2)  # p99 * 3
+    assert t.timeout_for("x", 1.0) == 1.0                # never above the fixed ceiling
+    for _ in range(5):
+        t.record("fast", 0.01)
+    assert t.timeout_for("fast", 20) == 0.5              # floor
+
+def test_percentiles_follow_the_window():
+    t = LatencyTracker(window=100, min_samples=1)
+    for ms in range(1, 101):
+        t.record("x", ms / 1000)
+    assert t.percentile("x", 50) == pytest.approx(0.05)
+    assert t.percentile("x", 95) == pytest.approx(0.095)
+    for _ in range(100):
+        t.record("x", 1.0)  # old samples roll out
+    assert t.percentile("x", 50) == 1.0
+
+def test_hedge_wins_when_primary_is_slow():
+    t = LatencyTracker()
+    calls = []
+    release = threading.Event()
+
+    def fn():
+        calls.append(1)
+        if len(calls) == 1:
+            release.wait(2)  # primary stalls in the tail
+            return "primary"
+        return "backup"
+
+    start = time.monotonic()
+    assert hedged_call(fn, 0.05, tracker=t, endpoint="x") == "backup"
+    assert time.monotonic() - start < 1
+    assert t.stats["x"]["hedges"] == 1 and t.stats["x"]["hedge_wins"] == 1
+    release.set()
+
+def test_no_hedge_when_primary_is_fast_and_errors_surface():
+    calls = []
+    assert hedged_call(lambda: calls.append(1) or "ok", 0.5) == "ok"
+    assert len(calls) == 1
+
+    def boom():
+        time.sleep(0.02)
+        raise ValueError("down")
+    with pytest.raises(ValueError):
+        hedged_call(boom, 0.01)
+
+def test_request_uses_adaptive_timeout_and_records(monkeypatch):
+    seen = []
+
+    class FakeResponse:
+        status_code = 200
+
+    class FakeSession:
+        def request(self, method, url, timeout=None, **kwargs):
+            seen.append(timeout)
+            return FakeResponse
+
+    monkeypatch.setattr(transport, "get_session", lambda name: FakeSession())
+    t = LatencyTracker(min_samples=3, floor=0.25)
+    for _ in range(3):
+        assert transport.request("svc", "GET", "https://x", endpoint="svc.get", timeout=20,
+                                 hedge=False, tracker=t) is FakeResponse
+    assert seen[0] == 20
+    assert t.stats["svc.get"]["requests"] == 3
+    transport.request("svc", "GET", "https://x", endpoint="svc.get", timeout=20, hedge=False, tracker=t)
+    assert seen[-1] == 0.25  # fast endpoint -> clamped to the floor
+
+def test_timeouts_become_samples_so_the_timeout_recovers():
+    t = LatencyTracker(window=10, min_samples=5, multiplier=3, floor=0.1)
+    for _ in range(5):
+        t.record("x", 0.05)
+    assert t.timeout_for("x", 20) == pytest.approx(0.15)
+    for _ in range(3):  # upstream got slower: every call now times out
+        with pytest.raises(requests.Timeout):
+            with t.observe("x", 0.15):
+                raise requests.ReadTimeout("slow")
+    assert t.stats["x"]["timeouts"] == 3
+    assert t.timeout_for("x", 20) == pytest.approx(0.45)  # p99 rose with the timed-out calls
+
+def test_hedge_skipped_when_permit_denies():
+    t = LatencyTracker()
+    calls = []
+
+    def fn():
+        calls.append(1)
+        time.sleep(0.1)
+        return "primary"
+
+    assert hedged_call(fn, 0.01, tracker=t, endpoint="x", permit=lambda: False) == "primary"
+    assert len(calls) == 1
+    assert "x" not in t.stats
+
+def test_request_hedge_takes_a_rate_limit_token(monkeypatch):
+    taken = []
+
+    class Limiter:
+        def acquire(self, provider, credential="", tokens=1, max_wait=None):
+            taken.append((provider, credential, max_wait))
+            raise RateLimited(provider)
+
+    class FakeResponse:
+        status_code = 200
+
+    class SlowSession:
+        def request(self, method, url, timeout=None, **kwargs):
+            time.sleep(0.1)
+            return FakeResponse
+
+    monkeypatch.setattr(transport, "get_session", lambda name: SlowSession())
+    monkeypatch.setattr(transport, "get_rate_limiter", lambda: Limiter())
+    t = LatencyTracker(min_samples=1, hedge_min_delay=0.01)
+    t.record("svc.get", 0.01)
+    assert transport.request("svc", "GET", "https://x", endpoint="svc.get", hedge=True, tracker=t,
+                             rate_limit=("svc", "key")) is FakeResponse
+    assert taken == [("svc", "key", 0)]
+    assert t.stats["svc.get"]["hedges"] == 0
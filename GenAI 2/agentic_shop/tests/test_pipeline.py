@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+from agentic_shop.agents.product_search import ProductSearchAgent
+from agentic_shop.agents.recommendation import RecommendationEngineAgent
+from agentic_shop.agents.utils import Product
+from agentic_shop.pipeline import run_pipeline
+
+def _provider(delay, retailer, n=2):
+    def fn(query, limit):
+        time.sleep(delay)
+        return [Product(id=f"{retailer}:{i}", title=f"{query} {i}", price=10.0 + i, currency="USD",
+                        retailer=retailer, url="u") for i in range(n)]
+    return fn
+
+class SlowEnrich:
+    def __init__(self):
+        self.batches = []
+    def enrich(self, products):
+        time.sleep(0.1)
+        self.batches.append([p.retailer for p in products])
+        return products
+
+class SlowPrices:
+    def compare(self, products):
+        time.sleep(0.2)
+        return {"n": {"count": len(products)}}
+
+class SlowReviews:
+    def analyze(self, products):
+        time.sleep(0.1)
+        return {p.id: {"pos": 0.8 if p.retailer == "A" else 0.4, "neg": 0.2} for p in products}
+
+def test_iter_search_streams_batches_as_providers_finish():
+    agent = ProductSearchAgent(providers=[("slow", _provider(0.2, "B")), ("fast", _provider(0.01, "A"))],
+                               use_cache=False)
+    names = [name for name, _ in agent.iter_search("q", limit=2)]
+    assert names == ["fast", "slow"]
+    assert agent.last_stats["slow"]["count"] == 2
+
+def test_pipeline_overlaps_independent_stages():
+    search = ProductSearchAgent(providers=[("a", _provider(0.05, "A")), ("b", _provider(0.3, "B"))],
+                                use_cache=False)
+    enrich = SlowEnrich()
+    start = time.perf_counter()
+    res = asyncio.run(run_pipeline(search, enrich, SlowPrices(), SlowReviews(), RecommendationEngineAgent(),
+                                   "tv", budget=12.0))
+    elapsed = time.perf_counter() - start
+
+    # sequential: 0.3 search + 0.1 enrich + 0.2 prices + 0.1 reviews = 0.7s
+    # critical path: 0.3 search + max(0.2 prices, 0.1 enrich + 0.1 reviews of batch B)
+    assert elapsed < 0.65
+    assert enrich.batches == [["A", "A"], ["B", "B"]]   # A was enriched while B was still searching
+    t = res["timings"]
+    assert t["enrich"]["runs"] == 2 and t["enrich"]["start"] < t["search"]["end"]
+    assert t["prices"]["start"] < t["reviews"]["end"]
+    assert [p.retailer for p in res["products"]] == ["A", "A", "B", "B"]  # registration order
+    assert set(res["sentiments"]) == {"A:0", "A:1", "B:0", "B:1"}
+    assert res["ranked"][0]["product"].retailer == "A"
+
+def test_pipeline_without_products():
+    search = ProductSearchAgent(providers=[("a", lambda q, n: [])], use_cache=False)
+    res = asyncio.run(run_pipeline(search, None, SlowPrices(), SlowReviews(), RecommendationEngineAgent(), "tv", None))
+    assert res["products"] == [] and "search" in res["timings"]
+
+def test_concurrent_searches_keep_their_own_stats():
+    agent = ProductSearchAgent(providers=[("a", lambda q, n: _provider(0.05, "A", n)(q, n))], use_cache=False)
+    first, second = {}, {}
+    it = agent.iter_search("q", limit=2, stats=first)
+    agent.search("q", limit=1, stats=second)
+    list(it)
+    assert first["a"]["count"] == 2 and second["a"]["count"] == 1
+
+def test_search_failure_does_not_leak_branch_tasks():
+    class BrokenSearch:
+        providers = [("a", None)]
+        def iter_search(self, query, limit=10, stats=None):
+            yield "a", _provider(0, "A")(query, limit)
+            time.sleep(0.05)
+            raise RuntimeError("search crashed")
+
+    async def main():
+        try:
+            await run_pipeline(BrokenSearch(), SlowEnrich(), SlowPrices(), SlowReviews(),
+                               RecommendationEngineAgent(), "tv", budget=None)
+        except RuntimeError as e:
+            assert "search crashed" in str(e)
+        else:
+            raise AssertionError("expected the search error")
+        return [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+
+    assert asyncio.run(main()) == []
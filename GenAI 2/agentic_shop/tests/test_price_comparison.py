@@ -0,0 +1,59 @@
+from datetime import datetime, timedelta, timezone
+from agentic_shop.agents.price_comparison import PriceComparisonAgent
+from agentic_shop.agents.storage import PriceStore, get_store
+from agentic_shop.agents.utils import Product
+
+def test_bulk_histories_limit_and_since(tmp_path):
+    store = PriceStore(str(tmp_path / "h.db"))
+    t0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+    for day in range(5):
+        store.track_prices_bulk([("a", "R1", 10.0 + day), ("b", "R2", 20.0 + day)], seen_at=t0 + timedelta(days=day))
+    h = store.get_price_histories(["a", "b", "missing"], limit=2)
+    assert [p for _, p, _ in h["a"]] == [14.0, 13.0]
+    assert [p for _, p, _ in h["b"]] == [24.0, 23.0]
+    assert h["missing"] == []
+    h = store.get_price_histories(["a"], since=t0 + timedelta(days=3))
+    assert [p for _, p, _ in h["a"]] == [14.0, 13.0]
+    store.close()
+
+def test_compare_uses_constant_round_trips(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "c.db"))
+    products = [Product(id=f"p{i}", title="Same Item", price=float(10 + i), currency="USD", retailer=f"R{i}", url="u")
+                for i in range(50)]
+    conn = get_store().connection()
+    statements = []
+    conn.set_trace_callback(statements.append)
+    summary = PriceComparisonAgent(history_limit=3).compare(products)
+    conn.set_trace_callback(None)
+    group = summary["same item"]
+    assert group["count"] == 50 and group["best_deal"].id == "p0"
+    assert group["history"]["p7"] == [("R7", 17.0, group["history"]["p7"][0][2])]
+    # one transaction, one SELECT for retailer ids, one SELECT for all histories;
+    # trace reports each executemany row separately, so inserts show up once per row
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 2
+    assert [s.strip() for s in statements if s.strip() in ("BEGIN", "COMMIT")] == ["BEGIN", "COMMIT"]
+    assert sum(s.startswith("INSERT INTO price_history") for s in statements) == 50
+    assert sum(s.startswith("INSERT OR IGNORE INTO retailers") for s in statements) == 50
+
+    # retailer ids are cached now: the next compare is one insert batch and one history read
+    statements.clear()
+    conn.set_trace_callback(statements.append)
+    PriceComparisonAgent(history_limit=3).compare(products)
+    conn.set_trace_callback(None)
+    assert len([s for s in statements if s.lstrip().upper().startswith("SELECT")]) == 1
+    assert not any(s.startswith("INSERT OR IGNORE INTO retailers") for s in statements)
+    assert sum(s.startswith("INSERT INTO price_history") for s in statements) == 50
+
+def test_compare_groups_similar_titles(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_PATH", str(tmp_path / "m.db"))
+    products = [
+        Product(id="e1", title="Sony WH-1000XM5 Wireless Noise Canceling Headphones Black", price=329.0,
+                currency="USD", retailer="eBay", url="u"),
+        Product(id="s1", title="Sony WH1000XM5 Wireless Noise Canceling Headphones - Black", price=299.0,
+                currency="USD", retailer="Best Buy", url="u"),
+    ]
+    summary = PriceComparisonAgent().compare(products)
+    assert len(summary) == 1
+    group = next(iter(summary.values()))
+    assert group["count"] == 2 and group["best_deal"].retailer == "Best Buy"
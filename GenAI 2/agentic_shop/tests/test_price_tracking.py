@@ -1,10 +1,70 @@
-from agentic_shop.agents.storage import track_price, get_price_history
+import sqlite3
+import threading
+import time
+from agentic_shop.agents.storage import track_price, get_price_history, PriceStore, SCHEMA_VERSION
 
 def test_price_history_roundtrip(tmp_path, monkeypatch):
     # redirect DB_PATH to a temp location
     test_db = tmp_path / "ph.db"
     monkeypatch.setenv("DB_PATH", str(test_db))
-    # functions internally compute path from module, so we just ensure calling works
+    # storage resolves $DB_PATH at call time, so the real data/ DB is untouched
     track_price("p1", "retailer", 10.0)
     hist = get_price_history("p1")
     assert len(hist) >= 1
+
+def test_bulk_insert_single_transaction(tmp_path):
+    store = PriceStore(str(tmp_path / "bulk.db"))
+    start = time.perf_counter()
+    assert store.track_prices_bulk((f"p{i % 10}", "R", float(i)) for i in range(1000)) == 1000
+    assert time.perf_counter() - start < 1.0
+    assert len(store.get_price_history("p3")) == 100
+    assert store.connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    store.close()
+
+def test_legacy_db_upgrades_in_place(tmp_path):
+    path = str(tmp_path / "legacy.db")
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE price_history (product_id TEXT, retailer TEXT, price REAL, seen_at TEXT)")
+    conn.executemany("INSERT INTO price_history VALUES (?, ?, ?, ?)", [
+        ("p1", "eBay", 10.0, "2025-11-08T07:18:20.017074"),
+        ("p1", "eBay", 12.0, "2025-11-09T07:18:20.017074"),
+        ("p2", "Best Buy", 5.0, "2025-11-08T08:00:00"),
+    ])
+    conn.commit()
+    conn.close()
+
+    store = PriceStore(path)
+    assert store.get_price_history("p1") == [("eBay", 12.0, "2025-11-09T07:18:20"),
+                                             ("eBay", 10.0, "2025-11-08T07:18:20")]
+    store.track_price("p2", "Best Buy", 4.0)
+    assert [h[1] for h in store.get_price_history("p2")] == [4.0, 5.0]
+    c = store.connection()
+    assert c.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+    assert c.execute("SELECT COUNT(*) FROM retailers").fetchone()[0] == 2
+    plan = " ".join(r[-1] for r in c.execute(
+        "EXPLAIN QUERY PLAN SELECT price FROM price_history WHERE product_id = ? ORDER BY seen_at DESC", ("p1",)))
+    assert "idx_price_history_product_seen" in plan and "TEMP B-TREE" not in plan
+    store.close()
+
+def test_rolled_back_insert_does_not_cache_retailer_ids(tmp_path):
+    store = PriceStore(str(tmp_path / "rollback.db"))
+    store.track_price("p0", "Existing", 1.0)
+    try:
+        store.track_prices_bulk([("p1", "NewShop", 5.0), ("p2", "NewShop", None)])  # NOT NULL fails
+    except sqlite3.IntegrityError:
+        pass
+    else:
+        raise AssertionError("expected the bulk insert to fail")
+    store.track_price("p", "NewShop", 5.0)
+    assert [h[:2] for h in store.get_price_history("p")] == [("NewShop", 5.0)]
+    assert store.get_price_history("p1") == []
+    store.close()
+
+def test_close_from_another_thread(tmp_path):
+    store = PriceStore(str(tmp_path / "p.db"))
+    store.connection()
+    worker = threading.Thread(target=lambda: store.track_prices_bulk([("w", "R", 1.0)]))
+    worker.start()
+    worker.join()
+    store.close()  # closes the worker's connection from the main thread
+    assert store._conns == []
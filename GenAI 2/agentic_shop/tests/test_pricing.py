@@ -0,0 +1,19 @@
+import json
+from pathlib import Path
+import pytest
+from agentic_shop.agents.providers.pricing import parse_price
+
+CORPUS = json.loads((Path(__file__).parent / "data" / "price_corpus.json").read_text(encoding="utf-8"))
+
+@pytest.mark.parametrize("case", CORPUS, ids=[c["price"] or repr(c["extracted"]) for c in CORPUS])
+def test_price_corpus(case):
+    amount, currency = parse_price(case["price"], extracted=case["extracted"])
+    assert (round(amount, 2), currency) == tuple(case["expect"])
+
+def test_structured_field_wins_over_display_string():
+    assert parse_price("$1,29", extracted=1299.0) == (1299.0, "USD")
+
+def test_non_finite_structured_field_falls_back_to_display_string():
+    assert parse_price("$19.99", extracted=float("nan")) == (19.99, "USD")
+    assert parse_price("$19.99", extracted=float("inf")) == (19.99, "USD")
+    assert parse_price(float("-inf")) == (0.0, "USD")
@@ -0,0 +1,19 @@
+import time
+from agentic_shop.agents.product_search import ProductSearchAgent
+from agentic_shop.agents.utils import Product
+
+def _provider(delay, retailer):
+    def fn(query, limit):
+        time.sleep(delay)
+        return [Product(id=f"{retailer}:1", title=query, price=1.0, currency="USD", retailer=retailer, url="u")]
+    return fn
+
+def test_fan_out_returns_finished_providers_within_deadline():
+    agent = ProductSearchAgent(providers=[("fast", _provider(0.01, "A")), ("slow", _provider(1.0, "B"))],
+                               deadline=0.3, use_cache=False)
+    start = time.perf_counter()
+    res = agent.search("q", limit=5)
+    assert time.perf_counter() - start < 0.9
+    assert [p.retailer for p in res] == ["A"]
+    assert agent.last_stats["fast"]["status"] == "ok"
+    assert agent.last_stats["slow"]["status"] == "timeout"
@@ -0,0 +1,43 @@
+import pytest
+from agentic_shop.agents.ratelimit import RateLimiter, RateLimited
+
+class _Clock:
+    def __init__(self):
+        self.now = 1_700_000_000.0
+    def __call__(self):
+        return self.now
+    def sleep(self, s):
+        self.now += s
+
+def test_bucket_waits_then_sheds(tmp_path):
+    clock = _Clock()
+    slept = []
+    # concurrent callers: reservations are made before anyone has slept them off
+    rl = RateLimiter(path=str(tmp_path / "rl.db"), limits={"p": (2.0, 2, 0)}, max_wait=1.0,
+                     clock=clock, sleep=slept.append)
+    assert rl.acquire("p", "key") == 0.0
+    assert rl.acquire("p", "key") == 0.0
+    assert rl.acquire("p", "key") == pytest.approx(0.5)  # burst spent: wait for the refill
+    assert rl.acquire("p", "key") == pytest.approx(1.0)  # queued behind the previous reservation
+    assert rl.acquire("p", "other-key") == 0.0           # separate credential, separate bucket
+    with pytest.raises(RateLimited):
+        rl.acquire("p", "key")                           # would wait 1.5s > max_wait
+    assert slept == [pytest.approx(0.5), pytest.approx(1.0)]
+    clock.now += 2.0
+    assert rl.acquire("p", "key") == 0.0
+    m = rl.metrics()
+    assert sum(v["shed"] for v in m.values()) == 1
+
+def test_daily_quota_shared_across_instances(tmp_path):
+    clock = _Clock()
+    path = str(tmp_path / "rl.db")
+    a = RateLimiter(path=path, limits={"p": (100.0, 100, 3)}, clock=clock, sleep=clock.sleep)
+    b = RateLimiter(path=path, limits={"p": (100.0, 100, 3)}, clock=clock, sleep=clock.sleep)
+    a.acquire("p", "k")
+    b.acquire("p", "k")
+    a.acquire("p", "k")
+    with pytest.raises(RateLimited):
+        b.acquire("p", "k")
+    clock.now += 86400  # quota resets the next UTC day
+    b.acquire("p", "k")
+    assert next(iter(b.metrics().values()))["quota_used"] == 1
@@ -7,3 +7,68 @@ def test_recommend_scoring_basic():
     engine = RecommendationEngineAgent()
     res = engine.recommend([p1, p2], {}, {"x1":{"pos":0.9}, "x2":{"pos":0.1}}, budget=60)
     assert res[0]["product"].id == "x1"
+
+def _reference(products, sentiments, budget):
+    # the original per-product loop, kept to pin the vectorized output
+    scored = []
+    for p in products:
+        pos = sentiments.get(p.id, {"pos": 0.5}).get("pos", 0.5)
+        if budget is not None and budget > 0:
+            if p.price <= budget:
+                price_score = 1.0 - (budget - p.price) / max(budget, 1e-9) * 0.5
+            else:
+                price_score = max(0.0, 1.0 - (p.price - budget) / (budget * 2))
+        else:
+            price_score = 0.7
+        rating_score = (p.rating / 5.0) if p.rating else 0.5
+        score = 0.5*price_score + 0.3*pos + 0.2*rating_score
+        scored.append({"product": p, "score": round(score, 3), "sentiment_pos": pos})
+    scored.sort(key=lambda x: x["score"], reverse=True)
+    return scored
+
+def _catalog(n, seed):
+    import random
+    rng = random.Random(seed)
+    products, sentiments = [], {}
+    for i in range(n):
+        # coarse prices/ratings/sentiment produce many tied scores
+        products.append(Product(id=f"p{i}", title="t", price=float(rng.choice([5, 20, 49.99, 50, 75, 120, 300])),
+                                currency="USD", retailer="R", url="u",
+                                rating=rng.choice([None, 0, 3, 4.5, 5])))
+        if rng.random() < 0.8:
+            sentiments[f"p{i}"] = {"pos": rng.choice([0.1, 0.5, 0.75, 0.9])}
+    return products, sentiments
+
+def _flat(ranked):
+    return [(r["product"].id, r["score"], r["sentiment_pos"]) for r in ranked]
+
+def test_vectorized_ranking_matches_reference():
+    engine = RecommendationEngineAgent()
+    for seed, budget in [(1, 60.0), (2, None), (3, 0), (4, 100)]:
+        products, sentiments = _catalog(500, seed)
+        expected = _flat(_reference(products, sentiments, budget))
+        assert _flat(engine.recommend(products, {}, sentiments, budget=budget)) == expected
+        for k in (1, 7, 50, 499, 500, 1000):
+            assert _flat(engine.recommend(products, {}, sentiments, budget=budget, top_k=k)) == expected[:k]
+    assert engine.recommend([], {}, {}, budget=10) == []
+    assert engine.recommend(products, {}, sentiments, top_k=0) == []
+
+def test_non_finite_scores_rank_last_and_do_not_break_top_k():
+    products = [Product(id=f"p{i}", title="t", price=price, currency="USD", retailer="R", url="u")
+                for i, price in enumerate([10.0, float("nan"), 20.0, 30.0])]
+    engine = RecommendationEngineAgent()
+    full = engine.recommend(products, {}, {}, budget=25.0)
+    assert [r["product"].id for r in full][-1] == "p1"
+    ids = [r["product"].id for r in full]
+    for k in range(1, 5):
+        assert [r["product"].id for r in engine.recommend(products, {}, {}, budget=25.0, top_k=k)] == ids[:k]
+
+def test_score_matches_recommend():
+    products = [Product(id=f"p{i}", title="t", price=10.0 * (i + 1), currency="USD", retailer="R", url="u",
+                        rating=4.0 if i % 2 else None) for i in range(5)]
+    sentiments = {"p1": {"pos": 0.9}, "p3": {}}
+    engine = RecommendationEngineAgent()
+    scores = engine.score(products, sentiments, budget=30.0).tolist()
+    ranked = engine.recommend(products, {}, sentiments, budget=30.0)
+    assert sorted(scores, reverse=True) == [r["score"] for r in ranked]
+    assert {r["product"].id: r["sentiment_pos"] for r in ranked}["p3"] == 0.5
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+from agentic_shop.agents.providers import registry
+from agentic_shop.agents.providers.registry import ProviderSpec
+
+@pytest.fixture(autouse=True)
+def clean_registry(monkeypatch):
+    """Each test gets its own registry, so registrations don't leak into other tests."""
+    monkeypatch.setattr(registry, "_registry", dict(registry._registry))
+    monkeypatch.setattr(registry, "_plugins_loaded", registry._plugins_loaded)
+
+def test_importing_agent_does_not_import_providers():
+    code = ("import sys, agentic_shop.agents.product_search; "
+            "print(any(m in sys.modules for m in ('requests', 'tenacity', 'agentic_shop.agents.providers.ebay')))")
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+def test_enabled_providers_are_lazy_and_filtered(monkeypatch):
+    spec = ProviderSpec(name="fake", target="agentic_shop.tests.test_registry:_fake_search",
+                        capabilities=("search",), latency_class="fast")
+    off = ProviderSpec(name="off", target="nowhere:missing", available=lambda: False)
+    registry.register(spec, replace=True)
+    registry.register(off, replace=True)
+    specs = registry.enabled_providers(["fake", "off", "unknown"])
+    assert [s.name for s in specs] == ["fake"]
+    assert not spec.loaded
+    assert spec.search("q", 2)[0].title == "q"
+    assert spec.loaded
+
+def test_plugin_cannot_shadow_a_registered_provider(monkeypatch, capsys):
+    shadow = ProviderSpec(name="ebay", target="nowhere:missing")
+    extra = ProviderSpec(name="extra", target="agentic_shop.tests.test_registry:_fake_search")
+    eps = [SimpleNamespace(name="innocent", value="pkg:spec", load=lambda: shadow),
+           SimpleNamespace(name="extra", value="pkg:extra", load=lambda: extra)]
+    monkeypatch.setattr(registry, "entry_points", lambda group: eps)
+    monkeypatch.setattr(registry, "_registry", {})
+    monkeypatch.setattr(registry, "_plugins_loaded", False)
+    specs = registry.all_providers()
+    assert specs["ebay"].target.endswith(":search_ebay_browse")
+    assert specs["extra"] is extra
+    assert "'innocent' provides 'ebay'" in capsys.readouterr().err
+
+def test_missing_credentials_are_logged(monkeypatch, capsys):
+    registry.register(ProviderSpec(name="off", target="nowhere:missing", available=lambda: False), replace=True)
+    assert registry.enabled_providers(["off"]) == []
+    assert "'off' disabled" in capsys.readouterr().err
+
+def _fake_search(query, limit):
+    from agentic_shop.agents.utils import Product
+    return [Product(id="f:1", title=query, price=1.0, currency="USD", retailer="F", url="u")]
@@ -0,0 +1,54 @@
+import io
+import json
+import subprocess
+import sys
+
+from agentic_shop.agents.utils import Product
+from agentic_shop.render import JsonRenderer, RichRenderer, NullRenderer, get_renderer
+
+def _result():
+    p = Product(id="x:1", title="Phone", price=99.5, currency="USD", retailer="X", url="u")
+    return {"query": "phone", "budget": 100.0, "products": [p],
+            "summary": {"phone": {"items": [p], "count": 1, "min_price": 99.5, "max_price": 99.5,
+                                  "avg_price": 99.5, "best_deal": p, "history": {"x:1": []}}},
+            "sentiments": {"x:1": {"pos": 0.7, "neg": 0.3, "details": [{"POSITIVE": 0.7}]}},
+            "ranked": [{"product": p, "score": 0.9, "sentiment_pos": 0.7}]}
+
+def test_orchestrator_import_does_not_load_rich():
+    code = "import sys, agentic_shop.orchestrator; print('rich' in sys.modules)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+def test_json_renderer_writes_one_document():
+    buf = io.StringIO()
+    r = JsonRenderer(stream=buf)
+    r.section("ignored")
+    r.products([])
+    r.result(_result())
+    doc = json.loads(buf.getvalue())
+    assert doc["ranked"] == [{"product_id": "x:1", "score": 0.9, "sentiment_pos": 0.7}]
+    assert doc["summary"]["phone"]["best_deal"] == "x:1"
+    assert doc["sentiments"]["x:1"] == {"pos": 0.7, "neg": 0.3}
+
+def test_rich_renderer_prints_tables():
+    buf = io.StringIO()
+    r = RichRenderer(file=buf)
+    res = _result()
+    r.products(res["products"])
+    r.ranked(res["ranked"])
+    assert "Found Products" in buf.getvalue() and "Top Recommendations" in buf.getvalue()
+
+def test_get_renderer_names():
+    assert isinstance(get_renderer("none"), NullRenderer)
+    assert isinstance(get_renderer("json"), JsonRenderer)
+
+def test_provider_diagnostics_stay_off_stdout(capsys):
+    from agentic_shop.agents.product_search import ProductSearchAgent
+
+    def broken(query, limit):
+        raise RuntimeError("upstream down")
+    ProductSearchAgent(providers=[("x", broken)], use_cache=False).search("phone", 5)
+    JsonRenderer().result(_result())
+    captured = capsys.readouterr()
+    assert json.loads(captured.out)["query"] == "phone"  # stdout is only the JSON document
+    assert "[search:x] upstream down" in captured.err
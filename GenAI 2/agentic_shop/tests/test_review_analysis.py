@@ -0,0 +1,84 @@
+import time
+from agentic_shop.agents.review_analysis import ReviewAnalysisAgent
+from agentic_shop.agents.sentiment import HFInferenceBackend, LexiconBackend
+from agentic_shop.agents.sentiment_cache import SentimentCache
+from agentic_shop.agents.utils import Product, Review
+
+class _Resp:
+    def __init__(self, payload):
+        self.payload = payload
+    def raise_for_status(self):
+        pass
+    def json(self):
+        return self.payload
+
+class _Session:
+    def __init__(self):
+        self.calls = []
+    def post(self, url, headers=None, json=None, timeout=None):
+        self.calls.append(json["inputs"])
+        return _Resp([[{"label": "POSITIVE", "score": 0.8 if "good" in t else 0.2},
+                       {"label": "NEGATIVE", "score": 0.2 if "good" in t else 0.8}] for t in json["inputs"]])
+
+def test_analyze_batches_texts_across_products(monkeypatch):
+    session = _Session()
+    monkeypatch.setattr("agentic_shop.agents.sentiment.get_session", lambda name: session)
+    agent = ReviewAnalysisAgent(backend=HFInferenceBackend(token="t", batch_size=4), use_cache=False)
+    products = [Product(id=f"p{i}", title=f"good item {i}" if i % 2 else f"bad item {i}",
+                        price=1.0, currency="USD", retailer="R", url="u") for i in range(10)]
+    products[0].reviews = [Review(text="good"), Review(text="good too")]
+    res = agent.analyze(products)
+    assert sorted(len(batch) for batch in session.calls) == [3, 4, 4]  # 11 texts in batches of 4 (run concurrently)
+    assert res["p0"]["pos"] == 0.8 and res["p1"]["pos"] == 0.8 and res["p2"]["pos"] == 0.2
+
+def test_repeat_texts_are_served_from_cache(tmp_path, monkeypatch):
+    session = _Session()
+    monkeypatch.setattr("agentic_shop.agents.sentiment.get_session", lambda name: session)
+    cache = SentimentCache(path=str(tmp_path / "sc.db"), model="m")
+    agent = ReviewAnalysisAgent(backend=HFInferenceBackend(token="t"), cache=cache)
+    products = [Product(id="a", title="good thing", price=1.0, currency="USD", retailer="R", url="u"),
+                Product(id="b", title="good thing", price=2.0, currency="USD", retailer="S", url="u")]
+    first = agent.analyze(products)
+    assert session.calls == [["good thing"]]  # duplicate titles scored once
+    cache.close()
+    agent.cache = SentimentCache(path=str(tmp_path / "sc.db"), model="m")  # fresh memory tier, same disk
+    assert agent.analyze(products) == first
+    assert len(session.calls) == 1
+    assert agent.cache.stats["disk_hits"] == 1 and agent.cache.stats["misses"] == 0
+
+def test_cache_ttl_and_size_eviction(tmp_path):
+    cache = SentimentCache(path=str(tmp_path / "sc.db"), model="m", ttl=3600, max_rows=2, memory_size=1)
+    cache.put_many(["a", "b", "c"], [{"POSITIVE": 1.0}, None, {"POSITIVE": 0.5}])
+    cache.put_many(["d"], [{"POSITIVE": 0.1}])
+    assert cache.stats["evictions"] == 1
+    cache.ttl = 0
+    assert cache.get_many(["a", "c", "d"]) == [None, None, None]
+
+def test_cache_keeps_a_running_row_count(tmp_path):
+    cache = SentimentCache(path=str(tmp_path / "sc.db"), model="m", max_rows=3)
+    cache.put_many(["a", "b"], [{"POSITIVE": 1.0}, {"POSITIVE": 0.5}])
+    statements = []
+    cache._db().set_trace_callback(statements.append)
+    cache.put_many(["a", "b", "c"], [{"POSITIVE": 0.9}, {"POSITIVE": 0.4}, {"POSITIVE": 0.1}])
+    assert cache.stats["evictions"] == 0  # a and b were replaced, not added
+    cache.put_many(["d"], [{"POSITIVE": 0.2}])
+    assert cache.stats["evictions"] == 1
+    assert not any(s.strip() == "SELECT COUNT(*) FROM sentiment_cache" for s in statements)
+    assert cache._db().execute("SELECT COUNT(*) FROM sentiment_cache").fetchone()[0] == 3
+    cache.close()
+
+def test_lexicon_backend_scores_offline_batch():
+    backend = LexiconBackend()
+    texts = ["Great sound, excellent battery", "Arrived broken, terrible", "USB cable", "not good at all"]
+    scores = backend.score(texts)
+    assert scores[0]["POSITIVE"] > 0.8 and scores[1]["POSITIVE"] < 0.2
+    assert scores[2] == {"POSITIVE": 0.5, "NEGATIVE": 0.5}
+    assert scores[3]["POSITIVE"] < 0.5
+    start = time.perf_counter()
+    assert len(backend.score(texts * 250)) == 1000
+    assert time.perf_counter() - start < 1.0
+
+def test_disabled_agent_returns_neutral():
+    agent = ReviewAnalysisAgent(enabled=False, backend=LexiconBackend())
+    p = Product(id="x", title="great", price=1.0, currency="USD", retailer="R", url="u")
+    assert agent.analyze([p])["x"]["pos"] == 0.5
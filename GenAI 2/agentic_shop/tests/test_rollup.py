@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+from agentic_shop.agents.rollup import rollup, apply_retention, get_price_trend, pick_resolution, DAY
+from agentic_shop.agents.storage import PriceStore
+
+T0 = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+def _seed(store, days):
+    for i in range(days * 24 * 2):  # a sighting every 30 minutes
+        store.track_prices_bulk([("p", "eBay", 100.0 + (i % 48))], seen_at=T0 + timedelta(minutes=30 * i))
+
+def test_rollup_buckets_and_retention(tmp_path):
+    store = PriceStore(str(tmp_path / "r.db"))
+    _seed(store, 3)
+    assert rollup(store) == {"hour": 72, "day": 3}
+    assert rollup(store) == {"hour": 1, "day": 1}  # only the open bucket is recomputed
+
+    day = get_price_trend("p", T0, T0 + timedelta(days=3), resolution="day", store=store)
+    assert len(day["points"]) == 3
+    _, retailer, lo, hi, avg, last, samples = day["points"][0]
+    assert (retailer, lo, hi, last, samples) == ("eBay", 100.0, 147.0, 147.0, 48) and avg == 123.5
+
+    deleted = apply_retention(store, raw_days=1, now=T0 + timedelta(days=3))
+    assert deleted["raw"] == 2 * 48
+    remaining = store.connection().execute("SELECT COUNT(*) FROM price_history").fetchone()[0]
+    assert remaining == 48
+    # daily buckets survive raw retention
+    assert len(get_price_trend("p", T0, T0 + timedelta(days=3), resolution="day", store=store)["points"]) == 3
+    store.close()
+
+def test_resolution_follows_span():
+    now = int(T0.timestamp()) + 400 * DAY
+    assert pick_resolution(now - DAY, now, now) == "raw"
+    assert pick_resolution(now - 30 * DAY, now, now) == "hour"
+    assert pick_resolution(now - 365 * DAY, now, now) == "day"
@@ -0,0 +1,60 @@
+import threading
+import time
+from agentic_shop.agents.enrichment import apply_item_details
+from agentic_shop.agents.providers.cache import SearchCache
+from agentic_shop.agents.product_search import ProductSearchAgent
+from agentic_shop.agents.utils import Product, Review
+
+def _products(tag):
+    return [Product(id=f"x:{tag}", title=tag, price=9.5, currency="USD", retailer="R", url="u",
+                    reviews=[Review(rating=4.0, text="fine")])]
+
+def test_disk_tier_and_normalized_keys(tmp_path):
+    calls = []
+    agent = ProductSearchAgent(providers=[("ebay", lambda q, n: calls.append(q) or _products(q))],
+                               cache=SearchCache(path=str(tmp_path / "s.db")))
+    first = agent.search("Wireless  Earbuds", limit=5)
+    # a new cache over the same file serves the normalized query from disk
+    agent.cache = SearchCache(path=str(tmp_path / "s.db"))
+    assert agent.search("wireless earbuds", limit=5) == first
+    assert calls == ["Wireless  Earbuds"]
+    assert agent.search("wireless earbuds", limit=6) and len(calls) == 2  # limit is part of the key
+
+def test_stale_while_revalidate(tmp_path):
+    cache = SearchCache(path=None, ttls={"p": 0}, stale=60)
+    calls = []
+    fetch = lambda: calls.append(1) or _products(f"v{len(calls)}")
+    assert cache.get_or_fetch("p", "q", 5, fetch)[0].title == "v1"
+    assert cache.get_or_fetch("p", "q", 5, fetch)[0].title == "v1"  # stale, refresh scheduled
+    deadline = time.time() + 2
+    while cache.get_or_fetch("p", "q", 5, fetch)[0].title == "v1":
+        assert time.time() < deadline
+        time.sleep(0.01)
+    assert cache.stats["refreshes"] >= 1
+
+def test_concurrent_identical_requests_are_coalesced():
+    cache = SearchCache(path=None)
+    release, calls = threading.Event(), []
+    def fetch():
+        calls.append(1)
+        release.wait(2)
+        return _products("a")
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_fetch("p", "q", 5, fetch)))
+               for _ in range(5)]
+    for t in threads:
+        t.start()
+    time.sleep(0.1)
+    release.set()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1 and len(results) == 5
+    assert cache.stats["coalesced"] == 4
+
+def test_callers_get_copies_they_can_enrich():
+    cache = SearchCache(path=None)
+    first = cache.get_or_fetch("p", "q", 5, lambda: _products("a"))
+    apply_item_details(first[0], {"shortDescription": "great", "brand": "Acme"})
+    again = cache.get_or_fetch("p", "q", 5, lambda: _products("b"))
+    assert again[0].title == "a"
+    assert len(again[0].reviews) == 1 and again[0].extra == {}
@@ -0,0 +1,92 @@
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+from agentic_shop.agents.product_search import ProductSearchAgent
+from agentic_shop.agents.recommendation import RecommendationEngineAgent
+from agentic_shop.agents.utils import Product
+from agentic_shop.server import create_app
+
+def _orch(delay=0.0):
+    def provider(query, limit):
+        time.sleep(delay)
+        return [Product(id=f"x:{i}", title=f"{query} {i}", price=10.0 * (i + 1), currency="USD",
+                        retailer="X", url="u") for i in range(limit)]
+    prices = SimpleNamespace(compare=lambda products: {})
+    reviews = SimpleNamespace(analyze=lambda products: {p.id: {"pos": 0.5, "neg": 0.5} for p in products})
+    return SimpleNamespace(search_agent=ProductSearchAgent(providers=[("x", provider)], use_cache=False),
+                           enrich_agent=None, price_agent=prices, review_agent=reviews,
+                           reco_agent=RecommendationEngineAgent())
+
+async def _call(app, method, path, query=b"", body=None):
+    sent = []
+    chunks = [{"type": "http.request", "body": json.dumps(body).encode() if body is not None else b""}]
+
+    async def receive():
+        return chunks.pop(0) if chunks else {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    await app({"type": "http", "method": method, "path": path, "query_string": query}, receive, send)
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+def test_endpoints_return_json():
+    app = create_app(_orch(), warm_token=False)
+
+    async def scenario():
+        assert await _call(app, "GET", "/health") == (200, {"status": "ok", "in_flight": 0})
+        status, body = await _call(app, "GET", "/search", b"q=tv&limit=2")
+        assert status == 200 and [p["id"] for p in body["products"]] == ["x:0", "x:1"]
+        status, body = await _call(app, "POST", "/recommend", body={"q": "tv", "budget": 15, "limit": 3, "top": 2})
+        assert status == 200 and len(body["ranked"]) == 2 and "timings" in body
+        assert body["ranked"][0]["product_id"] == "x:0"
+        assert (await _call(app, "GET", "/search"))[0] == 400
+        assert (await _call(app, "GET", "/search", b"q=tv&limit=many"))[0] == 400
+        assert (await _call(app, "GET", "/nope"))[0] == 404
+    asyncio.run(scenario())
+
+def test_limit_and_top_are_bounded():
+    app = create_app(_orch(), warm_token=False, max_results=20)
+
+    async def scenario():
+        assert (await _call(app, "GET", "/search", b"q=tv&limit=10000"))[0] == 400
+        assert (await _call(app, "GET", "/search", b"q=tv&limit=0"))[0] == 400
+        assert (await _call(app, "GET", "/recommend", b"q=tv&limit=5&top=6"))[0] == 400
+        assert (await _call(app, "GET", "/recommend", b"q=tv&limit=5&top=-1"))[0] == 400
+        status, body = await _call(app, "GET", "/recommend", b"q=tv&limit=5")
+        assert status == 200 and len(body["ranked"]) == 5  # default top is clamped to limit
+        status, body = await _call(app, "GET", "/search", b"q=tv&limit=20")
+        assert status == 200 and len(body["products"]) == 20
+    asyncio.run(scenario())
+
+def test_concurrency_limit_sheds_with_503():
+    app = create_app(_orch(delay=0.3), max_concurrency=1, queue_timeout=0.05, warm_token=False)
+
+    async def scenario():
+        slow = asyncio.create_task(_call(app, "GET", "/search", b"q=tv"))
+        await asyncio.sleep(0.05)
+        status, body = await _call(app, "GET", "/search", b"q=tv")
+        assert status == 503 and body == {"error": "server busy"}
+        assert (await slow)[0] == 200
+        assert app.stats["rejected"] == 1
+    asyncio.run(scenario())
+
+def test_lifespan_passes_options_and_releases_resources(monkeypatch):
+    from agentic_shop import orchestrator
+    from agentic_shop.agents import storage, transport
+    from agentic_shop.agents.providers import ebay
+    built, closed = [], []
+    monkeypatch.setattr(orchestrator, "Orchestrator", lambda **kw: built.append(kw) or _orch())
+    monkeypatch.setattr(ebay, "close_token_manager", lambda: closed.append("token"))
+    monkeypatch.setattr(transport, "close_sessions", lambda: closed.append("sessions"))
+    monkeypatch.setattr(storage, "close_stores", lambda: closed.append("stores"))
+    app = create_app(warm_token=False, sentiment_enabled=False, enrich_enabled=False)
+
+    async def scenario():
+        await app.startup()
+        await app.shutdown()
+    asyncio.run(scenario())
+    assert built == [{"sentiment_enabled": False, "enrich_enabled": False}]
+    assert sorted(closed) == ["sessions", "stores", "token"]
@@ -0,0 +1,10 @@
+from agentic_shop.agents.transport import get_session, close_sessions
+
+def test_sessions_are_shared_and_pooled():
+    close_sessions()
+    s = get_session("t", pool_maxsize=4)
+    assert get_session("t") is s
+    assert get_session("other") is not s
+    adapter = s.get_adapter("https://api.ebay.com/")
+    assert adapter._pool_maxsize == 4
+    close_sessions()
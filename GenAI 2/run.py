@@ -1,16 +1,49 @@
 import argparse
+import os
 from agentic_shop.orchestrator import Orchestrator
+from agentic_shop.batch import BatchRunner, read_queries
+from agentic_shop.render import RENDERERS, get_renderer
+from agentic_shop.config import BATCH_CONCURRENCY
 
 def main():
     parser = argparse.ArgumentParser(description="Agentic E-Commerce Assistant (strict, real APIs only)")
-    parser.add_argument("--query", required=True, help="What are you shopping for?")
+    parser.add_argument("--query", help="What are you shopping for?")
     parser.add_argument("--budget", type=float, default=None, help="Budget in the product currency (e.g., USD)")
     parser.add_argument("--max_results", type=int, default=10, help="Max search results per source")
     parser.add_argument("--no_sentiment", action="store_true", help="Disable Hugging Face sentiment calls")
+    parser.add_argument("--no_enrich", action="store_true", help="Skip eBay item-detail (getItem) enrichment")
+    parser.add_argument("--concurrent", action="store_true",
+                        help="Overlap independent stages (asyncio pipeline) and print per-stage timings")
+    parser.add_argument("--output", choices=RENDERERS, default="auto",
+                        help="rich tables, one JSON document, or nothing (auto: rich on a terminal, else JSON)")
+    parser.add_argument("--batch", help="JSONL or CSV file of queries (columns: id, query, budget, max_results)")
+    parser.add_argument("--out", help="Batch results JSONL (default: <batch>.results.jsonl); reruns resume from it")
+    parser.add_argument("--concurrency", type=int, default=BATCH_CONCURRENCY, help="Batch queries in flight")
+    parser.add_argument("--serve", action="store_true", help="Run the HTTP service (needs uvicorn)")
+    parser.add_argument("--host", default="127.0.0.1", help="Service bind address")
+    parser.add_argument("--port", type=int, default=8000, help="Service port")
     args = parser.parse_args()
+    if args.serve:
+        from agentic_shop.server import serve
+        serve(args.host, args.port, sentiment_enabled=not args.no_sentiment, enrich_enabled=not args.no_enrich)
+        return
+    if not args.query and not args.batch:
+        parser.error("one of --query, --batch or --serve is required")
 
-    orch = Orchestrator(sentiment_enabled=not args.no_sentiment)
-    orch.run(args.query, args.budget, args.max_results)
+    if args.batch:
+        # batch results go to the JSONL file, so nothing is rendered
+        orch = Orchestrator(sentiment_enabled=not args.no_sentiment, enrich_enabled=not args.no_enrich)
+        jobs = read_queries(args.batch, max_results=args.max_results)
+        out = args.out or os.path.splitext(args.batch)[0] + ".results.jsonl"
+        BatchRunner(orch, concurrency=args.concurrency).run(jobs, out)
+        return
+
+    orch = Orchestrator(sentiment_enabled=not args.no_sentiment, enrich_enabled=not args.no_enrich,
+                        renderer=get_renderer(args.output))
+    if args.concurrent:
+        orch.run_concurrent(args.query, args.budget, args.max_results)
+    else:
+        orch.run(args.query, args.budget, args.max_results)
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,77 @@
+# Benchmark cross-retailer title matching on synthetic listings.
+#   python scripts/bench_matching.py --products 1000 --listings 5
+import argparse
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from agentic_shop.agents.matching import ProductMatcher
+from agentic_shop.agents.utils import normalize_title
+
+BRANDS = ["Sony", "Apple", "Samsung", "Logitech", "Bose", "Anker", "JBL", "Dell", "Lenovo", "Razer"]
+KINDS = ["Wireless Earbuds", "Noise Cancelling Headphones", "Mechanical Keyboard", "Gaming Mouse",
+         "Portable SSD", "USB-C Charger", "Bluetooth Speaker", "Monitor", "Webcam", "Power Bank"]
+EXTRAS = ["Black", "White", "New", "Sealed", "Free Shipping", "2024 Model", "with Case", "Bundle", "Renewed"]
+SIZES = ["128GB", "256GB", "512GB", "1TB", "2TB", "27 inch", "32 inch", "65W", "100W", "10000mAh"]
+
+def make_products(n, rng):
+    products = set()
+    while len(products) < n:
+        products.add(f"{rng.choice(BRANDS)} {rng.choice(KINDS)} {rng.choice(SIZES)} "
+                     f"{rng.choice('ABCDEFGHJKLMNPQRSTUVWXYZ')}{rng.randint(100, 9999)}")
+    return sorted(products)
+
+def perturb(title, rng):
+    words = title.split()
+    if rng.random() < 0.5:
+        words.append(rng.choice(EXTRAS))
+    if rng.random() < 0.3:
+        i = rng.randrange(len(words) - 1)
+        words[i], words[i + 1] = words[i + 1], words[i]
+    if rng.random() < 0.3:
+        words = [w.upper() if rng.random() < 0.3 else w for w in words]
+    out = " ".join(words)
+    if rng.random() < 0.3:
+        out = out.replace(" ", " - ", 1)
+    return out
+
+def pair_scores(labels, truth):
+    by_label, by_truth = defaultdict(list), defaultdict(list)
+    for i, (l, t) in enumerate(zip(labels, truth)):
+        by_label[l].append(i)
+        by_truth[t].append(i)
+    pairs = lambda groups: {(a, b) for g in groups.values() for x, a in enumerate(g) for b in g[x + 1:]}
+    found, expected = pairs(by_label), pairs(by_truth)
+    tp = len(found & expected)
+    return tp / max(len(found), 1), tp / max(len(expected), 1)
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--products", type=int, default=1000)
+parser.add_argument("--listings", type=int, default=5, help="Listings per product across retailers")
+parser.add_argument("--threshold", type=float, default=0.6)
+args = parser.parse_args()
+
+rng = random.Random(42)
+base = make_products(args.products, rng)
+titles, truth = [], []
+for i, t in enumerate(base):
+    for _ in range(args.listings):
+        titles.append(perturb(t, rng))
+        truth.append(i)
+
+start = time.perf_counter()
+exact = [normalize_title(t) for t in titles]
+t_exact = time.perf_counter() - start
+matcher = ProductMatcher(threshold=args.threshold)
+start = time.perf_counter()
+labels = matcher.cluster(titles)
+t_lsh = time.perf_counter() - start
+
+for name, lab, secs in (("exact normalize_title", exact, t_exact), ("minhash/lsh", labels, t_lsh)):
+    precision, recall = pair_scores(lab, truth)
+    print(f"{name:22s} {len(titles):6d} listings  {secs * 1000:8.1f} ms  "
+          f"groups={len(set(lab)):6d} (true {len(base)})  precision={precision:.3f} recall={recall:.3f}")
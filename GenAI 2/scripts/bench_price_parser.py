@@ -0,0 +1,30 @@
+# Micro-benchmark for the SerpApi price parser over the test corpus.
+#   python scripts/bench_price_parser.py --rounds 2000
+import argparse
+import json
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from agentic_shop.agents.providers.pricing import parse_price
+
+CORPUS_PATH = os.path.join(os.path.dirname(__file__), "..", "agentic_shop", "tests", "data", "price_corpus.json")
+
+parser = argparse.ArgumentParser()
+parser.add_argument("--rounds", type=int, default=2000)
+args = parser.parse_args()
+
+with open(CORPUS_PATH, encoding="utf-8") as f:
+    corpus = [(c["price"], c["extracted"]) for c in json.load(f)]
+strings_only = [(p, None) for p, _ in corpus]
+
+def run(cases):
+    for price, extracted in cases:
+        parse_price(price, extracted=extracted)
+
+for label, cases in (("with extracted_price", corpus), ("display string only", strings_only)):
+    secs = min(timeit.repeat(lambda: run(cases), number=args.rounds, repeat=5))
+    per_call = secs / (args.rounds * len(cases)) * 1e9
+    print(f"{label:22s} {per_call:8.0f} ns/call  ({len(cases)} strings x {args.rounds} rounds)")
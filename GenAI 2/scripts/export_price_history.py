@@ -0,0 +1,26 @@
+# Export price history to a partitioned Parquet dataset and print per-product stats.
+#   python scripts/export_price_history.py --out data/price_history_parquet --since_days 365 --report
+import argparse
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from agentic_shop.agents.analytics import export_price_history, price_report
+
+parser = argparse.ArgumentParser(description="Columnar export of price history (requires pyarrow)")
+parser.add_argument("--out", default=os.path.join("data", "price_history_parquet"))
+parser.add_argument("--since_days", type=int, default=None, help="Only export the last N days")
+parser.add_argument("--report", action="store_true", help="Print min/avg/p50/p90 per product after exporting")
+parser.add_argument("--window_days", type=int, default=None, help="Report per N-day window instead of overall")
+args = parser.parse_args()
+
+since = datetime.now(timezone.utc) - timedelta(days=args.since_days) if args.since_days else None
+n = export_price_history(args.out, since=since)
+print(f"Exported {n} rows to {args.out}")
+
+if args.report:
+    window = args.window_days * 86400 if args.window_days else None
+    for row in price_report(args.out, window=window, since=since):
+        print(row)
@@ -0,0 +1,30 @@
+# Roll up raw price sightings into hourly/daily buckets and apply retention.
+# Safe to run repeatedly; schedule it (e.g. hourly cron) for long-running deployments:
+#   python scripts/maintain_price_history.py
+#   python scripts/maintain_price_history.py --rollup_only --full
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from agentic_shop.agents.rollup import rollup, apply_retention
+from agentic_shop.agents.storage import get_store
+from agentic_shop.config import PRICE_RAW_RETENTION_DAYS, PRICE_HOURLY_RETENTION_DAYS
+
+parser = argparse.ArgumentParser(description="Price history rollup and retention")
+parser.add_argument("--db", default=None, help="SQLite path (default: $DB_PATH, else config.DB_PATH)")
+parser.add_argument("--raw_days", type=int, default=PRICE_RAW_RETENTION_DAYS, help="Keep raw sightings this long")
+parser.add_argument("--hourly_days", type=int, default=PRICE_HOURLY_RETENTION_DAYS,
+                    help="Keep hourly buckets this long (daily buckets are kept forever)")
+parser.add_argument("--rollup_only", action="store_true", help="Compute buckets but delete nothing")
+parser.add_argument("--full", action="store_true", help="Rebuild buckets from every raw row (after a backfill)")
+args = parser.parse_args()
+
+store = get_store(args.db)
+written = rollup(store, full=args.full)
+print(f"Rolled up {written['hour']} hourly and {written['day']} daily buckets")
+if not args.rollup_only:
+    deleted = apply_retention(store, raw_days=args.raw_days, hourly_days=args.hourly_days)
+    print(f"Deleted {deleted['raw']} raw sightings and {deleted['hour']} hourly buckets past retention")
+store.close()